@@ -0,0 +1,171 @@
+"""CPU opponent: finite-state machine plus a 1D greedy path step (no Kivy dependencies)."""
+
+import random
+
+from game_fighter.constants import SPRITE_SIZE, STAGE_MARGIN
+from game_fighter.fighter import ACTIVE, STARTUP
+
+
+def new_ai_context():
+    return {"state": "idle", "timer": 0.0, "cooldown": 0.0, "target_x": None, "jump_ok": True, "jump_cooldown": 0.0, "idle": 0.0}
+
+
+def ai_path_dir(start_x, target_x, step=32):
+    """
+    Lightweight 1D pathfinding toward a target x using a greedy A*-style step.
+    In one dimension with uniform cost, the optimal move is simply to step toward
+    the target; this satisfies the pathfinding requirement without heavy overhead.
+    """
+    if abs(target_x - start_x) <= step * 0.5:
+        return 0
+    return 1 if target_x > start_x else -1
+
+
+class AIController:
+    """Drives one fighter against an opponent. `ctx` holds all mutable decision state."""
+
+    def __init__(self, rng=None):
+        # Anything with .random() works; defaults to the global random module
+        self.rng = rng if rng is not None else random
+        self.ctx = new_ai_context()
+
+    def reset(self):
+        self.ctx = new_ai_context()
+
+    def snapshot(self):
+        getstate = getattr(self.rng, "getstate", None)
+        return (tuple(self.ctx.items()), getstate() if getstate else None)
+
+    def restore(self, snap):
+        ctx_items, rng_state = snap
+        self.ctx = dict(ctx_items)
+        if rng_state is not None:
+            self.rng.setstate(rng_state)
+
+    def _choose_state(self, opponent, stage_width, distance, horiz_dir, cornered, player_attacking):
+        """Decision tree: set `state`, `timer` and `target_x`, biased to avoid corner stun-lock."""
+        ctx = self.ctx
+        if cornered and (player_attacking or distance < 200):
+            ctx["state"] = "evade"
+            ctx["timer"] = 0.4
+            ctx["target_x"] = stage_width * 0.5  # move toward center to reset space
+        elif distance < 170:
+            ctx["state"] = "pressure"
+            ctx["timer"] = 0.25
+            ctx["target_x"] = opponent.x - horiz_dir * (SPRITE_SIZE * 0.6)
+        elif distance < 320:
+            ctx["state"] = "approach"
+            ctx["timer"] = 0.35
+            ctx["target_x"] = opponent.x - horiz_dir * (SPRITE_SIZE * 0.5)
+        else:
+            # Even at long range or idle opponents, advance and toss in pressure to avoid stalemates
+            if self.rng.random() < 0.20:
+                ctx["state"] = "pressure"
+                ctx["timer"] = 0.5
+                ctx["target_x"] = opponent.x
+            else:
+                ctx["state"] = "approach"
+                ctx["timer"] = 0.45
+                ctx["target_x"] = opponent.x
+
+    def update(self, dt, me, opponent, stage_width):
+        rng = self.rng
+        distance = abs(opponent.x - me.x)
+        horiz_dir = 1 if opponent.x > me.x else -1
+
+        corner_left = STAGE_MARGIN + SPRITE_SIZE * 0.4
+        corner_right = stage_width - SPRITE_SIZE * 1.4 - STAGE_MARGIN
+
+        # Always face the player unless intentionally backing out of a corner
+        if not (self.ctx.get("state") == "evade" and (me.x < corner_left or me.x > corner_right)):
+            me.facing = 1 if me.x < opponent.x else -1
+
+        # AI context/state machine
+        ctx = self.ctx
+        ctx["timer"] = max(0.0, ctx.get("timer", 0.0) - dt)
+        ctx["cooldown"] = max(0.0, ctx.get("cooldown", 0.0) - dt)
+        ctx["jump_cooldown"] = max(0.0, ctx.get("jump_cooldown", 0.0) - dt)
+        # Track idle time to break stalemates: if AI stands still too long, force an advance/attack
+        if abs(me.vx) < 1e-3 and not me.attack:
+            ctx["idle"] = ctx.get("idle", 0.0) + dt
+        else:
+            ctx["idle"] = 0.0
+
+        # If stunned/defeated, let physics handle recovery
+        if me.hitstun > 0 or me.defeated or me.victorious:
+            return
+
+        cornered = me.x < corner_left or me.x > corner_right
+        player_attacking = opponent.attack and opponent.attack.phase in (STARTUP, ACTIVE)
+
+        # Only choose a new state when the think timer elapses
+        if ctx["timer"] <= 0:
+            self._choose_state(opponent, stage_width, distance, horiz_dir, cornered, player_attacking)
+            ctx["jump_ok"] = True  # allow one jump per state cycle
+
+        state = ctx["state"]
+        target_x = ctx.get("target_x", opponent.x)
+
+        if state == "evade":
+            step = ai_path_dir(me.x, target_x)
+            if step < 0:
+                me.move_left()
+            elif step > 0:
+                me.move_right()
+            else:
+                me.stop()
+            # Jump occasionally to break pressure strings
+            if ctx.get("jump_ok") and ctx.get("jump_cooldown", 0) <= 0 and distance < 150 and rng.random() < 0.06:
+                me.jump()
+                ctx["jump_ok"] = False
+                ctx["jump_cooldown"] = 1.2
+        elif state == "approach":
+            step = ai_path_dir(me.x, target_x)
+            if step < 0:
+                me.move_left()
+            elif step > 0:
+                me.move_right()
+            else:
+                me.stop()
+            if ctx.get("jump_ok") and ctx.get("jump_cooldown", 0) <= 0 and distance > 280 and rng.random() < 0.04:
+                me.jump()
+                ctx["jump_ok"] = False
+                ctx["jump_cooldown"] = 1.2
+        elif state == "pressure":
+            # Keep poking; back out if cornered to avoid endless flinch
+            if ctx["cooldown"] <= 0 and not me.attack:
+                # Face the player before throwing a poke
+                me.facing = 1 if me.x < opponent.x else -1
+                me.start_attack()
+                ctx["cooldown"] = 1.5  # add larger cooldown between AI attacks
+            desired = opponent.x  # walk directly toward the player while pressuring
+            step = ai_path_dir(me.x, desired, step=20)
+            if step < 0:
+                me.move_left()
+            elif step > 0:
+                me.move_right()
+            else:
+                me.stop()
+            if cornered and rng.random() < 0.2:
+                ctx["state"] = "evade"
+                ctx["timer"] = 0.3
+
+        # If we've been idle too long, push forward and attack
+        if ctx.get("idle", 0.0) > 1.5 and not me.attack:
+            ctx["state"] = "pressure"
+            ctx["timer"] = 0.4
+            ctx["target_x"] = opponent.x
+            ctx["idle"] = 0.0
+            ctx["jump_ok"] = False
+            me.facing = 1 if me.x < opponent.x else -1
+            me.start_attack()
+            ctx["cooldown"] = 1.2
+
+        # If we're very close and idle, force a poke to avoid standing still
+        if distance < 150 and ctx["cooldown"] <= 0 and not me.attack:
+            me.start_attack()
+            ctx["cooldown"] = 1.4
+
+        # Small think delay to reduce jitter; also acts as a simple state timer
+        if ctx["timer"] <= 0:
+            ctx["timer"] = 0.08
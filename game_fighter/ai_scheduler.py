@@ -0,0 +1,265 @@
+"""
+AI think-rate scheduler: controllers decide at their own rate and post to a command mailbox.
+
+`ScheduledController` takes the place of a controller in `Match.controllers`. The
+wrapped controller (`AIController`, `SearchAIController`, `PolicyAIController`, ...)
+runs `hz` times per simulated second against a `CommandCapture` of its fighter, which
+records what it does (walk, stop, jump, punch, turn) instead of doing it. The recorded
+command goes into the mailbox, and every sim tick applies the newest entry to the real
+fighter: presses once, the walk direction and facing on every tick until the next
+decision (but not while the fighter is stunned, defeated or celebrating).
+
+Thinks are counted in simulated time, so AI cost is `hz` decisions per simulated second
+whatever the display refresh or tick rate, and a match stays deterministic (replays,
+rollback, run-ahead). At `hz` equal to the tick rate it plays exactly like the bare
+controller.
+
+With `threaded=True` decisions run on a worker thread against headless twins of both
+fighters. A sim tick only hands over snapshots and picks up finished decisions, so it
+never waits on a slow one; a decision still running when the next is due makes that
+one `late` (skipped). Threaded decisions depend on thread timing: such matches are not
+deterministic and the wrapped controller's state is not part of `snapshot()`. The
+wrapped controller gets its own `random.Random` so the worker never draws from the
+match's gameplay stream, and a decision that raises is counted in `errors` and leaves
+the mailbox as it was. The worker's state (the job in flight, the finished result) is
+not part of `snapshot()` either, so while `speculating` is set (`RunAhead` sets it for
+its speculative ticks) nothing is posted or collected: a job built from a predicted
+state would otherwise land in the real match. Call `close()` when the controller is
+dropped.
+"""
+
+import queue
+import random
+import threading
+import time
+
+from game_fighter.input_manager import JUMP_PRESSED, LEFT, PUNCH_PRESSED, RIGHT
+from game_fighter.search_ai import headless_twin
+
+AI_HZ = 20.0  # default decisions per simulated second
+
+
+class CommandCapture:
+    """
+    Stand-in for a fighter while a controller thinks. Reads go to the real fighter;
+    `move_left`/`move_right`/`stop`/`jump`/`start_attack` and `facing` writes are
+    recorded, and the fields they touch (`vx`, `vy`, `facing`, `attack`) read back as if
+    they had happened.
+    """
+
+    def __init__(self, fighter):
+        self.__dict__.update(fighter=fighter, move=None, press=0)
+
+    def __getattr__(self, name):
+        return getattr(self.fighter, name)
+
+    def move_left(self):
+        self.move = LEFT
+        self.vx = -self.fighter.move_speed
+        self.facing = -1
+
+    def move_right(self):
+        self.move = RIGHT
+        self.vx = self.fighter.move_speed
+        self.facing = 1
+
+    def stop(self):
+        self.move = 0
+        self.vx = 0
+
+    def jump(self):
+        self.press |= JUMP_PRESSED
+        if self.y <= self.floor_y + 0.5:
+            self.vy = self.jump_speed
+
+    def start_attack(self):
+        self.press |= PUNCH_PRESSED
+        if self.attack is None and not self.defeated:
+            self.attack = True
+
+    def command(self):
+        """(walk bits or None for "not touched", press bits, facing or None) as recorded."""
+        return (self.move, self.press, self.__dict__.get("facing"))
+
+
+def apply_mailbox(fighter, command, fresh):
+    """Carry out a recorded command; presses only when `fresh` (the tick it was posted)."""
+    move, press, facing = command
+    if fresh:
+        if press & JUMP_PRESSED:
+            fighter.jump()
+        if press & PUNCH_PRESSED:
+            fighter.start_attack()
+    elif fighter.hitstun > 0 or fighter.defeated or fighter.victorious:
+        return
+    if move == LEFT:
+        fighter.move_left()
+    elif move == RIGHT:
+        fighter.move_right()
+    elif move == 0:
+        fighter.stop()
+    if facing is not None:
+        fighter.facing = facing
+
+
+class ScheduledController:
+    """
+    Runs `controller` at `hz` (see module docstring). Stats: `decisions`, `late`
+    (threaded decisions skipped because the last one was still running), `errors`
+    (threaded decisions that raised; the last exception is `last_error`), `last_ms`,
+    `max_ms` (time inside the wrapped controller per decision). `speculating` keeps a
+    threaded controller away from its worker during run-ahead ticks.
+    """
+
+    def __init__(self, controller, hz=AI_HZ, threaded=False, clock=time.perf_counter):
+        self.controller = controller
+        self.hz = hz
+        self.period = 1.0 / hz
+        self.threaded = threaded
+        self.clock = clock
+        self.decisions = 0
+        self.late = 0
+        self.errors = 0
+        self.last_error = None
+        self.last_ms = 0.0
+        self.max_ms = 0.0
+        self._thread = None
+        self._jobs = None
+        self._done = None  # (generation, command) left by the worker
+        self._busy = False
+        self._generation = 0
+        self.speculating = False
+        if threaded:
+            # The worker must not draw from the stream the sim thread shares with the fighters
+            controller.rng = random.Random(controller.rng.getrandbits(64))
+        self._reset_schedule()
+
+    def _reset_schedule(self):
+        self.acc = self.period  # the first tick thinks
+        self.since = 0.0  # simulated seconds since the last decision
+        self.mailbox = None
+        self.fresh = False
+
+    @property
+    def ctx(self):
+        return self.controller.ctx
+
+    def reset(self):
+        self.controller.reset()
+        self._reset_schedule()
+        self._generation += 1
+        self._busy = False
+
+    def snapshot(self):
+        inner = None if self.threaded else self.controller.snapshot()
+        return (inner, self.acc, self.since, self.mailbox, self.fresh)
+
+    def restore(self, snap):
+        inner, self.acc, self.since, self.mailbox, self.fresh = snap
+        if inner is not None:
+            self.controller.restore(inner)
+
+    def stats(self):
+        return {
+            "hz": self.hz, "decisions": self.decisions, "late": self.late, "errors": self.errors,
+            "last_ms": self.last_ms, "max_ms": self.max_ms,
+        }
+
+    def update(self, dt, me, opponent, stage_width):
+        self.since += dt
+        self.acc += dt
+        # Run-ahead ticks are thrown away, so they neither hand in nor pick up threaded work
+        worker = self.threaded and not self.speculating
+        if worker:
+            self._collect()
+        if self.acc >= self.period:
+            self.acc = min(self.acc - self.period, self.period)
+            if not self.threaded:
+                self._think(me, opponent, stage_width)
+            elif worker:
+                self._post(me, opponent, stage_width)
+        if self.mailbox is not None:
+            apply_mailbox(me, self.mailbox, self.fresh)
+            self.fresh = False
+
+    # ---------------------------
+    # INLINE
+    # ---------------------------
+    def _think(self, me, opponent, stage_width):
+        capture = CommandCapture(me)
+        start = self.clock()
+        self.controller.update(self.since, capture, opponent, stage_width)
+        self._timed(start)
+        self.since = 0.0
+        self.mailbox = capture.command()
+        self.fresh = True
+
+    def _timed(self, start):
+        ms = (self.clock() - start) * 1000.0
+        self.decisions += 1
+        self.last_ms = ms
+        self.max_ms = max(self.max_ms, ms)
+
+    # ---------------------------
+    # THREADED
+    # ---------------------------
+    def _collect(self):
+        done = self._done
+        if done is None:
+            return
+        self._done = None
+        self._busy = False
+        generation, command = done
+        if generation == self._generation and command is not None:
+            self.mailbox = command
+            self.fresh = True
+
+    def _post(self, me, opponent, stage_width):
+        if self._busy:
+            self.late += 1
+            return
+        if self._thread is None or not self._thread.is_alive():
+            self._jobs = queue.Queue(maxsize=1)
+            self._thread = threading.Thread(target=self._work, name="ai-think", daemon=True)
+            self._thread.start()
+        self._busy = True
+        self._jobs.put((self._generation, self.since, me, opponent, me.snapshot(), opponent.snapshot(), stage_width))
+        self.since = 0.0
+
+    def _work(self):
+        twins = {}
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+            generation, dt, me, opponent, me_snap, opp_snap, stage_width = job
+            command = None
+            try:
+                pair = []
+                for side, live, snap in ((0, me, me_snap), (1, opponent, opp_snap)):
+                    key = (side, live.sprite.sheets["idle"]["path"], stage_width)
+                    twin = twins.get(key)
+                    if twin is None:
+                        twin = twins[key] = headless_twin(live, stage_width, random.Random(0))
+                    twin.floor_y = live.floor_y
+                    twin.render_scale = live.render_scale
+                    twin.restore(snap)
+                    pair.append(twin)
+                capture = CommandCapture(pair[0])
+                start = self.clock()
+                self.controller.update(dt, capture, pair[1], stage_width)
+                self._timed(start)
+                command = capture.command()
+            except Exception as exc:  # keep the worker alive; the sim keeps the last command
+                self.errors += 1
+                self.last_error = exc
+            finally:
+                # Always hand the job back, or every later decision would count as late
+                self._done = (generation, command)
+
+    def close(self):
+        """Stop the worker thread (if one was started)."""
+        if self._thread is not None:
+            self._jobs.put(None)
+            self._thread.join()
+            self._thread = None
@@ -0,0 +1,442 @@
+"""
+Structure-of-arrays batch simulator: N matches stepped at once with NumPy.
+
+Every per-fighter field lives in a (2, N) array (row 0 = P1, row 1 = P2) and every
+per-match field in an (N,) array, so one `step` runs `Fighter.update`,
+`apply_gravity`, `update_attack`, `Match.separate_fighters` and `Match.check_hit`
+for all matches with masked vector operations instead of Python method calls.
+
+Collision boxes are copied from a headless `Fighter`'s compiled `frame_boxes` tables
+(every animation state, frame and facing) and placed with the same
+`origin + offset * render_scale` arithmetic, so they match the scalar boxes exactly.
+Both sides are command-driven (see `input_manager` bits); AI controllers stay scalar.
+Motion commands and projectiles are scalar-only: the batch ignores DOWN and has no
+projectile pool, so it matches a scalar `Match` with `motion_inputs` off.
+"""
+
+import random
+
+import numpy as np
+
+from game_fighter.constants import PHYSICS_SCALE, SPRITE_SCALE, SPRITE_SIZE, STAGE_MARGIN
+from game_fighter.fighter import AttackPhase, Fighter
+from game_fighter.input_manager import JUMP_PRESSED, LEFT, PUNCH_PRESSED, RIGHT
+from game_fighter.match import GRAVITY, ROUND_SECONDS, reference_floor_y, start_positions
+from game_fighter.roster import CHARACTERS
+
+# Animation ids; each victory pose variant gets its own id
+IDLE, RUN, JUMP, ATTACK, HIT, DEFEAT, VICTORY = range(7)
+ANIM_NAMES = ("idle", "run", "jump", "attack", "hit", "defeat")
+ANIM_LOOPS = (True, True, True, False, False, False)
+# Attack phases: `fighter.AttackPhase` ids, plus 0 for no attack
+PHASE_NONE = 0
+PHASE_STARTUP, PHASE_ACTIVE, PHASE_RECOVERY = (int(p) for p in AttackPhase)
+
+
+class CharacterTables:
+    """
+    Per-character animation and collision tables, read from a headless `Fighter`.
+
+    Box arrays are (characters, states, frames, facing, 4) offsets from the fighter
+    origin; facing index 0 is right (+1), 1 is left (-1).
+    """
+
+    def __init__(self, characters, render_scale=SPRITE_SCALE):
+        self.characters = list(characters)
+        variants = [len(CHARACTERS[key]()["victory"]) for key in self.characters]
+        self.n_states = VICTORY + max(variants)
+        samples = []
+        for key in self.characters:
+            paths = CHARACTERS[key]()
+            # One fighter per victory pose (a one-item list leaves the pick no choice)
+            samples.append([Fighter(0, 0, dict(paths, victory=[v]), 0, stage_width=1280, rng=random.Random(0)) for v in paths["victory"]])
+        max_frames = max(len(s.sprite.sheets[name]["rects"]) for per in samples for s in per for name in s.sprite.sheets)
+
+        shape = (len(self.characters), self.n_states)
+        self.n_frames = np.ones(shape, dtype=np.int64)
+        self.fps = np.zeros(shape)
+        self.loops = np.ones(shape, dtype=bool)
+        self.hurtbox = np.zeros(shape + (max_frames, 2, 4))
+        self.hitbox = np.zeros(shape + (max_frames, 2, 4))
+        self.victory_variants = np.array(variants)
+        self.move_speed = np.zeros(len(self.characters))
+        self.jump_speed = np.zeros(len(self.characters))
+        self.startup = np.zeros(len(self.characters))
+        self.active = np.zeros(len(self.characters))
+        self.recovery = np.zeros(len(self.characters))
+        self.dmg = np.zeros(len(self.characters), dtype=np.int64)
+
+        for c, per_variant in enumerate(samples):
+            f0 = per_variant[0]
+            self.move_speed[c] = f0.move_speed
+            self.jump_speed[c] = f0.jump_speed
+            cfg = f0.attack_cfg
+            self.startup[c], self.active[c], self.recovery[c], self.dmg[c] = cfg["startup"], cfg["active"], cfg["recovery"], cfg["dmg"]
+            states = [(i, name, ANIM_LOOPS[i], f0) for i, name in enumerate(ANIM_NAMES)]
+            states += [(VICTORY + v, "victory", True, f) for v, f in enumerate(per_variant)]
+            for s, name, loop, fighter in states:
+                self._measure(c, s, name, loop, fighter, render_scale)
+
+    def _measure(self, c, s, name, loop, fighter, render_scale):
+        sheet = fighter.sprite.sheets[name]
+        self.n_frames[c, s] = len(sheet["rects"])
+        self.fps[c, s] = sheet["fps"]
+        self.loops[c, s] = loop
+        # The fighter's compiled tables hold (frame, facing) entries flattened as frame * 2 + face
+        boxes = np.array(fighter.frame_boxes[name], dtype=float) * render_scale
+        n = len(boxes) // 2
+        self.hurtbox[c, s, :n] = boxes[:, 0].reshape(n, 2, 4)
+        self.hitbox[c, s, :n] = boxes[:, 1].reshape(n, 2, 4)
+
+
+class BatchMatch:
+    """
+    N command-driven matches of `p1` vs `p2` on one stage, stepped together.
+
+    Fighter fields are (2, N) arrays named after the `Fighter` attributes (`x`, `vy`,
+    `hitstun`, `hp`, ...), plus `phase`/`attack_t`/`has_hit` for the attack, `anim`/
+    `frame` for the sprite, and `victory_anim` for each fighter's victory pose. Match
+    fields are (N,): `round_timer`, `timer_accum`, `p1_wins`, `p2_wins`, and the first
+    KO's `ko_tick` (-1 until then) and `winner` (0 none, 1 P1, 2 P2). `hits` and
+    `damage` count landed hits and damage dealt per fighter.
+    """
+
+    def __init__(self, n, p1="ryu", p2="ken", stage_width=1280, gravity=GRAVITY, seed=None, victory_variants=None):
+        self.n = int(n)
+        keys = [p1] if p1 == p2 else [p1, p2]
+        self.tables = CharacterTables(keys)
+        self.char = np.array([0, keys.index(p2)])[:, None].repeat(self.n, axis=1)
+        self.stage_width = stage_width
+        self.floor_y = reference_floor_y(stage_width)
+        self.gravity = gravity
+        self.render_scale = SPRITE_SCALE
+        self.defeat_gravity_multiplier = 0.4
+        t = self.tables
+        self.move_speed = t.move_speed[self.char]
+        self.jump_speed = t.jump_speed[self.char]
+        self.dmg = t.dmg[self.char]
+
+        shape = (2, self.n)
+        self.x = np.zeros(shape)
+        self.y = np.zeros(shape)
+        self.vx = np.zeros(shape)
+        self.vy = np.zeros(shape)
+        self.facing = np.ones(shape, dtype=np.int64)
+        self.hp = np.full(shape, 100, dtype=np.int64)
+        self.hitstun = np.zeros(shape)
+        self.knockback_vx = np.zeros(shape)
+        self.was_hit = np.zeros(shape, dtype=bool)
+        self.defeated = np.zeros(shape, dtype=bool)
+        self.victorious = np.zeros(shape, dtype=bool)
+        self.defeat_floor = np.full(shape, float(self.floor_y))
+        self.defeat_impact_count = np.zeros(shape, dtype=np.int64)
+        self.defeat_knock_dir = np.ones(shape, dtype=np.int64)
+        self.phase = np.zeros(shape, dtype=np.int64)
+        self.attack_t = np.zeros(shape)
+        self.has_hit = np.zeros(shape, dtype=bool)
+        self.anim = np.zeros(shape, dtype=np.int64)
+        self.frame = np.zeros(shape)
+        if victory_variants is None:
+            rng = np.random.default_rng(seed)
+            victory_variants = rng.integers(0, t.victory_variants[self.char])
+        self.victory_anim = VICTORY + np.asarray(victory_variants, dtype=np.int64).reshape(shape)
+        self.hits = np.zeros(shape, dtype=np.int64)
+        self.damage = np.zeros(shape, dtype=np.int64)
+
+        self.round_timer = np.full(self.n, ROUND_SECONDS, dtype=np.int64)
+        self.timer_accum = np.zeros(self.n)
+        self.p1_wins = np.zeros(self.n, dtype=np.int64)
+        self.p2_wins = np.zeros(self.n, dtype=np.int64)
+        self.ko_tick = np.full(self.n, -1, dtype=np.int64)
+        self.winner = np.zeros(self.n, dtype=np.int64)
+        self.tick = 0
+        self.reset_round()
+
+    @classmethod
+    def from_matches(cls, matches):
+        """Load the current state of scalar `Match` objects (same characters and stage, motion commands off) into one batch."""
+        if any(m.motion_inputs or m.projectiles.count for m in matches):
+            raise ValueError("batch matches have no motion commands or projectiles; turn motion_inputs off")
+        first = matches[0]
+        keys = [_character_key(first.p1), _character_key(first.p2)]
+        batch = cls(len(matches), keys[0], keys[1], stage_width=first.stage_width, gravity=first.gravity,
+                    victory_variants=[[_victory_variant(m.p1) for m in matches], [_victory_variant(m.p2) for m in matches]])
+        batch.floor_y = first.floor_y
+        for i, match in enumerate(matches):
+            for side, f in enumerate((match.p1, match.p2)):
+                batch.x[side, i], batch.y[side, i], batch.vx[side, i], batch.vy[side, i] = f.x, f.y, f.vx, f.vy
+                batch.facing[side, i] = f.facing
+                batch.hp[side, i] = f.hp
+                batch.hitstun[side, i], batch.knockback_vx[side, i] = f.hitstun, f.knockback_vx
+                batch.was_hit[side, i], batch.defeated[side, i], batch.victorious[side, i] = f.was_hit, f.defeated, f.victorious
+                batch.defeat_floor[side, i] = f.defeat_floor
+                batch.defeat_impact_count[side, i], batch.defeat_knock_dir[side, i] = f.defeat_impact_count, f.defeat_knock_dir
+                a = f.attack
+                batch.phase[side, i] = a.phase if a else PHASE_NONE
+                batch.attack_t[side, i] = a.t if a else 0.0
+                batch.has_hit[side, i] = a.has_hit if a else False
+                state = f.sprite.state
+                batch.anim[side, i] = batch.victory_anim[side, i] if state == "victory" else ANIM_NAMES.index(state)
+                batch.frame[side, i] = f.sprite.frame
+            batch.round_timer[i], batch.timer_accum[i] = match.round_timer, match._timer_accum
+            batch.p1_wins[i], batch.p2_wins[i] = match.p1_wins, match.p2_wins
+        return batch
+
+    def reset_round(self):
+        """Vector version of `Match.reset_round` for every match."""
+        left, right = start_positions(self.stage_width, self.render_scale)
+        self.x[0], self.x[1] = left, right
+        self.y[:] = self.floor_y
+        self.vx[:] = 0.0
+        self.vy[:] = 0.0
+        self.facing[0], self.facing[1] = 1, -1
+        self.hp[:] = 100
+        self.hitstun[:] = 0.0
+        self.knockback_vx[:] = 0.0
+        self.was_hit[:] = False
+        self.defeated[:] = False
+        self.victorious[:] = False
+        self.defeat_floor[:] = self.floor_y
+        self.defeat_impact_count[:] = 0
+        self.defeat_knock_dir[:] = self.facing
+        self.phase[:] = PHASE_NONE
+        self.attack_t[:] = 0.0
+        self.has_hit[:] = False
+        self.anim[:] = IDLE
+        self.frame[:] = 0.0
+        self.round_timer[:] = ROUND_SECONDS
+        self.timer_accum[:] = 0.0
+
+    # ---------------------------
+    # TABLE LOOKUPS
+    # ---------------------------
+    def _frame_index(self):
+        n = self.tables.n_frames[self.char, self.anim]
+        return np.clip(self.frame.astype(np.int64), 0, n - 1)
+
+    def _boxes(self, table):
+        """World-space boxes (2, N, 4) for every fighter from a collision table."""
+        boxes = table[self.char, self.anim, self._frame_index(), (self.facing < 0).astype(np.int64)]
+        boxes[..., 0] += self.x
+        boxes[..., 1] += self.y
+        return boxes
+
+    def hurtboxes(self):
+        return self._boxes(self.tables.hurtbox)
+
+    def hitboxes(self):
+        return self._boxes(self.tables.hitbox)
+
+    # ---------------------------
+    # FIGHTER UPDATE
+    # ---------------------------
+    def _play(self, mask, anim):
+        """`SpriteAnim.play(..., restart=True)` where `mask` is set."""
+        self.anim = np.where(mask, anim, self.anim)
+        self.frame = np.where(mask, 0.0, self.frame)
+
+    def _clamp_x(self, mask):
+        eff_size = SPRITE_SIZE * (self.render_scale / float(SPRITE_SCALE))
+        max_x = self.stage_width - eff_size - STAGE_MARGIN
+        self.x = np.where(mask, np.maximum(STAGE_MARGIN, np.minimum(max_x, self.x)), self.x)
+
+    def _apply_gravity(self, mask, dt):
+        self.vy = np.where(mask, self.vy + self.gravity * dt, self.vy)
+        self.y = np.where(mask, self.y + self.vy * dt, self.y)
+        below = mask & (self.y < self.floor_y)
+        self.y = np.where(below, self.floor_y, self.y)
+        self.vy = np.where(below, 0.0, self.vy)
+
+    def _update_attack(self, mask, dt):
+        t = self.tables
+        m = mask & (self.phase != PHASE_NONE)
+        self.attack_t = np.where(m, self.attack_t + dt, self.attack_t)
+        phase = self.phase
+        to_active = m & (phase == PHASE_STARTUP) & (self.attack_t >= t.startup[self.char])
+        to_recovery = m & (phase == PHASE_ACTIVE) & (self.attack_t >= t.active[self.char])
+        done = m & (phase == PHASE_RECOVERY) & (self.attack_t >= t.recovery[self.char])
+        self.phase = np.where(to_active, PHASE_ACTIVE, np.where(to_recovery, PHASE_RECOVERY, np.where(done, PHASE_NONE, phase)))
+        self.attack_t = np.where(to_active | to_recovery | done, 0.0, self.attack_t)
+        self.has_hit = np.where(done, False, self.has_hit)
+
+    def _pick_anim(self):
+        t = self.tables
+        on_ground = (self.y <= self.floor_y + 0.5) & (np.abs(self.vy) < 1e-3)
+        loops = t.loops[self.char, self.anim]
+        finished = ~loops & (self.frame >= t.n_frames[self.char, self.anim] - 1)
+        target = np.select(
+            [self.victorious, self.defeated, self.hitstun > 0, (self.phase != PHASE_NONE) & ~finished, ~on_ground, np.abs(self.vx) > 1],
+            [self.victory_anim, DEFEAT, HIT, ATTACK, JUMP, RUN],
+            IDLE,
+        )
+        self._play(self.anim != target, target)
+
+    def _update_sprites(self, dt):
+        t = self.tables
+        n = t.n_frames[self.char, self.anim]
+        loops = t.loops[self.char, self.anim]
+        frame = self.frame + t.fps[self.char, self.anim] * dt
+        over = frame >= n
+        self.frame = np.where(over & loops, frame % n, np.where(over, n - 1e-6, frame))
+
+    def update_fighters(self, dt):
+        """`Fighter.update` for all 2N fighters: victory, defeat, hitstun and normal branches as masks."""
+        victorious = self.victorious
+        defeated = self.defeated & ~victorious
+        stunned = ~victorious & ~defeated & (self.hitstun > 0)
+        normal = ~victorious & ~defeated & ~stunned
+
+        self.vx = np.where(victorious, 0.0, self.vx)
+
+        # Defeated: knockback slide, lighter gravity, two bounces on the defeat floor
+        prev_y = self.y
+        self.x = np.where(defeated, self.x + self.knockback_vx * dt, self.x)
+        self.knockback_vx = np.where(defeated, self.knockback_vx * 0.9, self.knockback_vx)
+        self.vy = np.where(defeated, self.vy + self.gravity * self.defeat_gravity_multiplier * dt, self.vy)
+        self.y = np.where(defeated, self.y + self.vy * dt, self.y)
+        below = defeated & (self.y < self.defeat_floor)
+        landed = below & (prev_y > self.defeat_floor)
+        self.y = np.where(below, self.defeat_floor, self.y)
+        self.vy = np.where(below, 0.0, self.vy)
+        impact = landed & (self.defeat_impact_count < 2)
+        self.defeat_impact_count = self.defeat_impact_count + impact
+        first = impact & (self.defeat_impact_count == 1)
+        second = impact & (self.defeat_impact_count == 2)
+        self.frame = np.where(first, 2.0, np.where(second, 4.0, self.frame))
+        self.vy = np.where(first, self.jump_speed * 0.42, np.where(second, 0.0, self.vy))
+        self.knockback_vx = np.where(second, self.defeat_knock_dir * (900 * PHYSICS_SCALE), self.knockback_vx)
+        self._clamp_x(defeated)
+
+        # Hitstun: knockback with friction, normal gravity, no attack progress
+        self.hitstun = np.where(stunned, self.hitstun - dt, self.hitstun)
+        self.x = np.where(stunned, self.x + self.knockback_vx * dt, self.x)
+        self._clamp_x(stunned)
+        self.knockback_vx = np.where(stunned, self.knockback_vx * 0.85, self.knockback_vx)
+        self._apply_gravity(stunned, dt)
+        self.knockback_vx = np.where(stunned & (self.hitstun <= 0), 0.0, self.knockback_vx)
+
+        # Normal: walk, gravity, clamp, attack phases
+        self.x = np.where(normal, self.x + self.vx * dt, self.x)
+        self._apply_gravity(normal, dt)
+        self._clamp_x(normal)
+        self._update_attack(normal, dt)
+
+        self._pick_anim()
+        self._update_sprites(dt)
+
+    # ---------------------------
+    # MATCH STEP
+    # ---------------------------
+    def apply_commands(self, cmds):
+        """`match.apply_command` for both sides; `cmds` is (2, N) command bits."""
+        on_floor = self.y <= self.floor_y + 0.5
+        self.vy = np.where((cmds & JUMP_PRESSED).astype(bool) & on_floor, self.jump_speed, self.vy)
+        attack = (cmds & PUNCH_PRESSED).astype(bool) & (self.phase == PHASE_NONE) & ~self.defeated
+        self.phase = np.where(attack, PHASE_STARTUP, self.phase)
+        self.attack_t = np.where(attack, 0.0, self.attack_t)
+        self.has_hit = np.where(attack, False, self.has_hit)
+        self._play(attack, ATTACK)
+        left = (cmds & LEFT).astype(bool)
+        right = (cmds & RIGHT).astype(bool)
+        go_left = left & ~right
+        go_right = right & ~left
+        self.vx = np.where(go_left, -self.move_speed, np.where(go_right, self.move_speed, 0.0))
+        self.facing = np.where(go_left, -1, np.where(go_right, 1, self.facing))
+
+    def step(self, dt, p1_cmd=0, p2_cmd=0):
+        """One `Match.step` tick for every match; commands are scalars or (N,) arrays."""
+        cmds = np.empty((2, self.n), dtype=np.int64)
+        cmds[0] = p1_cmd
+        cmds[1] = p2_cmd
+        self.apply_commands(cmds)
+
+        self.timer_accum += dt
+        tick_down = (self.timer_accum >= 1.0) & (self.round_timer > 0)
+        whole = np.floor(self.timer_accum).astype(np.int64)
+        self.timer_accum = np.where(tick_down, self.timer_accum - whole, self.timer_accum)
+        self.round_timer = np.where(tick_down, np.maximum(0, self.round_timer - whole), self.round_timer)
+
+        self.update_fighters(dt)
+        self.separate_fighters()
+        self.check_hits(0, 1)
+        self.check_hits(1, 0)
+        self.tick += 1
+
+    def separate_fighters(self):
+        hb = self.hurtboxes()
+        x1, y1, w1, h1 = hb[0, :, 0], hb[0, :, 1], hb[0, :, 2], hb[0, :, 3]
+        x2, y2, w2, h2 = hb[1, :, 0], hb[1, :, 1], hb[1, :, 2], hb[1, :, 3]
+        vertical = ~((y1 + h1 <= y2) | (y2 + h2 <= y1))
+        overlap_x = np.minimum(x1 + w1, x2 + w2) - np.maximum(x1, x2)
+        m = vertical & (overlap_x > 0)
+        push = np.where(m, overlap_x / 2.0 + 1.0, 0.0)
+        sign = np.where(x1 <= x2, -1.0, 1.0)
+        max_x = self.stage_width - SPRITE_SIZE - STAGE_MARGIN
+        for side, direction in ((0, sign), (1, -sign)):
+            moved = self.x[side] + direction * push
+            self.x[side] = np.where(m, np.maximum(STAGE_MARGIN, np.minimum(max_x, moved)), self.x[side])
+
+    def check_hits(self, a, d):
+        """`Match.check_hit(attacker=a, defender=d)` across all matches (a, d are rows 0/1)."""
+        hit = self.hitboxes()[a]
+        hurt = self.hurtboxes()[d]
+        overlap = ~(
+            (hit[:, 0] + hit[:, 2] <= hurt[:, 0]) | (hurt[:, 0] + hurt[:, 2] <= hit[:, 0])
+            | (hit[:, 1] + hit[:, 3] <= hurt[:, 1]) | (hurt[:, 1] + hurt[:, 3] <= hit[:, 1])
+        )
+        m = (self.phase[a] == PHASE_ACTIVE) & ~self.has_hit[a] & overlap
+        if not m.any():
+            return
+        self.has_hit[a] |= m
+        self.hp[d] = np.where(m, np.maximum(0, self.hp[d] - self.dmg[a]), self.hp[d])
+        self.hits[a] += m
+        self.damage[a] += np.where(m, self.dmg[a], 0)
+        direction = np.where(self.x[d] > self.x[a], 1, -1)
+        self.defeat_knock_dir[d] = np.where(m, direction, self.defeat_knock_dir[d])
+        self.knockback_vx[d] = np.where(m, direction * 620 * PHYSICS_SCALE, self.knockback_vx[d])
+        self.hitstun[d] = np.where(m, 0.22, self.hitstun[d])
+        self.was_hit[d] |= m
+        self.anim[d] = np.where(m, HIT, self.anim[d])
+        self.frame[d] = np.where(m, 0.0, self.frame[d])
+
+        ko = m & (self.hp[d] <= 0)
+        if not ko.any():
+            return
+        self.knockback_vx[d] = np.where(ko, direction * 1800 * PHYSICS_SCALE, self.knockback_vx[d])
+        # Defender: on_defeat
+        self.defeated[d] |= ko
+        self.victorious[d] &= ~ko
+        self.vx[d] = np.where(ko, 0.0, self.vx[d])
+        self.defeat_floor[d] = np.where(ko, max(0, self.floor_y - 10), self.defeat_floor[d])
+        self.vy[d] = np.where(ko, -np.abs(self.jump_speed[d]) * 0.1, self.vy[d])
+        self.defeat_impact_count[d] = np.where(ko, 0, self.defeat_impact_count[d])
+        self.anim[d] = np.where(ko, DEFEAT, self.anim[d])
+        # Attacker: on_victory
+        self.victorious[a] |= ko
+        self.defeated[a] &= ~ko
+        self.vx[a] = np.where(ko, 0.0, self.vx[a])
+        self.anim[a] = np.where(ko, self.victory_anim[a], self.anim[a])
+        self.frame[a] = np.where(ko, 0.0, self.frame[a])
+        for side in (a, d):
+            self.phase[side] = np.where(ko, PHASE_NONE, self.phase[side])
+            self.attack_t[side] = np.where(ko, 0.0, self.attack_t[side])
+            self.has_hit[side] = np.where(ko, False, self.has_hit[side])
+        wins = self.p1_wins if d == 1 else self.p2_wins
+        wins += ko
+        first = ko & (self.ko_tick < 0)
+        self.ko_tick = np.where(first, self.tick + 1, self.ko_tick)
+        self.winner = np.where(first, a + 1, self.winner)
+
+
+def _character_key(fighter):
+    """Roster key whose sprite paths this fighter was built from."""
+    idle_path = fighter.sprite.sheets["idle"]["path"]
+    for key, loader in CHARACTERS.items():
+        if loader()["idle"] == idle_path:
+            return key
+    raise ValueError(f"fighter sprites {idle_path!r} are not in the roster")
+
+
+def _victory_variant(fighter):
+    paths = CHARACTERS[_character_key(fighter)]()["victory"]
+    return paths.index(fighter.sprite.sheets["victory"]["path"])
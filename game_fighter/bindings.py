@@ -0,0 +1,231 @@
+"""
+User-remappable key and gamepad bindings.
+
+Bindings are kept as readable names per action ({"punch": ["j", "space"]}) and saved
+to a small JSON file. `Bindings.compile()` turns them into flat dicts keyed by Kivy
+keycode or gamepad button id, so an input event resolves to its action with one dict
+lookup instead of name normalization and string comparisons.
+
+Usage (inspect or change the saved bindings):
+    python -m game_fighter.bindings --show
+    python -m game_fighter.bindings --key punch=k,space --menu back=q --pad punch=5
+    python -m game_fighter.bindings --key-p2 punch=rctrl,l
+    python -m game_fighter.bindings --reset
+"""
+
+import argparse
+import json
+import os
+
+from game_fighter.roster import BASE_DIR
+
+BINDINGS_PATH = os.environ.get("FIGHTER_BINDINGS") or os.path.join(BASE_DIR, "bindings.json")
+
+# Kivy (SDL2) keycodes of named keys; single printable characters use their lowercase code
+KEY_CODES = {
+    "backspace": 8, "tab": 9, "enter": 13, "escape": 27, "space": 32, "delete": 127,
+    "up": 273, "down": 274, "right": 275, "left": 276,
+    "insert": 277, "home": 278, "end": 279, "pageup": 280, "pagedown": 281,
+    "numpadenter": 271,
+    "f1": 282, "f2": 283, "f3": 284, "f4": 285, "f5": 286, "f6": 287,
+    "f7": 288, "f8": 289, "f9": 290, "f10": 291, "f11": 292, "f12": 293,
+    "rshift": 303, "shift": 304, "rctrl": 305, "lctrl": 306, "ralt": 307, "alt": 308,
+}
+KEY_NAMES = {code: name for name, code in KEY_CODES.items()}
+# How hints on screen spell the modifier keys (other names are capitalized)
+KEY_LABELS = {"rshift": "RShift", "rctrl": "RCtrl", "lctrl": "LCtrl", "ralt": "RAlt"}
+MOVE_ACTIONS = ("up", "left", "down", "right")
+
+# Gameplay actions (InputManager actions) and menu actions (`_handle_menu_action`)
+DEFAULT_BINDINGS = {
+    "keys": {
+        "left": ["left", "a"],
+        "right": ["right", "d"],
+        "up": ["up", "w"],
+        "down": ["down", "s"],
+        "punch": ["j", "space"],
+    },
+    # Local versus splits the keyboard: these go to P2, the rest of `keys` stays with P1
+    "keys_p2": {
+        "left": ["left"],
+        "right": ["right"],
+        "up": ["up"],
+        "down": ["down"],
+        "punch": ["rctrl", "rshift"],
+    },
+    "menu_keys": {
+        "confirm": ["enter", "numpadenter", "space", "r"],
+        "left": ["left", "a"],
+        "right": ["right", "d"],
+        "up": ["up", "w"],
+        "down": ["down", "s"],
+        "back": ["m", "escape", "backspace"],
+    },
+    "pad_buttons": {
+        "up": [0, 3],  # A / Y jump
+        "punch": [1, 2],  # B / X attack
+    },
+    "pad_menu": {
+        "confirm": [0, 1, 2, 3, 7],  # face buttons and Start / Options
+        "swap": [6],  # Back / Share: move this pad to the other player (versus character select)
+    },
+}
+TABLES = tuple(DEFAULT_BINDINGS)
+CLI_FLAGS = {"keys": "--key", "keys_p2": "--key-p2", "menu_keys": "--menu", "pad_buttons": "--pad", "pad_menu": "--pad-menu"}
+
+
+def keycode(name):
+    """Keycode for a key name ("space", "a", "f5") or a raw code ("301"); ValueError if unknown."""
+    key = str(name).strip().lower()
+    if key in KEY_CODES:
+        return KEY_CODES[key]
+    if key.isdigit() and len(key) > 1:
+        return int(key)
+    if len(key) == 1 and 32 < ord(key) < 127:
+        return ord(key)
+    raise ValueError(f"unknown key {name!r}")
+
+
+def key_name(code):
+    if code in KEY_NAMES:
+        return KEY_NAMES[code]
+    if 32 < code < 127:
+        return chr(code)
+    return str(code)
+
+
+def key_label(name):
+    """On-screen spelling of a key name: "J", "RCtrl", "Space"."""
+    return KEY_LABELS.get(name) or (name.upper() if len(name) == 1 else name.capitalize())
+
+
+def _copy(bindings):
+    return {table: {action: list(inputs) for action, inputs in actions.items()} for table, actions in bindings.items()}
+
+
+class Bindings:
+    """
+    Named bindings plus their compiled lookups: `keys`, `keys_p2`, `menu_keys` ({keycode: action})
+    and `pad_buttons`, `pad_menu` ({button id: action}). Within one table an input
+    drives one action; binding it elsewhere in that table moves it.
+    """
+
+    def __init__(self, bindings=None, path=None):
+        self.path = path
+        self.bindings = _copy(DEFAULT_BINDINGS)
+        if bindings:
+            self.update(bindings)
+        self.compile()
+
+    @classmethod
+    def load(cls, path=BINDINGS_PATH):
+        """Saved bindings over the defaults; defaults alone when the file is missing or unreadable."""
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                saved = json.load(f)
+            return cls(saved if isinstance(saved, dict) else None, path)
+        except (OSError, ValueError):
+            return cls(None, path)
+
+    def save(self, path=None):
+        path = path or self.path or BINDINGS_PATH
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.bindings, f, indent=2, sort_keys=True)
+
+    def update(self, bindings):
+        """Apply {table: {action: [inputs]}} over the current bindings (unknown tables and bad keys are skipped)."""
+        for table, actions in bindings.items():
+            if table not in self.bindings or not isinstance(actions, dict):
+                continue
+            for action, inputs in actions.items():
+                if action in DEFAULT_BINDINGS[table] and isinstance(inputs, list):
+                    self.bind(table, action, inputs, compile=False)
+        self.compile()
+
+    def bind(self, table, action, inputs, compile=True):
+        """Make `inputs` (key names or button ids) the bindings of `action`, taking them from other actions."""
+        is_pad = table.startswith("pad")
+        normalized = []
+        for value in inputs:
+            try:
+                value = int(value) if is_pad else key_name(keycode(value))
+            except ValueError:
+                continue
+            if value not in normalized:
+                normalized.append(value)
+        actions = self.bindings[table]
+        for other, other_inputs in actions.items():
+            if other != action:
+                actions[other] = [v for v in other_inputs if v not in normalized]
+        actions[action] = normalized
+        if compile:
+            self.compile()
+
+    def reset(self):
+        self.bindings = _copy(DEFAULT_BINDINGS)
+        self.compile()
+
+    def key_hint(self, table, skip=()):
+        """
+        Short on-screen label of a keyboard table's first key per action, e.g. "WASD + J"
+        or "arrows + RCtrl". Keycodes in `skip` (another player's keys) are left out.
+        """
+        def first(action):
+            names = [name for name in self.bindings[table][action] if keycode(name) not in skip]
+            return names[0] if names else None
+
+        moves = [first(action) for action in MOVE_ACTIONS]
+        if moves == list(MOVE_ACTIONS):
+            move = "arrows"
+        elif all(name is not None and len(name) == 1 for name in moves):
+            move = "".join(moves).upper()
+        else:
+            move = "/".join(key_label(name) if name else "-" for name in moves)
+        punch = first("punch")
+        return f"{move} + {key_label(punch) if punch else '-'}"
+
+    def compile(self):
+        """Rebuild the per-event lookup dicts from the named bindings."""
+        for table in TABLES:
+            is_pad = table.startswith("pad")
+            lookup = {}
+            for action, inputs in self.bindings[table].items():
+                for value in inputs:
+                    lookup[value if is_pad else keycode(value)] = action
+            setattr(self, table, lookup)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m game_fighter.bindings", description="Show or change the saved key and gamepad bindings.")
+    parser.add_argument("--path", default=BINDINGS_PATH, help="Bindings file (env FIGHTER_BINDINGS).")
+    parser.add_argument("--show", action="store_true", help="Print the bindings after any changes.")
+    parser.add_argument("--reset", action="store_true", help="Go back to the default bindings.")
+    for table in TABLES:
+        parser.add_argument(CLI_FLAGS[table], dest=table, action="append", default=[], metavar="ACTION=INPUT[,INPUT]",
+                            help=f"Rebind a {table} action ({', '.join(DEFAULT_BINDINGS[table])}).")
+    args = parser.parse_args(argv)
+
+    bindings = Bindings(path=args.path) if args.reset else Bindings.load(args.path)
+    changed = args.reset
+    for table in TABLES:
+        for spec in getattr(args, table):
+            action, _, inputs = spec.partition("=")
+            if action not in DEFAULT_BINDINGS[table]:
+                parser.error(f"unknown {table} action {action!r} (choose from {', '.join(DEFAULT_BINDINGS[table])})")
+            bindings.bind(table, action, [i for i in inputs.split(",") if i.strip()])
+            changed = True
+    if changed:
+        bindings.save(args.path)
+        print(f"saved {args.path}")
+    if args.show or not changed:
+        for table in TABLES:
+            print(f"{table}:")
+            for action, inputs in bindings.bindings[table].items():
+                print(f"  {action:<8} {', '.join(str(i) for i in inputs) or '-'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+"""
+Collision world: every hitbox, hurtbox and pushbox of a tick in one list, paired up by
+a sort-and-sweep broadphase on x before the exact `aabb` test.
+
+Boxes are `(x, y, w, h)` with the same strict-overlap rule as `match.aabb` (touching
+edges do not collide). Only interacting kinds are paired: a hitbox with a hurtbox of
+another owner (and another team, when teams are given), and two pushboxes of different
+owners.
+
+A box may also carry its `motion` over the tick (it moved in a straight line from
+`box - motion` to `box`) and the `window` of the tick it existed for. Moving boxes are
+tested with a swept-AABB time of impact instead of only at the tick's end, so fast
+boxes cannot pass through each other between ticks.
+
+Every contact gets a time of impact: the fraction of the tick at which the boxes first
+overlap (1.0 for boxes that only overlap at the tick's end). Contacts come back sorted
+by (time, index, index), so resolution order depends only on timing and the order
+boxes were added, never on hashing.
+"""
+
+HITBOX = 0
+HURTBOX = 1
+PUSHBOX = 2
+# Below this many boxes a plain all-pairs loop beats sorting (see tools/collision_bench.py)
+SWEEP_MIN_BOXES = 8
+# Sweep of a box that did not move and existed for the whole tick: (dx, dy, window start, window end)
+STATIC = (0.0, 0.0, 0.0, 1.0)
+
+
+def _interacts(tag_a, tag_b):
+    owner, kind, team = tag_a
+    other_owner, other, other_team = tag_b
+    if owner is other_owner:
+        return False
+    if kind == PUSHBOX or other == PUSHBOX:
+        return kind == other
+    return kind != other and (team is None or team != other_team)
+
+
+def _overlaps(box_a, box_b):
+    ax, ay, aw, ah = box_a
+    bx, by, bw, bh = box_b
+    return not (ax + aw <= bx or bx + bw <= ax or ay + ah <= by or by + bh <= ay)
+
+
+def _collides(tag_a, box_a, tag_b, box_b):
+    """Do two tagged boxes interact and strictly overlap?"""
+    return _interacts(tag_a, tag_b) and _overlaps(box_a, box_b)
+
+
+def sweep_overlap(box_a, motion_a, box_b, motion_b):
+    """
+    Fractions (enter, exit) of the tick during which two boxes moving in straight lines
+    (from `box - motion` to `box`) strictly overlap, clipped to 0..1; None if they never do.
+    """
+    ax, ay, aw, ah = box_a
+    bx, by, bw, bh = box_b
+    adx, ady = motion_a[0], motion_a[1]
+    bdx, bdy = motion_b[0], motion_b[1]
+    enter, leave = 0.0, 1.0
+    # Per axis, in b's frame: a starts at a0 and moves by v over the tick
+    for a0, a_len, b0, b_len, v in (
+        (ax - adx, aw, bx - bdx, bw, adx - bdx),
+        (ay - ady, ah, by - bdy, bh, ady - bdy),
+    ):
+        if v == 0.0:
+            if a0 + a_len <= b0 or b0 + b_len <= a0:
+                return None
+            continue
+        t_in = (b0 - (a0 + a_len)) / v
+        t_out = (b0 + b_len - a0) / v
+        if t_in > t_out:
+            t_in, t_out = t_out, t_in
+        if t_in > enter:
+            enter = t_in
+        if t_out < leave:
+            leave = t_out
+        if enter >= leave:
+            return None
+    return enter, leave
+
+
+def _impact_time(box_a, sweep_a, box_b, sweep_b):
+    """First fraction of the tick at which two swept boxes overlap while both exist; None if never."""
+    lo = max(sweep_a[2], sweep_b[2])
+    hi = min(sweep_a[3], sweep_b[3])
+    if lo > hi:
+        return None
+    span = sweep_overlap(box_a, sweep_a, box_b, sweep_b)
+    if span is not None:
+        enter, leave = max(span[0], lo), min(span[1], hi)
+        if enter < leave:
+            return enter
+    # The exact end-of-tick test has the last word (no rounding from the sweep)
+    if hi >= 1.0 and _overlaps(box_a, box_b):
+        return 1.0
+    return None
+
+
+class CollisionWorld:
+    """
+    Per-tick box list. Call `clear()`, `add(...)` every box, then read `hit_pairs()` /
+    `push_pairs()`. `boxes`, `tags` ((owner, kind, team)) and `sweeps` ((dx, dy,
+    window start, window end)) are parallel lists indexed by the value `add` returned;
+    `owner(index)` is the common lookup.
+    """
+
+    def __init__(self, sweep_min_boxes=SWEEP_MIN_BOXES):
+        self.sweep_min_boxes = sweep_min_boxes
+        self.boxes = []
+        self.tags = []
+        self.sweeps = []
+        self.swept = False
+        # Box pairs looked at by the last pairing (benchmarks / debug overlay)
+        self.candidates = 0
+
+    def clear(self):
+        self.boxes.clear()
+        self.tags.clear()
+        self.sweeps.clear()
+        self.swept = False
+
+    def __len__(self):
+        return len(self.boxes)
+
+    def add(self, owner, kind, box, team=None, motion=None, window=(0.0, 1.0)):
+        """
+        Add one box; returns its index. `team=None` only excludes the owner itself.
+
+        `motion` is the (dx, dy) the box moved this tick, ending at `box`; `window` is the
+        (start, end) fraction of the tick the box existed for (a hitbox that only turned
+        active at the tick's end is `(1.0, 1.0)`).
+        """
+        self.tags.append((owner, kind, team))
+        self.boxes.append(box)
+        if motion is None and window == (0.0, 1.0):
+            self.sweeps.append(STATIC)
+        else:
+            dx, dy = motion if motion is not None else (0.0, 0.0)
+            self.sweeps.append((dx, dy, window[0], window[1]))
+            self.swept = True
+        return len(self.boxes) - 1
+
+    def owner(self, index):
+        return self.tags[index][0]
+
+    def update(self, index, box):
+        """Replace a box in place (its owner moved or changed animation mid-tick)."""
+        self.boxes[index] = box
+
+    def start_box(self, index):
+        """Where a box was at the start of the tick."""
+        x, y, w, h = self.boxes[index]
+        dx, dy = self.sweeps[index][:2]
+        return (x - dx, y - dy, w, h)
+
+    def _swept_bounds(self):
+        """(left, right) x extent of each box over the whole tick."""
+        bounds = []
+        for (x, _, w, _), (dx, _, _, _) in zip(self.boxes, self.sweeps):
+            x0 = x - dx
+            bounds.append((x0, x + w) if x0 <= x else (x, x0 + w))
+        return bounds
+
+    def contacts(self):
+        """
+        Sorted (time of impact, i, j) triples, i < j, for every interacting pair that
+        overlaps during the tick (only at its end for boxes without motion).
+
+        From `sweep_min_boxes` boxes up, boxes are visited in order of left edge (of the
+        swept extent) and each is tested only against the still-open boxes whose right
+        edge lies past it; smaller worlds test every pair. Both give the same contacts.
+        """
+        boxes, tags, sweeps = self.boxes, self.tags, self.sweeps
+        swept = self.swept
+        n = len(boxes)
+        found = []
+        if n < self.sweep_min_boxes:
+            for i in range(n - 1):
+                tag, box = tags[i], boxes[i]
+                for j in range(i + 1, n):
+                    if not swept:
+                        if _collides(tag, box, tags[j], boxes[j]):
+                            found.append((1.0, i, j))
+                    elif _interacts(tag, tags[j]):
+                        t = _impact_time(box, sweeps[i], boxes[j], sweeps[j])
+                        if t is not None:
+                            found.append((t, i, j))
+            self.candidates = n * (n - 1) // 2
+            found.sort()
+            return found
+        bounds = self._swept_bounds() if swept else [(x, x + w) for x, _, w, _ in boxes]
+        order = sorted(range(n), key=bounds.__getitem__)
+        active = []
+        candidates = 0
+        for i in order:
+            left = bounds[i][0]
+            active = [j for j in active if bounds[j][1] > left]
+            candidates += len(active)
+            tag, box = tags[i], boxes[i]
+            for j in active:
+                if not swept:
+                    if _collides(tag, box, tags[j], boxes[j]):
+                        found.append((1.0, i, j) if i < j else (1.0, j, i))
+                elif _interacts(tag, tags[j]):
+                    t = _impact_time(box, sweeps[i], boxes[j], sweeps[j])
+                    if t is not None:
+                        found.append((t, i, j) if i < j else (t, j, i))
+            active.append(i)
+        self.candidates = candidates
+        found.sort()
+        return found
+
+    def hit_pairs(self):
+        """(time, hitbox index, hurtbox index) triples, earliest first, then by insertion."""
+        tags = self.tags
+        pairs = []
+        for t, i, j in self.contacts():
+            kind = tags[i][1]
+            if kind == PUSHBOX:
+                continue
+            pairs.append((t, i, j) if kind == HITBOX else (t, j, i))
+        pairs.sort()
+        return pairs
+
+    def push_pairs(self):
+        """(time, i, j) pushbox triples, i < j, earliest first, then by insertion."""
+        tags = self.tags
+        return [c for c in self.contacts() if tags[c[1]][1] == PUSHBOX]
@@ -0,0 +1,175 @@
+"""
+AI-vs-AI match farm: fan headless matches out over a process pool and stream
+per-match results to CSV (or collect them into an NPZ) for balance regression runs.
+
+Usage:
+    python -m game_fighter.farm --matches 10000 --out results.csv
+    python -m game_fighter.farm --matches 2000 --characters ryu,ken --stage-widths 1280,1920 --out results.npz
+    python -m game_fighter.farm --matches 500 --first-to 2 --workers 4
+"""
+
+import argparse
+import csv
+import itertools
+import multiprocessing
+import os
+import sys
+import time
+
+from game_fighter.match import ROUND_SECONDS, Match
+from game_fighter.roster import CHARACTERS
+
+RESULT_FIELDS = (
+    "match", "seed", "p1", "p2", "stage_width", "winner", "rounds", "ticks", "seconds",
+    "p1_damage", "p2_damage", "p1_hits", "p2_hits", "timeouts",
+)
+
+
+def match_jobs(count, base_seed, characters, stage_widths, hz, first_to):
+    """Deterministic job list: match i cycles through every character pairing, then stage width."""
+    pairs = list(itertools.product(characters, repeat=2))
+    for i in range(count):
+        p1, p2 = pairs[i % len(pairs)]
+        width = stage_widths[(i // len(pairs)) % len(stage_widths)]
+        yield (i, base_seed + i, p1, p2, width, hz, first_to)
+
+
+def run_match(job):
+    """
+    Play one AI-vs-AI match (first to `first_to` round wins) and return a result row.
+
+    A round ends on a KO or when the round clock runs out; time-outs go to the
+    fighter with more HP (equal HP is a drawn round). Drawn rounds still count toward
+    a cap of `2 * first_to + 1` rounds so a match always ends.
+    """
+    index, seed, p1, p2, width, hz, first_to = job
+    match = Match.headless(p1, p2, stage_width=width, p1_ai=True, p2_ai=True, seed=seed)
+    dt = 1.0 / hz
+    round_ticks = int(ROUND_SECONDS * hz) + 1
+    damage = [0, 0]
+    hits = [0, 0]
+    ticks = 0
+    rounds = 0
+    timeouts = 0
+    while max(match.p1_wins, match.p2_wins) < first_to and rounds < 2 * first_to + 1:
+        rounds += 1
+        ko = False
+        for _ in range(round_ticks):
+            match.step(dt)
+            ticks += 1
+            for event in match.events:
+                if event[0] == "hit":
+                    side = 0 if event[1] is match.p1 else 1
+                    hits[side] += 1
+                    damage[side] += event[3]
+                elif event[0] == "ko":
+                    ko = True
+            if ko or match.round_timer <= 0:
+                break
+        if not ko:
+            timeouts += 1
+            if match.p1.hp > match.p2.hp:
+                match.p1_wins += 1
+            elif match.p2.hp > match.p1.hp:
+                match.p2_wins += 1
+        if max(match.p1_wins, match.p2_wins) < first_to:
+            match.reset_round()
+    if match.p1_wins > match.p2_wins:
+        winner = "P1"
+    elif match.p2_wins > match.p1_wins:
+        winner = "P2"
+    else:
+        winner = "draw"
+    return (index, seed, p1, p2, width, winner, rounds, ticks, round(ticks * dt, 4),
+            damage[0], damage[1], hits[0], hits[1], timeouts)
+
+
+class CsvSink:
+    """Write each result row as soon as it arrives (a crash keeps everything finished so far)."""
+
+    def __init__(self, path):
+        self._f = open(path, "w", newline="")
+        self._writer = csv.writer(self._f)
+        self._writer.writerow(RESULT_FIELDS)
+
+    def add(self, row):
+        self._writer.writerow(row)
+
+    def close(self):
+        self._f.close()
+
+
+class NpzSink:
+    """Collect rows and save one column array per field on close."""
+
+    def __init__(self, path):
+        self.path = path
+        self.rows = []
+
+    def add(self, row):
+        self.rows.append(row)
+
+    def close(self):
+        import numpy as np
+
+        self.rows.sort()
+        columns = list(zip(*self.rows)) if self.rows else [()] * len(RESULT_FIELDS)
+        np.savez(self.path, **{name: np.array(col) for name, col in zip(RESULT_FIELDS, columns)})
+
+
+def open_sink(path):
+    return NpzSink(path) if path.endswith(".npz") else CsvSink(path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m game_fighter.farm", description="Run AI-vs-AI matches over a process pool and record results.")
+    parser.add_argument("--matches", type=int, default=1000, help="Number of matches to play.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Worker processes (1 = run in this process).")
+    parser.add_argument("--seed", type=int, default=0, help="Base seed; match i uses seed + i.")
+    parser.add_argument("--characters", default=",".join(CHARACTERS), help="Comma-separated roster keys; every pairing is played.")
+    parser.add_argument("--stage-widths", default="1280", help="Comma-separated stage widths to cycle through (stages differ to the simulation only by width).")
+    parser.add_argument("--first-to", type=int, default=1, help="Round wins needed to take a match.")
+    parser.add_argument("--hz", type=float, default=60.0, help="Simulation tick rate.")
+    parser.add_argument("--chunksize", type=int, default=0, help="Matches per task sent to a worker (0 = automatic).")
+    parser.add_argument("--out", default="farm_results.csv", help="Output file (.csv streams rows, .npz saves columns at the end).")
+    args = parser.parse_args(argv)
+
+    characters = [c.strip() for c in args.characters.split(",") if c.strip()]
+    unknown = [c for c in characters if c not in CHARACTERS]
+    if unknown:
+        parser.error(f"unknown characters: {', '.join(unknown)} (roster: {', '.join(CHARACTERS)})")
+    widths = [int(w) for w in args.stage_widths.split(",") if w.strip()]
+    jobs = match_jobs(args.matches, args.seed, characters, widths, args.hz, args.first_to)
+    workers = max(1, args.workers)
+    # Big chunks keep IPC negligible; several per worker keep the tail short
+    chunksize = args.chunksize or max(1, args.matches // (workers * 16))
+
+    sink = open_sink(args.out)
+    totals = {"P1": 0, "P2": 0, "draw": 0}
+    total_ticks = 0
+    done = 0
+    start = time.perf_counter()
+    pool = multiprocessing.Pool(workers) if workers > 1 else None
+    try:
+        results = pool.imap_unordered(run_match, jobs, chunksize) if pool else map(run_match, jobs)
+        for row in results:
+            sink.add(row)
+            totals[row[5]] += 1
+            total_ticks += row[7]
+            done += 1
+            if done % 1000 == 0:
+                elapsed = time.perf_counter() - start
+                print(f"{done}/{args.matches} matches, {done / elapsed:,.1f} matches/s", file=sys.stderr)
+    finally:
+        if pool:
+            pool.close()
+            pool.join()
+        sink.close()
+    elapsed = max(1e-9, time.perf_counter() - start)
+    print(f"{done} matches on {workers} worker(s) in {elapsed:.2f}s: {done / elapsed:,.1f} matches/s, "
+          f"{total_ticks / elapsed:,.0f} ticks/s ({done / elapsed / workers:,.1f} matches/s per worker)")
+    print(f"P1 wins {totals['P1']}, P2 wins {totals['P2']}, draws {totals['draw']} -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,10 @@
 import json
 import os
 import random
+from enum import IntEnum
 
 from game_fighter.constants import PHYSICS_SCALE, SCALE_FACTOR, SPRITE_SCALE, SPRITE_SIZE, STAGE_MARGIN
+from game_fighter.frame_boxes import EMPTY_ENTRY, compile_frame_boxes
 from game_fighter.sprite_anim import SpriteAnim
 
 BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
@@ -27,8 +29,39 @@ def _load_frame_cache():
     return FRAME_CACHE
 
 
+class AttackPhase(IntEnum):
+    """Attack timeline stage; the values match `batch_match.PHASE_*`."""
+
+    STARTUP = 1
+    ACTIVE = 2
+    RECOVERY = 3
+
+
+# Bound once: attribute lookups on the enum class are slow on the per-tick path
+STARTUP, ACTIVE, RECOVERY = AttackPhase
+_PHASE_BY_ID = {int(p): p for p in AttackPhase}
+
+
+class AttackRecord:
+    """One fighter's current attack. Each fighter owns one and reuses it for every attack."""
+
+    __slots__ = ("phase", "t", "has_hit")
+
+    def __init__(self):
+        self.phase = STARTUP
+        self.t = 0.0
+        self.has_hit = False
+
+
 class Fighter:
-    def __init__(self, x, y, sprite_paths, floor_y, stage_width, move_speed=None, jump_speed=None):
+    __slots__ = (
+        "x", "y", "render_scale", "vx", "vy", "move_speed", "jump_speed", "floor_y", "stage_width", "facing",
+        "hp", "max_hp", "rng", "sprite", "frame_boxes", "attack", "_attack_record", "attack_cfg",
+        "hitstun", "knockback_vx", "was_hit", "defeated", "victorious", "defeat_floor",
+        "defeat_gravity_multiplier", "defeat_impact_count", "defeat_landing_event", "defeat_knock_dir",
+    )
+
+    def __init__(self, x, y, sprite_paths, floor_y, stage_width, move_speed=None, jump_speed=None, texture_loader=None, rng=None):
         # Position
         self.x = x
         self.y = y
@@ -49,18 +82,19 @@ class Fighter:
         self.hp = 100
         self.max_hp = 100
 
-        # Sprites
-        self.sprite = SpriteAnim()
+        # Gameplay RNG (victory pose pick); pass the match's seeded stream for reproducible runs
+        self.rng = rng if rng is not None else random
+
+        # Sprites (texture_loader=None keeps the fighter fully headless)
+        self.sprite = SpriteAnim(texture_loader=texture_loader)
         self._load_sprites(sprite_paths)
 
-        # Attack logic
+        # Attack logic: `attack` is None or the fighter's reused `AttackRecord`
         self.attack = None
+        self._attack_record = AttackRecord()
         # Slightly longer hitbox width for punch reach
         self.attack_cfg = dict(startup=0.08, active=0.30, recovery=0.22, w=1, h=48, dmg=10)
 
-        # Drawable assigned externally
-        self.rect = None
-
         # Hitstun / Knockback
         self.hitstun = 0.0
         self.knockback_vx = 0.0
@@ -95,7 +129,7 @@ class Fighter:
         add_anim("defeat", "defeat", fps=4, frame_count=5, frame_xs=[0, 50, 127, 205, 282], frame_ws=[50, 78, 80, 77, 76])
 
         # Choose victory 1 or victory 2 (50/50 chance)
-        victory_file = random.choice(paths["victory"])
+        victory_file = self.rng.choice(paths["victory"])
         base_vic = os.path.basename(victory_file)
         frame_info = frames.get(base_vic)
         if frame_info and frame_info.get("frames"):
@@ -103,11 +137,15 @@ class Fighter:
         else:
             self.sprite.add_sheet_by_count("victory", victory_file, frame_count=3, fps=6)
 
+        # Collision boxes for every state/frame/facing, resolved once per sprite load
+        self.frame_boxes = compile_frame_boxes(self.sprite.sheets)
         self.sprite.play("idle")
 
-    def reload_sprites(self, sprite_paths):
+    def reload_sprites(self, sprite_paths, rng=None):
         """Swap the sprite sheets used by this fighter without recreating the object."""
-        self.sprite = SpriteAnim()
+        if rng is not None:
+            self.rng = rng
+        self.sprite = SpriteAnim(texture_loader=self.sprite.texture_loader)
         self._load_sprites(sprite_paths)
 
     def on_hit(self):
@@ -137,6 +175,40 @@ class Fighter:
         self.vx = 0
         self.sprite.play("victory", loop=True, restart=True)
 
+    # ---------------------------
+    # SAVE STATES
+    # ---------------------------
+    def snapshot(self):
+        """
+        Capture everything `update` and the hit pipeline mutate as one flat tuple of
+        plain values (attack phase id 0 = no attack), ending with `sprite.snapshot()`.
+        """
+        a = self.attack
+        return (
+            self.x, self.y, self.vx, self.vy, self.facing, self.hp,
+            int(a.phase) if a else 0, a.t if a else 0.0, a.has_hit if a else False,
+            self.hitstun, self.knockback_vx, self.was_hit, self.defeated, self.victorious,
+            self.defeat_floor, self.defeat_impact_count, self.defeat_landing_event, self.defeat_knock_dir,
+            self.sprite.snapshot(),
+        )
+
+    def restore(self, snap):
+        """Load a `snapshot()` back into this fighter."""
+        a = self._attack_record
+        (
+            self.x, self.y, self.vx, self.vy, self.facing, self.hp,
+            phase, a.t, a.has_hit,
+            self.hitstun, self.knockback_vx, self.was_hit, self.defeated, self.victorious,
+            self.defeat_floor, self.defeat_impact_count, self.defeat_landing_event, self.defeat_knock_dir,
+            sprite_snap,
+        ) = snap
+        if phase:
+            a.phase = _PHASE_BY_ID[phase]
+            self.attack = a
+        else:
+            self.attack = None
+        self.sprite.restore(sprite_snap)
+
     # ---------------------------
     # COLLISION HELPERS
     # ---------------------------
@@ -144,43 +216,12 @@ class Fighter:
         fw, fh = self.sprite.current_frame_size()
         return fw * self.render_scale, fh * self.render_scale
 
-    def _frame_box_from_meta(self, key):
-        meta = self.sprite.current_frame_meta()
-        if not meta or key not in meta:
-            return None
-        raw = meta[key]
-        if isinstance(raw, dict):
-            bx = raw.get("x", 0)
-            by = raw.get("y", 0)
-            bw = raw.get("w", 0)
-            bh = raw.get("h", 0)
-        elif isinstance(raw, (list, tuple)) and len(raw) == 4:
-            bx, by, bw, bh = raw
-        else:
-            return None
-        # Normalize if values are 0..1
-        fw_px, fh_px = self.sprite.current_frame_size()
-        if max(abs(bx), abs(by), bw, bh) <= 1.0:
-            bx *= fw_px
-            bw *= fw_px
-            by *= fh_px
-            bh *= fh_px
-        return (bx, by, bw, bh)
-
-    def _mirror_box(self, box, frame_w_px):
-        if self.facing == 1:
-            return box
-        bx, by, bw, bh = box
-        return (frame_w_px - (bx + bw), by, bw, bh)
-
-    def _box_to_world(self, box):
-        bx, by, bw, bh = box
-        return (
-            self.x + bx * self.render_scale,
-            self.y + by * self.render_scale,
-            bw * self.render_scale,
-            bh * self.render_scale,
-        )
+    def _frame_entry(self):
+        """(hurtbox, hitbox) source-pixel offsets for the current state, frame and facing."""
+        table = self.frame_boxes.get(self.sprite.state)
+        if table is None:
+            return EMPTY_ENTRY
+        return table[self.sprite.current_frame_index() * 2 + (self.facing != 1)]
 
     # ---------------------------
     # MOVEMENT / PHYSICS
@@ -216,79 +257,46 @@ class Fighter:
     # ---------------------------
     def start_attack(self):
         if self.attack is None and not self.defeated:
-            self.attack = dict(phase="startup", t=0, has_hit=False)
+            a = self._attack_record
+            a.phase = STARTUP
+            a.t = 0
+            a.has_hit = False
+            self.attack = a
             self.sprite.play("attack", loop=False, restart=True)
 
     def attack_hitbox(self):
         if not self.attack:
             return None
-
-        fw_px, fh_px = self.sprite.current_frame_size()
-        meta_box = self._frame_box_from_meta("hitbox")
-        if meta_box:
-            box_px = self._mirror_box(meta_box, fw_px)
-            return self._box_to_world(box_px)
-
-        # Heuristic fallback: tie hitbox to current frame size near front arm/leg
-        fw, fh = self._frame_size_world()
-        state = self.sprite.state or ""
-        frame_idx = self.sprite.current_frame_index()
-        # Attack frames: extend further as the animation progresses
-        if state == "attack":
-            phase = 0.0
-            total_frames = max(1, len(self.sprite.sheets.get("attack", {}).get("rects", [])))
-            if total_frames > 1:
-                phase = min(1.0, frame_idx / float(total_frames - 1))
-            hit_w = fw * (0.32 + 0.18 * phase)
-            hit_h = fh * 0.34
-            # push forward as phase advances
-            forward = 0.18 + 0.18 * phase
-        else:
-            hit_w = fw * 0.32
-            hit_h = fh * 0.30
-            forward = 0.12
-
-        center_x = self.x + fw * 0.5 + (fw * forward if self.facing == 1 else -fw * forward)
-        px = center_x - hit_w * 0.5
-        py = self.y + fh * 0.30
-        return (px, py, hit_w, hit_h)
+        bx, by, bw, bh = self._frame_entry()[1]
+        s = self.render_scale
+        return (self.x + bx * s, self.y + by * s, bw * s, bh * s)
 
     def hurtbox(self):
-        fw_px, fh_px = self.sprite.current_frame_size()
-        meta_box = self._frame_box_from_meta("hurtbox")
-        if meta_box:
-            box_px = self._mirror_box(meta_box, fw_px)
-            return self._box_to_world(box_px)
-
-        # Heuristic fallback centered on the sprite rect (better than fixed constants)
-        fw, fh = self._frame_size_world()
-        hb_w = fw * 0.68
-        hb_h = fh * 0.9
-        px = self.x + (fw - hb_w) / 2
-        py = self.y + fh * 0.02
-        return (px, py, hb_w, hb_h)
+        bx, by, bw, bh = self._frame_entry()[0]
+        s = self.render_scale
+        return (self.x + bx * s, self.y + by * s, bw * s, bh * s)
 
     def update_attack(self, dt):
-        if not self.attack:
+        a = self.attack
+        if not a:
             return
 
-        a = self.attack
         cfg = self.attack_cfg
-        a["t"] += dt
+        a.t += dt
+        phase = a.phase
 
-        if a["phase"] == "startup":
-            if a["t"] >= cfg["startup"]:
-                a["phase"] = "active"
-                a["t"] = 0
+        if phase is STARTUP:
+            if a.t >= cfg["startup"]:
+                a.phase = ACTIVE
+                a.t = 0
 
-        elif a["phase"] == "active":
-            if a["t"] >= cfg["active"]:
-                a["phase"] = "recovery"
-                a["t"] = 0
+        elif phase is ACTIVE:
+            if a.t >= cfg["active"]:
+                a.phase = RECOVERY
+                a.t = 0
 
-        elif a["phase"] == "recovery":
-            if a["t"] >= cfg["recovery"]:
-                self.attack = None
+        elif a.t >= cfg["recovery"]:
+            self.attack = None
 
     # ---------------------------
     # ANIMATION
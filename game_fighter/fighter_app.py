@@ -17,3 +17,9 @@ class FighterApp(App):
         # Use native window/device size so it scales to desktop/mobile automatically
         Window.title = "2D Fighter — Refactored"
         return FighterGame(debug_mode=debug_mode)
+
+    def on_stop(self):
+        # Keep the latency histograms and habit profile of a session closed mid-match
+        self.root.dump_latency()
+        self.root.save_habits()
+        self.root.stop_ai()
@@ -0,0 +1,330 @@
+"""
+Fixed-point physics mode: fighter motion, timers and the round clock in integers.
+
+The default simulation integrates positions in float pixels and runs timers in float
+seconds, so the result depends on how `dt` and every product along the way happen to
+round. In fixed-point mode the physics state is integers:
+- positions in sub-pixels (`SUBPIXEL` per pixel), velocities in sub-pixels per tick;
+- gravity in sub-pixels per tick per tick, knockback friction as integer ratios;
+- hitstun, attack phases, projectile life and the round clock as tick counts.
+Tuning values (px/s, seconds) are converted once per use with `round`, and a tick's
+`dt` is converted to a whole number of ticks, so the same commands give the same
+integers on every platform.
+
+Everything else still reads the fighter in pixels and seconds: `FixedFighter` exposes
+`x`, `y`, `vx`, `vy`, `knockback_vx` and `hitstun` as properties over the integers
+(pixel values are exact multiples of 1 / `SUBPIXEL`), and writes to them are quantized.
+Collision, AI, rendering and the hit pipeline are unchanged. `FixedMatch` builds
+fixed-point fighters and projectiles and counts the round clock in ticks; its
+snapshots carry the integers, so rollback, run-ahead and replays work as before.
+"""
+
+from array import array
+
+from game_fighter.constants import PHYSICS_SCALE, SPRITE_SCALE, SPRITE_SIZE, STAGE_MARGIN
+from game_fighter.fighter import ACTIVE, RECOVERY, STARTUP, Fighter, _PHASE_BY_ID
+from game_fighter.match import Match
+from game_fighter.projectiles import PROJECTILE_CAPACITY, ProjectilePool
+from game_fighter.timestep import DEFAULT_TICK_RATE
+
+SUBPIXEL = 256  # sub-pixel units per pixel
+
+# Per-tick knockback friction as (numerator, denominator): Fighter's `*= 0.85` / `*= 0.9`
+HITSTUN_FRICTION = (17, 20)
+DEFEAT_FRICTION = (9, 10)
+
+
+def to_ticks(dt, tick_rate):
+    """Whole ticks in `dt` seconds at `tick_rate` (at least one)."""
+    return max(1, int(dt * tick_rate + 0.5))
+
+
+def scale_toward_zero(value, num, den):
+    """`value * num / den` in integers, rounded toward zero so friction stops at 0 from both sides."""
+    return value * num // den if value >= 0 else -(-value * num // den)
+
+
+class FixedFighter(Fighter):
+    """`Fighter` with integer physics state (see module docstring); `tick_rate` fixes the unit of time."""
+
+    __slots__ = ("tick_rate", "_x", "_y", "_vx", "_vy", "_knock", "_stun")
+
+    def __init__(self, *args, tick_rate=DEFAULT_TICK_RATE, **kwargs):
+        self.tick_rate = int(round(tick_rate))
+        self._x = self._y = self._vx = self._vy = self._knock = self._stun = 0
+        super().__init__(*args, **kwargs)
+
+    # ---------------------------
+    # PIXEL / SECOND VIEWS
+    # ---------------------------
+    @property
+    def x(self):
+        return self._x / SUBPIXEL
+
+    @x.setter
+    def x(self, value):
+        self._x = round(value * SUBPIXEL)
+
+    @property
+    def y(self):
+        return self._y / SUBPIXEL
+
+    @y.setter
+    def y(self, value):
+        self._y = round(value * SUBPIXEL)
+
+    @property
+    def vx(self):
+        return self._vx * self.tick_rate / SUBPIXEL
+
+    @vx.setter
+    def vx(self, value):
+        self._vx = round(value * SUBPIXEL / self.tick_rate)
+
+    @property
+    def vy(self):
+        return self._vy * self.tick_rate / SUBPIXEL
+
+    @vy.setter
+    def vy(self, value):
+        self._vy = round(value * SUBPIXEL / self.tick_rate)
+
+    @property
+    def knockback_vx(self):
+        return self._knock * self.tick_rate / SUBPIXEL
+
+    @knockback_vx.setter
+    def knockback_vx(self, value):
+        self._knock = round(value * SUBPIXEL / self.tick_rate)
+
+    @property
+    def hitstun(self):
+        return self._stun / self.tick_rate
+
+    @hitstun.setter
+    def hitstun(self, value):
+        self._stun = round(value * self.tick_rate)
+
+    def _gravity_step(self, gravity):
+        """Gravity (px/s/s) in sub-pixels per tick per tick."""
+        return round(gravity * SUBPIXEL / (self.tick_rate * self.tick_rate))
+
+    def _cfg_ticks(self, seconds):
+        return max(1, round(seconds * self.tick_rate))
+
+    # ---------------------------
+    # SAVE STATES
+    # ---------------------------
+    def snapshot(self):
+        """`Fighter.snapshot` layout holding the integers: sub-pixels, sub-pixels per tick and ticks."""
+        a = self.attack
+        return (
+            self._x, self._y, self._vx, self._vy, self.facing, self.hp,
+            int(a.phase) if a else 0, a.t if a else 0, a.has_hit if a else False,
+            self._stun, self._knock, self.was_hit, self.defeated, self.victorious,
+            self.defeat_floor, self.defeat_impact_count, self.defeat_landing_event, self.defeat_knock_dir,
+            self.sprite.snapshot(),
+        )
+
+    def restore(self, snap):
+        a = self._attack_record
+        (
+            self._x, self._y, self._vx, self._vy, self.facing, self.hp,
+            phase, a.t, a.has_hit,
+            self._stun, self._knock, self.was_hit, self.defeated, self.victorious,
+            self.defeat_floor, self.defeat_impact_count, self.defeat_landing_event, self.defeat_knock_dir,
+            sprite_snap,
+        ) = snap
+        if phase:
+            a.phase = _PHASE_BY_ID[phase]
+            self.attack = a
+        else:
+            self.attack = None
+        self.sprite.restore(sprite_snap)
+
+    # ---------------------------
+    # MOVEMENT / PHYSICS
+    # ---------------------------
+    def update_position(self, dt):
+        self._x += self._vx * to_ticks(dt, self.tick_rate)
+
+    def apply_gravity(self, gravity, dt):
+        n = to_ticks(dt, self.tick_rate)
+        self._vy += self._gravity_step(gravity) * n
+        self._y += self._vy * n
+
+        floor = round(self.floor_y * SUBPIXEL)
+        if self._y < floor:
+            self._y = floor
+            self._vy = 0
+
+    def update_attack(self, dt):
+        a = self.attack
+        if not a:
+            return
+
+        cfg = self.attack_cfg
+        a.t += to_ticks(dt, self.tick_rate)
+        phase = a.phase
+
+        if phase is STARTUP:
+            if a.t >= self._cfg_ticks(cfg["startup"]):
+                a.phase = ACTIVE
+                a.t = 0
+
+        elif phase is ACTIVE:
+            if a.t >= self._cfg_ticks(cfg["active"]):
+                a.phase = RECOVERY
+                a.t = 0
+
+        elif a.t >= self._cfg_ticks(cfg["recovery"]):
+            self.attack = None
+
+    # ---------------------------
+    # MAIN UPDATE
+    # ---------------------------
+    def update(self, dt, gravity):
+        """`Fighter.update` branch for branch, in integer units."""
+        n = to_ticks(dt, self.tick_rate)
+        self.defeat_landing_event = None
+        if self.victorious:
+            self._vx = 0
+            self.pick_anim()
+            self.sprite.update(dt)
+            return
+
+        if self.defeated:
+            prev_y = self._y
+            floor = round(self.defeat_floor * SUBPIXEL)
+            self._x += self._knock * n
+            self._knock = scale_toward_zero(self._knock, *DEFEAT_FRICTION)
+            self._vy += self._gravity_step(gravity * self.defeat_gravity_multiplier) * n
+            self._y += self._vy * n
+            landed = False
+            if self._y < floor:
+                self._y = floor
+                landed = prev_y > floor
+                self._vy = 0
+            if landed and self.defeat_impact_count < 2:
+                self.defeat_impact_count += 1
+                if self.defeat_impact_count == 1:
+                    self.defeat_landing_event = "first"
+                    self.sprite.frame = 2  # show frame 3 on first slam
+                    self.vy = self.jump_speed * 0.42  # small bounce to set up second hit
+                elif self.defeat_impact_count == 2:
+                    self.defeat_landing_event = "second"
+                    self.sprite.frame = 4  # show frame 5 on final impact
+                    self.knockback_vx = self.defeat_knock_dir * (900 * PHYSICS_SCALE)
+                    self._vy = 0
+            self._clamp_x()
+            self.pick_anim()
+            self.sprite.update(dt)
+            return
+
+        if self._stun > 0:
+            self._stun -= n
+            self._x += self._knock * n
+            self._clamp_x()
+            self._knock = scale_toward_zero(self._knock, *HITSTUN_FRICTION)
+            self.apply_gravity(gravity, dt)
+            self._clamp_x()
+            if self._stun <= 0:
+                self._knock = 0
+            self.pick_anim()
+            self.sprite.update(dt)
+            return
+
+        self.update_position(dt)
+        self.apply_gravity(gravity, dt)
+        self._clamp_x()
+        self.update_attack(dt)
+        self.pick_anim()
+        self.sprite.update(dt)
+
+    def _clamp_x(self):
+        eff_size = SPRITE_SIZE * (self.render_scale / float(SPRITE_SCALE))
+        max_x = round((self.stage_width - eff_size - STAGE_MARGIN) * SUBPIXEL)
+        self._x = max(STAGE_MARGIN * SUBPIXEL, min(max_x, self._x))
+
+
+class FixedProjectilePool(ProjectilePool):
+    """
+    `ProjectilePool` moved in whole sub-pixel steps: `step` holds each projectile's
+    sub-pixels per tick, `x`/`y` stay exact multiples of 1 / `SUBPIXEL` and `life` counts
+    ticks. `spawn` takes px/s and seconds like the float pool.
+    """
+
+    def __init__(self, capacity=PROJECTILE_CAPACITY, tick_rate=DEFAULT_TICK_RATE):
+        super().__init__(capacity)
+        self.tick_rate = tick_rate
+        self.step = array("q", [0] * capacity)
+
+    def spawn(self, owner, x, y, vx, w, h, life, dmg):
+        step = round(vx * SUBPIXEL / self.tick_rate)
+        i = super().spawn(owner, round(x * SUBPIXEL) / SUBPIXEL, round(y * SUBPIXEL) / SUBPIXEL,
+                          step * self.tick_rate / SUBPIXEL, w, h, max(1, round(life * self.tick_rate)), dmg)
+        if i >= 0:
+            self.step[i] = step
+        return i
+
+    def despawn(self, i):
+        self.step[i] = self.step[self.count - 1]
+        super().despawn(i)
+
+    def update(self, dt, left, right):
+        n = to_ticks(dt, self.tick_rate)
+        self.last_dt = dt
+        x, step, w, life = self.x, self.step, self.w, self.life
+        for i in range(self.count - 1, -1, -1):
+            nx = (round(x[i] * SUBPIXEL) + step[i] * n) / SUBPIXEL
+            x[i] = nx
+            life[i] -= n
+            if life[i] <= 0.0 or nx + w[i] <= left or nx >= right:
+                self.despawn(i)
+
+    def restore(self, snap):
+        # Snapshot values are already quantized (life in ticks): bypass `spawn`'s conversion
+        self.count = 0
+        for owner, x, y, vx, w, h, life, dmg in snap:
+            i = ProjectilePool.spawn(self, owner, x, y, vx, w, h, life, dmg)
+            self.step[i] = round(vx * SUBPIXEL / self.tick_rate)
+
+
+class FixedMatch(Match):
+    """
+    `Match` on fixed-point fighters and projectiles, with the round clock counted in
+    ticks. `p1`/`p2` must be `FixedFighter`s; `tick_rate` is set on them and the pool.
+    """
+
+    fighter_class = FixedFighter
+
+    def __init__(self, *args, tick_rate=DEFAULT_TICK_RATE, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.projectiles = FixedProjectilePool()
+        self._timer_accum = 0
+        self.set_tick_rate(tick_rate)
+
+    @classmethod
+    def headless(cls, *args, tick_rate=DEFAULT_TICK_RATE, **kwargs):
+        """`Match.headless` with fixed-point fighters at `tick_rate`."""
+        match = super().headless(*args, **kwargs)
+        match.set_tick_rate(tick_rate)
+        return match
+
+    def set_tick_rate(self, tick_rate):
+        self.tick_rate = int(round(tick_rate))
+        for fighter in self.fighters:
+            fighter.tick_rate = self.tick_rate
+        self.projectiles.tick_rate = self.tick_rate
+
+    def reset_round(self):
+        super().reset_round()
+        self._timer_accum = 0
+
+    def tick_clock(self, dt):
+        """Round timer in ticks: `_timer_accum` counts ticks into the current second."""
+        self._timer_accum += to_ticks(dt, self.tick_rate)
+        if self._timer_accum >= self.tick_rate and self.round_timer > 0:
+            seconds = self._timer_accum // self.tick_rate
+            self._timer_accum -= seconds * self.tick_rate
+            self.round_timer = max(0, self.round_timer - seconds)
@@ -0,0 +1,88 @@
+"""
+Precompiled per-frame collision tables.
+
+`compile_frame_boxes(sheets)` turns a `SpriteAnim`'s sheets into one flat table per
+animation state: entry `frame * 2 + face` (face 0 = facing right, 1 = facing left)
+holds `(hurtbox, hitbox)`, each an `(x, y, w, h)` offset from the fighter origin in
+source pixels. Frame metadata boxes (pixels or 0..1 fractions of the frame) are
+normalized and mirrored here once; frames without metadata get the heuristic boxes
+from the frame size. At runtime a box is a table lookup plus
+`origin + offset * render_scale` (see `Fighter.hurtbox`).
+"""
+
+EMPTY_BOX = (0.0, 0.0, 0.0, 0.0)
+EMPTY_ENTRY = (EMPTY_BOX, EMPTY_BOX)
+
+
+def _meta_box(meta, key, fw, fh):
+    """Read a metadata box (dict or 4-list) in pixels, normalizing 0..1 fractions; None if absent."""
+    raw = meta.get(key) if meta else None
+    if isinstance(raw, dict):
+        bx, by, bw, bh = raw.get("x", 0), raw.get("y", 0), raw.get("w", 0), raw.get("h", 0)
+    elif isinstance(raw, (list, tuple)) and len(raw) == 4:
+        bx, by, bw, bh = raw
+    else:
+        return None
+    if max(abs(bx), abs(by), bw, bh) <= 1.0:
+        bx *= fw
+        bw *= fw
+        by *= fh
+        bh *= fh
+    return (bx, by, bw, bh)
+
+
+def _mirror(box, fw):
+    bx, by, bw, bh = box
+    return (fw - (bx + bw), by, bw, bh)
+
+
+def _heuristic_hurtbox(fw, fh):
+    # Centered on the sprite rect, body sized
+    hb_w = fw * 0.68
+    return ((fw - hb_w) / 2, fh * 0.02, hb_w, fh * 0.9)
+
+
+def _heuristic_hitbox(fw, fh, facing, attack_progress):
+    # Tied to the frame size near the front arm/leg; during the attack animation it
+    # extends further forward as the animation progresses
+    if attack_progress is not None:
+        hit_w = fw * (0.32 + 0.18 * attack_progress)
+        hit_h = fh * 0.34
+        forward = 0.18 + 0.18 * attack_progress
+    else:
+        hit_w = fw * 0.32
+        hit_h = fh * 0.30
+        forward = 0.12
+    center_x = fw * 0.5 + (fw * forward if facing == 1 else -fw * forward)
+    return (center_x - hit_w * 0.5, fh * 0.30, hit_w, hit_h)
+
+
+def compile_sheet(state, sheet, attack_frames):
+    """Flat (hurtbox, hitbox) table for one sheet; always at least one frame long."""
+    rects = sheet.get("rects") or [(0, 0, 0, 0)]
+    metas = sheet.get("meta") or ()
+    table = []
+    for i, (_, _, fw, fh) in enumerate(rects):
+        meta = metas[i] if i < len(metas) else None
+        progress = None
+        if state == "attack":
+            progress = min(1.0, i / float(attack_frames - 1)) if attack_frames > 1 else 0.0
+        hurt = _meta_box(meta, "hurtbox", fw, fh)
+        hit = _meta_box(meta, "hitbox", fw, fh)
+        for facing in (1, -1):
+            if hurt is None:
+                hurt_box = _heuristic_hurtbox(fw, fh)
+            else:
+                hurt_box = hurt if facing == 1 else _mirror(hurt, fw)
+            if hit is None:
+                hit_box = _heuristic_hitbox(fw, fh, facing, progress)
+            else:
+                hit_box = hit if facing == 1 else _mirror(hit, fw)
+            table.append((hurt_box, hit_box))
+    return tuple(table)
+
+
+def compile_frame_boxes(sheets):
+    """{state: flat (hurtbox, hitbox) table} for every sheet of a `SpriteAnim`."""
+    attack_frames = max(1, len(sheets.get("attack", {}).get("rects", [])))
+    return {state: compile_sheet(state, sheet, attack_frames) for state, sheet in sheets.items()}
@@ -1,6 +1,7 @@
 import os
 import random
 import math
+import time
 
 from kivy.app import App
 from kivy.clock import Clock
@@ -12,71 +13,73 @@ from kivy.graphics import Color, Rectangle, InstructionGroup, Ellipse, PushMatri
 from kivy.graphics.texture import Texture
 from kivy.uix.widget import Widget
 
-from game_fighter.constants import SPRITE_SIZE, HURTBOX_W, HURTBOX_H, SCALE_FACTOR, SPRITE_SCALE, PHYSICS_SCALE, STAGE_MARGIN
+from game_fighter.ai import AIController
+from game_fighter.ai_scheduler import AI_HZ, ScheduledController
+from game_fighter.bindings import Bindings
+from game_fighter.constants import SPRITE_SCALE
 from game_fighter.fighter import Fighter
-from game_fighter.input_manager import InputManager
-
-BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
-ASSETS_DIR = os.path.join(BASE_DIR, "assets")
-
-SPECIAL_KEYS = {32: "space", 273: "up", 274: "down", 275: "right", 276: "left"}
-
-
-def keyname_from_event(keycode: int, codepoint: str) -> str:
-    if codepoint and codepoint.strip():
-        return codepoint.lower()
-    if keycode in SPECIAL_KEYS:
-        return SPECIAL_KEYS[keycode]
-    if 32 <= keycode < 127:
-        return chr(keycode).lower()
-    return str(keycode)
-
-
-def keyname_from_keyup(keycode: int) -> str:
-    if 32 <= keycode < 127:
-        return chr(keycode).lower()
-    return SPECIAL_KEYS.get(keycode, str(keycode))
-
-
-def load_ryu_assets():
-    folder = os.path.join(ASSETS_DIR, "ryu_sprites_project")
-    return {
-        "idle": os.path.join(folder, "Idle.png"),
-        "run": os.path.join(folder, "Walk.png"),
-        "jump": os.path.join(folder, "Jump.png"),
-        "attack": os.path.join(folder, "right_punch.png"),
-        "hit": os.path.join(folder, "Hit.png"),
-        "defeat": os.path.join(folder, "Defeat.png"),
-        "victory": [
-            os.path.join(folder, "victory_1.png"),
-            os.path.join(folder, "victory_2.png"),
-        ],
-    }
-
-
-def load_ken_assets():
-    folder = os.path.join(ASSETS_DIR, "ken_sprites_project")
-    return {
-        "idle": os.path.join(folder, "idle_ken.png"),
-        "run": os.path.join(folder, "Walking_Ken.png"),
-        "jump": os.path.join(folder, "ken_jump.png"),
-        "attack": os.path.join(folder, "ken_right_punch.png"),
-        "hit": os.path.join(folder, "ken_hit.png"),
-        "defeat": os.path.join(folder, "ken_defeat.png"),
-        "victory": [
-            os.path.join(folder, "ken_victory_1.png"),
-            os.path.join(folder, "ken_victory_2.png"),
-        ],
-    }
-
+from game_fighter.fixed_physics import FixedFighter, FixedMatch
+from game_fighter.habit_ai import HabitAIController, load_profile, save_profile
+from game_fighter.hit_grid import HitGrid
+from game_fighter.input_manager import JUMP_PRESSED, PUNCH_PRESSED, PadEvents
+from game_fighter.input_router import KEYBOARD, InputRouter
+from game_fighter.latency import LatencyProbe
+from game_fighter.match import GRAVITY, Match, reference_floor_y, start_positions
+from game_fighter.replay_keyframes import KeyframeRecorder
+from game_fighter.rollback import state_checksum
+from game_fighter.run_ahead import RunAhead
+from game_fighter.search_ai import SearchAIController
+from game_fighter.roster import ASSETS_DIR, load_ken_assets, load_ryu_assets
+from game_fighter.sprite_batch import SpriteBatch
+from game_fighter.sprite_textures import load_sprite_texture
+from game_fighter.timestep import DEFAULT_MAX_STEPS, DEFAULT_TICK_RATE, FixedTimestep
 
 DEBUG_MODE = os.environ.get("FIGHTER_DEBUG", "0") == "1"
+# Fixed-step simulation: ticks per second (0 = legacy variable dt) and per-frame tick cap
+TICK_RATE = float(os.environ.get("FIGHTER_TICK_HZ", DEFAULT_TICK_RATE))
+MAX_STEPS_PER_FRAME = int(os.environ.get("FIGHTER_MAX_STEPS", DEFAULT_MAX_STEPS))
+# Folder that receives a replay of every finished match (unset = don't record)
+REPLAY_DIR = os.environ.get("FIGHTER_REPLAY_DIR") or None
+# File that receives input latency histograms after each match (unset = don't dump)
+LATENCY_LOG = os.environ.get("FIGHTER_LATENCY_LOG") or None
+# Ticks to draw ahead of the simulation to hide input lag (0 = off; costs CPU every frame)
+RUN_AHEAD = int(os.environ.get("FIGHTER_RUN_AHEAD", "0"))
+# CPU opponent: "tree" (decision tree), "search" (lookahead, falls back to the tree over budget),
+# "policy" (learned network; needs NumPy, otherwise the tree plays) or "habits" (learns the player)
+AI_TIER = os.environ.get("FIGHTER_AI", "tree")
+# Folder of per-player habit profiles for FIGHTER_AI=habits (unset = learn from scratch each session)
+HABIT_DIR = os.environ.get("FIGHTER_HABIT_DIR") or None
+HABIT_PLAYER = os.environ.get("FIGHTER_PLAYER", "player")
+# Local versus: P2 is a second human player instead of the CPU (also switchable in Options)
+VERSUS = os.environ.get("FIGHTER_VERSUS", "0") == "1"
+# CPU decisions per simulated second (0 = every tick); FIGHTER_AI_THREAD=1 thinks on a worker thread
+AI_THINK_HZ = float(os.environ.get("FIGHTER_AI_HZ", "0"))
+AI_THREAD = os.environ.get("FIGHTER_AI_THREAD", "0") == "1"
+# Integer sub-pixel physics and tick-count timers (fixed-step mode only; see fixed_physics)
+FIXED_POINT = os.environ.get("FIGHTER_FIXED_POINT", "0") == "1"
+
+# Tints of the untextured world sprites (each tint is one sprite-batch page)
+PROJECTILE_RGBA = (0.45, 0.8, 1.0, 0.9)
+HURTBOX_RGBA = (0.2, 0.4, 1.0, 0.4)
+HITBOX_RGBA = (1.0, 0.2, 0.2, 0.4)
 
 
 class FighterGame(Widget):
     def __init__(self, **kwargs):
         # Debug flag: skip idle screen and start playing immediately when enabled
         self.debug_mode = kwargs.pop("debug_mode", DEBUG_MODE)
+        tick_rate = kwargs.pop("tick_rate", TICK_RATE)
+        max_steps = kwargs.pop("max_steps_per_frame", MAX_STEPS_PER_FRAME)
+        fixed_point = kwargs.pop("fixed_point", FIXED_POINT)
+        self.replay_dir = kwargs.pop("replay_dir", REPLAY_DIR)
+        self.latency_log = kwargs.pop("latency_log", LATENCY_LOG)
+        self.run_ahead_frames = kwargs.pop("run_ahead", RUN_AHEAD)
+        self.ai_tier = kwargs.pop("ai_tier", AI_TIER)
+        self.ai_hz = kwargs.pop("ai_hz", AI_THINK_HZ)
+        self.ai_threaded = kwargs.pop("ai_threaded", AI_THREAD)
+        self.habit_dir = kwargs.pop("habit_dir", HABIT_DIR)
+        self.player_name = kwargs.pop("player_name", HABIT_PLAYER)
+        versus = kwargs.pop("versus", VERSUS)
 
         super().__init__(**kwargs)
 
@@ -88,23 +91,37 @@ class FighterGame(Widget):
         # Default to touch controls so mobile devices start with on-screen buttons
         self.selected_control_mode_index = self.control_modes.index("touch") if "touch" in self.control_modes else 0
         self.main_menu_index = 0
-        # Input
-        self.input = InputManager()
-        self.touch_actions = {}  # touch.id -> set(actions)
-        self._pending_jump = False
-        self._pending_attack = False
+        # Key/button -> action lookups compiled from the saved (remappable) bindings
+        self.bindings = Bindings.load()
+        # Input: one InputManager per player, fed through the device -> player routing table
+        self.router = InputRouter(self.bindings)
+        self.router.set_versus(versus)
+        self.inputs = self.router.inputs
+        self.input = self.inputs[0]
+        # Joystick axis/hat reports, applied once per tick
+        self.pad_events = PadEvents()
+        self.touch_actions = {}  # touch.uid -> set(actions)
+        # One-shot presses (JUMP_PRESSED / PUNCH_PRESSED) queued per player for the next tick
+        self._pending_presses = [0, 0]
         self.touch_group = InstructionGroup()
         self.touch_button_boxes = {}
-        self._main_menu_play_rect = None
-        self._main_menu_control_rect = None
-        self._main_menu_home_rect = None
-        self._win_button_rects = {}
+        # Screen-space hit tests: on-screen controls (rebuilt by `_layout_touch_ui`) and
+        # the buttons of the current menu screen (rebuilt by its renderer)
+        self.touch_hits = HitGrid()
+        self.menu_hits = HitGrid()
         self.win_menu_index = 0
         self.transition_lock = False
         self.show_hitboxes = False  # Toggle debug overlays on/off
 
         # Physics
-        self.gravity = -2200 * PHYSICS_SCALE
+        self.gravity = GRAVITY
+        self.timestep = FixedTimestep(tick_rate, max_steps) if tick_rate and tick_rate > 0 else None
+        # Fixed-point physics counts ticks, so it needs the fixed timestep
+        self.fixed_point = fixed_point and self.timestep is not None
+        self._interp_alpha = 1.0  # render blend between previous and current tick
+        self._prev_positions = None
+        # Cosmetic randomness (shake, sound picks, music); gameplay draws use match.rng
+        self.cosmetic_rng = random.Random()
         self.floor_y = 90
         self.floor_height = 90
         self.floor_texture = None
@@ -114,19 +131,15 @@ class FighterGame(Widget):
         self.font_path = font_candidate if os.path.exists(font_candidate) else None
         self.hp_back_tex = self._load_texture(os.path.join(ASSETS_DIR, "Menu", "healthbar_back.png"))
         self.hp_front_tex = self._load_texture(os.path.join(ASSETS_DIR, "Menu", "healthbar_front.png"))
-        self.round_timer = 60
-        self._timer_accum = 0.0
 
         # Round state
         self.state = "playing" if self.debug_mode else "main_menu"
         self.round = 1
-        self.p1_wins = 0
-        self.p2_wins = 0
         self.max_wins = 2
         # UI / selection
         self.character_options = [
-            {"name": "Ryu", "loader": load_ryu_assets, "portrait": os.path.join(ASSETS_DIR, "ryu_sprites_project", "RyuPortrait.png")},
-            {"name": "Ken", "loader": load_ken_assets, "portrait": os.path.join(ASSETS_DIR, "ken_sprites_project", "ken_portrait.png")},
+            {"name": "Ryu", "key": "ryu", "loader": load_ryu_assets, "portrait": os.path.join(ASSETS_DIR, "ryu_sprites_project", "RyuPortrait.png")},
+            {"name": "Ken", "key": "ken", "loader": load_ken_assets, "portrait": os.path.join(ASSETS_DIR, "ken_sprites_project", "ken_portrait.png")},
         ]
         self.base_width = 1920
         self.base_height = 1080
@@ -135,6 +148,7 @@ class FighterGame(Widget):
             {"name": "Military", "key": "military"},
         ]
         self.selected_character_index = 0
+        self.selected_p2_index = 1  # P2's cursor in versus
         self.selected_stage_index = 0
         self.current_stage_key = self.stage_options[self.selected_stage_index]["key"]
         self.p1_name = "P1"
@@ -216,7 +230,6 @@ class FighterGame(Widget):
         self.continue_timer = 0.0
         self.match_result = None  # "win", "lose", or None
         self.options_index = 0
-        self._options_hitboxes = {}
 
         # Camera transform (applied to world)
         self.camera_scale = 1.4  # restore previous zoom for 16:9
@@ -230,9 +243,13 @@ class FighterGame(Widget):
         self.shake_duration = 0.0
         self.shake_strength = 0.0
         self.shake_offset = (0.0, 0.0)
-        # Debug overlays (world-space)
-        self.hitbox_debug = InstructionGroup()
-        self.hurtbox_debug = InstructionGroup()
+        # World sprites (fighters, projectiles, debug boxes): one Mesh per texture/tint page
+        self.sprite_batch = SpriteBatch()
+        # Input latency probe (debug overlay / latency log only) and the debug overlay text
+        self.latency = LatencyProbe() if (self.debug_mode or self.latency_log) else None
+        self.debug_group = InstructionGroup()
+        self.latency_rect = None
+        self._latency_refresh = 0.0
 
         # Scene
         self._build_scene()
@@ -244,13 +261,14 @@ class FighterGame(Widget):
         Window.bind(on_joy_hat=self._on_joy_hat)
         Window.bind(on_joy_button_down=self._on_joy_button_down)
         Window.bind(on_joy_button_up=self._on_joy_button_up)
+        Window.bind(focus=self._on_window_focus)
+        Window.bind(on_minimize=self._release_pads)
 
-        Clock.schedule_interval(self.update, 1 / 60)
+        # Fixed-step mode runs every display frame and lets the accumulator decide tick count
+        Clock.schedule_interval(self.update, 0 if self.timestep else 1 / 60)
 
         # Attach render layers in correct order
         self._attach_after_layers()
-        self._ai_timer = 0.0
-        self._ai_ctx = {"state": "idle", "timer": 0.0, "cooldown": 0.0, "target_x": None, "jump_ok": True, "jump_cooldown": 0.0, "idle": 0.0}
 
         # Show main menu or jump straight into play for debugging
         if self.debug_mode:
@@ -344,7 +362,7 @@ class FighterGame(Widget):
         if not tracks:
             return
         choices = [p for p in tracks if p != previous] or tracks
-        path = random.choice(choices)
+        path = self.cosmetic_rng.choice(choices)
 
         def _next_stage_track(*args):
             if self.state not in ("playing", "round_over"):
@@ -400,7 +418,7 @@ class FighterGame(Widget):
 
     def _play_random_hit_sfx(self):
         choices = ["hit1", "hit2", "hit3"]
-        random.shuffle(choices)
+        self.cosmetic_rng.shuffle(choices)
         for key in choices:
             path = self.sfx_library.get(key)
             if path and os.path.exists(path):
@@ -456,9 +474,76 @@ class FighterGame(Widget):
         # Bot = Ken
         ken_paths = load_ken_assets()
 
+        # A threaded CPU being replaced must not leave its worker behind
+        self.stop_ai()
+        # Gameplay stream shared by fighters and AI; reseeded at every match start
+        seed = self.cosmetic_rng.randrange(1 << 32)
+        rng = random.Random(seed)
+
         p1_x, p2_x = self._start_positions()
-        self.p1 = Fighter(p1_x, self.floor_y, ryu_paths, self.floor_y, stage_width=self.stage_width)
-        self.p2 = Fighter(p2_x, self.floor_y, ken_paths, self.floor_y, stage_width=self.stage_width)
+        fighter_cls, match_cls, fixed = Fighter, Match, {}
+        if self.fixed_point:
+            fighter_cls, match_cls, fixed = FixedFighter, FixedMatch, dict(tick_rate=self.timestep.tick_rate)
+        self.p1 = fighter_cls(p1_x, self.floor_y, ryu_paths, self.floor_y, stage_width=self.stage_width, texture_loader=load_sprite_texture, rng=rng, **fixed)
+        self.p2 = fighter_cls(p2_x, self.floor_y, ken_paths, self.floor_y, stage_width=self.stage_width, texture_loader=load_sprite_texture, rng=rng, **fixed)
+        # Simulation state (AI, round clock, hit checks) lives in the Kivy-free match
+        self.match = match_cls(self.p1, self.p2, self.stage_width, self.floor_y, gravity=self.gravity, rng=rng, seed=seed, **fixed)
+        if self.ai_tier == "search":
+            self.match.controllers[1] = SearchAIController(rng, gravity=self.gravity)
+        elif self.ai_tier == "policy":
+            try:
+                from game_fighter.policy_ai import PolicyAIController
+
+                self.match.controllers[1] = PolicyAIController(rng)
+            except (ImportError, OSError):
+                # NumPy is optional (not in the APK) and the weights file may be missing
+                pass
+        elif self.ai_tier == "habits":
+            model = load_profile(self.habit_dir, self.player_name) if self.habit_dir else None
+            self.match.controllers[1] = HabitAIController(rng, model=model, gravity=self.gravity)
+        if self.ai_hz > 0 or self.ai_threaded:
+            self.match.controllers[1] = ScheduledController(self.match.controllers[1], self.ai_hz or AI_HZ, threaded=self.ai_threaded)
+        # Kept aside while P2 is a human (versus); `_apply_selection` picks one per match
+        self.cpu_controller = self.match.controllers[1]
+        if self.versus:
+            self.match.controllers[1] = None
+        self.run_ahead = RunAhead(self.match, self.run_ahead_frames) if self.run_ahead_frames > 0 else None
+        self._last_cmds = (0, 0)
+
+    @property
+    def versus(self):
+        return self.router.versus
+
+    def _set_versus(self, versus):
+        """Switch P2 between the CPU and a second human; takes effect from the next match."""
+        self.router.set_versus(versus)
+        self.pad_events.reset()
+        self._pending_presses = [0, 0]
+
+    @property
+    def round_timer(self):
+        return self.match.round_timer
+
+    @property
+    def _ai_ctx(self):
+        return self.match.ai.ctx
+
+    # Win counters live in the match so save states capture them
+    @property
+    def p1_wins(self):
+        return self.match.p1_wins
+
+    @p1_wins.setter
+    def p1_wins(self, value):
+        self.match.p1_wins = value
+
+    @property
+    def p2_wins(self):
+        return self.match.p2_wins
+
+    @p2_wins.setter
+    def p2_wins(self, value):
+        self.match.p2_wins = value
 
     # --------------------------------------------------------
     # STAGE LOADING
@@ -488,11 +573,7 @@ class FighterGame(Widget):
 
     def _reference_floor_y(self):
         """Use Military stage floor as reference for collision height across stages."""
-        ref_w, ref_h = 1024, 176
-        ratio = 0.2
-        win_w = Window.size[0] or 1280
-        scale = win_w / ref_w
-        return max(10, ref_h * scale * ratio)
+        return reference_floor_y(Window.size[0] or 1280)
 
     def _refresh_floor_scale(self):
         """Recompute floor height/offset when the window size changes."""
@@ -674,22 +755,13 @@ class FighterGame(Widget):
             layer["rect"] = None
         self._layout_bg_cover()
 
-        p1_fw, p1_fh = self.p1.sprite.current_frame_size()
-        p2_fw, p2_fh = self.p2.sprite.current_frame_size()
-        p1_sw = p1_fw * self.p1.render_scale
-        p1_sh = p1_fh * self.p1.render_scale
-        p2_sw = p2_fw * self.p2.render_scale
-        p2_sh = p2_fh * self.p2.render_scale
-
         with self.canvas:
             # Invisible ground plane; floor art is drawn separately on top of background
             Color(0, 0, 0, 0)
             self.ground = Rectangle(pos=(0, 0), size=(self.width, self.floor_height))
 
-            # Fighters
-            Color(1, 1, 1, 1)
-            self.p1.rect = Rectangle(texture=self.p1.sprite.current_texture(), pos=(self.p1.x, self.p1.y), size=(p1_sw, p1_sh))
-            self.p2.rect = Rectangle(texture=self.p2.sprite.current_texture(), pos=(self.p2.x, self.p2.y), size=(p2_sw, p2_sh))
+        # Fighters, projectiles and debug boxes, filled in by `_sync_draw`
+        self.canvas.add(self.sprite_batch.group)
 
         # Ensure world/overlay/UI layers are attached in correct order
         if self.fx not in self.canvas.after.children:
@@ -711,6 +783,8 @@ class FighterGame(Widget):
             self.p1.stage_width = self.stage_width
         if hasattr(self, "p2"):
             self.p2.stage_width = self.stage_width
+        if hasattr(self, "match"):
+            self.match.stage_width = self.stage_width
         if self.ground:
             self.ground.size = (self.width, self.floor_height)
             self.ground.pos = (0, 0)
@@ -724,14 +798,13 @@ class FighterGame(Widget):
         """Attach canvas.after layers in draw order so HUD/UI are not camera-transformed."""
         after = self.canvas.after
         groups = [
-            self.hitbox_debug,  # world-space debug
-            self.hurtbox_debug,  # world-space debug
             self.fx,  # world fx in world space
             self.transform_after,  # PopMatrix for camera/shake
             self.touch_group,
             self.hud_group,  # HUD/UI after pop
             self.banner_group,
             self.ui_group,
+            self.debug_group,  # latency / run-ahead overlay (FIGHTER_DEBUG)
         ]
         for g in groups:
             if g in after.children:
@@ -750,53 +823,58 @@ class FighterGame(Widget):
         if hasattr(self, "p2"):
             self.p2.render_scale = scale
 
-    def _sync_draw(self):
-        self._update_camera()
-        # Update fighter 1
-        if self.p1.rect:
-            frame_w, frame_h = self.p1.sprite.current_frame_size()
-            sw = frame_w * self.p1.render_scale
-            sh = frame_h * self.p1.render_scale
-            self.p1.rect.pos = (self.p1.x, self.p1.y)
-            self.p1.rect.size = (sw, sh)
-            tex = self.p1.sprite.current_texture()
-            if self.p1.rect.texture is not tex:
-                self.p1.rect.texture = tex
-            self.p1.rect.tex_coords = self.p1.sprite.current_texcoords()
-        # Update fighter 2
-        if self.p2.rect:
-            frame_w, frame_h = self.p2.sprite.current_frame_size()
-            sw = frame_w * self.p2.render_scale
-            sh = frame_h * self.p2.render_scale
-            self.p2.rect.pos = (self.p2.x, self.p2.y)
-            self.p2.rect.size = (sw, sh)
-            tex = self.p2.sprite.current_texture()
-            if self.p2.rect.texture is not tex:
-                self.p2.rect.texture = tex
-            self.p2.rect.tex_coords = self.p2.sprite.current_texcoords()
-
-    def _draw_debug_boxes(self):
-        if not self.show_hitboxes:
-            self.hitbox_debug.clear()
-            self.hurtbox_debug.clear()
-            return
-
-        self.hitbox_debug.clear()
-        self.hurtbox_debug.clear()
+    def _render_positions(self):
+        """Fighter positions blended between the previous and current tick by `_interp_alpha`."""
+        p1, p2 = self.p1, self.p2
+        prev = self._prev_positions
+        if prev is None or self._interp_alpha >= 1.0:
+            return (p1.x, p1.y), (p2.x, p2.y)
+        a = self._interp_alpha
+        return (
+            (prev[0] + (p1.x - prev[0]) * a, prev[1] + (p1.y - prev[1]) * a),
+            (prev[2] + (p2.x - prev[2]) * a, prev[3] + (p2.y - prev[3]) * a),
+        )
 
-        # DRAW HURTBOXES (BLUE)
-        Color(0.2, 0.4, 1, 0.4)
+    def _sync_draw(self):
+        """Redraw the world sprites through `sprite_batch`: fighters, then projectiles, then debug boxes."""
+        p1_pos, p2_pos = self._render_positions()
+        self._update_camera(p1_pos[0], p2_pos[0])
+        batch = self.sprite_batch
+        batch.begin()
+        for f, (x, y) in ((self.p1, p1_pos), (self.p2, p2_pos)):
+            sprite = f.sprite
+            frame_w, frame_h = sprite.current_frame_size()
+            batch.quad(
+                sprite.current_texture(), x, y,
+                frame_w * f.render_scale, frame_h * f.render_scale,
+                sprite.current_texcoords(),
+            )
+        self._draw_projectiles(batch)
+        if self.show_hitboxes and self.state == "playing":
+            self._draw_debug_boxes(batch)
+        batch.end()
+        if self.latency is not None:
+            self.latency.display()
+
+    def _draw_projectiles(self, batch):
+        """Add the live projectiles to the batch, blended back toward the previous tick like the fighters."""
+        pool = self.match.projectiles
+        # Back off toward the previous tick by the part of the step not yet shown
+        lag = (1.0 - self._interp_alpha) * pool.last_dt
+        for i in range(pool.count):
+            batch.ellipse(pool.x[i] - pool.vx[i] * lag, pool.y[i], pool.w[i], pool.h[i], PROJECTILE_RGBA)
+
+    def _draw_debug_boxes(self, batch):
+        """Add hurtboxes (blue) and attack/projectile hitboxes (red) at their simulated positions."""
         for f in (self.p1, self.p2):
-            x, y, w, h = f.hurtbox()
-            self.hurtbox_debug.add(Rectangle(pos=(x, y), size=(w, h)))
-
-        # DRAW HITBOXES (RED)
-        Color(1, 0.2, 0.2, 0.4)
+            batch.rect(*f.hurtbox(), HURTBOX_RGBA)
         for f in (self.p1, self.p2):
             hb = f.attack_hitbox()
             if hb:
-                x, y, w, h = hb
-                self.hitbox_debug.add(Rectangle(pos=(x, y), size=(w, h)))
+                batch.rect(*hb, HITBOX_RGBA)
+        pool = self.match.projectiles
+        for i in range(pool.count):
+            batch.rect(pool.x[i], pool.y[i], pool.w[i], pool.h[i], HITBOX_RGBA)
 
     # --------------------------------------------------------
     # HUD (HEALTH / TIMER / NAMES)
@@ -1082,6 +1160,7 @@ class FighterGame(Widget):
     # --------------------------------------------------------
     def _clear_ui(self):
         self.ui_group.clear()
+        self.menu_hits.clear()
 
     def _load_texture(self, path):
         if not path or not os.path.exists(path):
@@ -1192,8 +1271,6 @@ class FighterGame(Widget):
         start_x = (self.width - total_row_w) / 2
 
         self.main_menu_index = min(2, getattr(self, "main_menu_index", 0))
-        self._main_menu_control_rect = None
-        self._main_menu_home_rect = None
 
         # Play button
         self.ui_group.add(Color(0.85, 0.35, 0.25, 1))
@@ -1201,7 +1278,7 @@ class FighterGame(Widget):
         if self.main_menu_index == 0:
             self.ui_group.add(Color(1, 1, 1, 1))
             self.ui_group.add(Line(rectangle=(start_x, row_y, btn_w, btn_h), width=4))
-        self._main_menu_play_rect = (start_x, row_y, btn_w, btn_h)
+        self.menu_hits.add(0, (start_x, row_y, btn_w, btn_h))
         play_tex = self._measure_label("Play", 64)
         self._draw_label("Play", start_x + (btn_w - play_tex.width) / 2, row_y + (btn_h - play_tex.height) / 2, font_px=64)
 
@@ -1212,7 +1289,7 @@ class FighterGame(Widget):
         if self.main_menu_index == 1:
             self.ui_group.add(Color(1, 1, 1, 1))
             self.ui_group.add(Line(rectangle=(opt_x, row_y, btn_w, btn_h), width=4))
-        self._main_menu_options_rect = (opt_x, row_y, btn_w, btn_h)
+        self.menu_hits.add(1, (opt_x, row_y, btn_w, btn_h))
         opt_tex = self._measure_label("Options", 64)
         self._draw_label("Options", opt_x + (btn_w - opt_tex.width) / 2, row_y + (btn_h - opt_tex.height) / 2, font_px=64)
 
@@ -1224,7 +1301,7 @@ class FighterGame(Widget):
         if self.main_menu_index == 2:
             self.ui_group.add(Color(1, 1, 1, 1))
             self.ui_group.add(Line(rectangle=(home_x, home_y, btn_w, btn_h), width=4))
-        self._main_menu_home_rect = (home_x, home_y, btn_w, btn_h)
+        self.menu_hits.add(2, (home_x, home_y, btn_w, btn_h))
         home_tex = self._measure_label("Home Menu", 64)
         self._draw_label("Home Menu", home_x + (btn_w - home_tex.width) / 2, home_y + (btn_h - home_tex.height) / 2, font_px=64)
 
@@ -1232,7 +1309,7 @@ class FighterGame(Widget):
         prompt_y = max(prompt_y, self.height * 0.05)
         self._center_label("Use arrows to select; Enter or tap to confirm", prompt_y, font_px=38, color=(1, 1, 1, 0.8))
 
-    def _render_select_grid(self, title, options, selected_idx):
+    def _render_select_grid(self, title, options, selected_idx, p2_idx=None):
         self._clear_ui()
         self._add_menu_background()
         self._center_label(title, self.height * 0.72, font_px=96)
@@ -1260,6 +1337,10 @@ class FighterGame(Widget):
                 if idx == len(options) - 1:
                     tc = (tc[2], tc[3], tc[0], tc[1], tc[6], tc[7], tc[4], tc[5])
                 self.ui_group.add(Rectangle(texture=portrait_tex, pos=(x, box_y), size=(box_size, box_size), tex_coords=tc))
+                # P2's cursor (versus): a red frame inside the portrait
+                if idx == p2_idx:
+                    self.ui_group.add(Color(0.9, 0.15, 0.15, 1))
+                    self.ui_group.add(Line(rectangle=(x + border, box_y + border, box_size - border * 2, box_size - border * 2), width=border * 0.6))
                 # Name below portrait
                 label_tex = self._measure_label(opt["name"], 52)
                 lbl_x = x + (box_size - label_tex.width) / 2
@@ -1274,11 +1355,27 @@ class FighterGame(Widget):
                 lbl_x = x + (box_size - label_tex.width) / 2
                 lbl_y = box_y + (box_size - label_tex.height) / 2
                 self._draw_label(opt["name"], lbl_x, lbl_y, font_px=56, color=(0, 0, 0, 0.9) if is_selected else (1, 1, 1, 0.9))
+                if idx == p2_idx:
+                    self.ui_group.add(Color(0.9, 0.15, 0.15, 1))
+                    self.ui_group.add(Line(rectangle=(x + 4, box_y + 4, box_size - 8, box_size - 8), width=3))
 
         self._center_label("Use arrow keys or tap to choose, Enter/tap again to confirm", self.height * 0.22, font_px=44, color=(1, 1, 1, 0.8))
 
     def _render_character_select(self):
-        self._render_select_grid("Choose Your Fighter", self.character_options, self.selected_character_index)
+        if not self.versus:
+            self._render_select_grid("Choose Your Fighter", self.character_options, self.selected_character_index)
+            return
+        self._render_select_grid("Choose Your Fighters", self.character_options, self.selected_character_index, self.selected_p2_index)
+        # Who drives whom: keyboard halves (as bound), pads (Back/Share on a pad moves it), touch
+        pads = self.router.pad_counts()
+        p1_keys = self.bindings.key_hint("keys", skip=self.bindings.keys_p2)
+        p2_keys = self.bindings.key_hint("keys_p2")
+        self._center_label(
+            f"P1 (yellow): {p1_keys}, {pads[0]} pad(s), touch    P2 (red): {p2_keys}, {pads[1]} pad(s)    Back on a pad: switch side",
+            self.height * 0.14,
+            font_px=30,
+            color=(1, 1, 1, 0.8),
+        )
 
     def _render_stage_select(self):
         self._render_select_grid("Pick a Stage", self.stage_options, self.selected_stage_index)
@@ -1312,13 +1409,12 @@ class FighterGame(Widget):
         start_x = (self.width - total_w) / 2
         btn_y = self.height * 0.38
         labels = [("Restart", "restart"), ("Menu", "menu")]
-        self._win_button_rects = {}
         for idx, (text, key) in enumerate(labels):
             x = start_x + idx * (btn_w + gap)
             is_sel = (idx == self.win_menu_index)
             self.ui_group.add(Color(0.2, 0.8, 0.3, 0.9) if is_sel else Color(0.1, 0.1, 0.15, 0.8))
             self.ui_group.add(Rectangle(pos=(x, btn_y), size=(btn_w, btn_h)))
-            self._win_button_rects[key] = (x, btn_y, btn_w, btn_h)
+            self.menu_hits.add(key, (x, btn_y, btn_w, btn_h))
             tex = self._measure_label(text, 56)
             lbl_x = x + (btn_w - tex.width) / 2
             lbl_y = btn_y + (btn_h - tex.height) / 2
@@ -1339,12 +1435,11 @@ class FighterGame(Widget):
         start_x = (self.width - (btn_w * 2 + gap)) / 2
         btn_y = self.height * 0.34
         labels = [("Give Up", "give_up"), ("Stand Strong", "stand_strong")]
-        self._continue_buttons = {}
         for idx, (text, key) in enumerate(labels):
             x = start_x + idx * (btn_w + gap)
             self.ui_group.add(Color(0.85, 0.35, 0.25, 0.95))
             self.ui_group.add(Rectangle(pos=(x, btn_y), size=(btn_w, btn_h)))
-            self._continue_buttons[key] = (x, btn_y, btn_w, btn_h)
+            self.menu_hits.add(key, (x, btn_y, btn_w, btn_h))
             tex = self._measure_label(text, 58)
             self._draw_label(text, x + (btn_w - tex.width) / 2, btn_y + (btn_h - tex.height) / 2, font_px=58)
 
@@ -1363,14 +1458,14 @@ class FighterGame(Widget):
             {"label": "Music Volume", "type": "music", "value": self.music_volume},
             {"label": "Effect Volume", "type": "sfx", "value": self.sfx_volume},
             {"label": "Control Mode", "type": "control", "value": self.control_mode.title()},
+            {"label": "Opponent", "type": "versus", "value": "Player 2" if self.versus else "CPU"},
         ]
-        self._options_hitboxes = {}
         btn_w = min(self.width * 0.18, 220)
         btn_h = 90
         gap = max(self.width * 0.02, 30)
         start_x = (self.width - (btn_w * 2 + gap)) / 2
-        row_y = self.height * 0.52
-        row_gap = btn_h * 1.3
+        row_y = self.height * 0.56
+        row_gap = btn_h * 1.2
         for idx, row in enumerate(rows):
             y = row_y - idx * row_gap
             self._draw_label(row["label"], self.width * 0.26, y + (btn_h - 40) / 2, font_px=48)
@@ -1386,14 +1481,14 @@ class FighterGame(Widget):
                     tex = self._measure_label(txt, 64)
                     self._draw_label(txt, x + (btn_w - tex.width) / 2, y + (btn_h - tex.height) / 2, font_px=64)
                     key = (idx, "plus" if is_plus else "minus")
-                    self._options_hitboxes[key] = (x, y, btn_w, btn_h)
+                    self.menu_hits.add(key, (x, y, btn_w, btn_h))
                 if row["type"] == "music":
                     pct = int(round((val / max(1e-6, self.music_base)) * 100))
                 else:
                     pct = int(round(val * 100))
                 self._draw_label(f"{pct}%", self.width * 0.66, y + (btn_h - 48) / 2, font_px=48, color=(1, 1, 1, 0.9))
             else:
-                # Control mode toggle
+                # Control mode / opponent toggle
                 sel = (self.options_index == idx)
                 self.ui_group.add(Color(0.2, 0.6, 0.9, 0.9 if sel else 0.8))
                 self.ui_group.add(Rectangle(pos=(minus_x, y), size=(btn_w * 2 + gap, btn_h)))
@@ -1402,11 +1497,10 @@ class FighterGame(Widget):
                     self.ui_group.add(Line(rectangle=(minus_x, y, btn_w * 2 + gap, btn_h), width=3))
                 label_tex = self._measure_label(f"{row['value']}", 56)
                 self._draw_label(f"{row['value']}", minus_x + (btn_w * 2 + gap - label_tex.width) / 2, y + (btn_h - label_tex.height) / 2, font_px=56)
-                # Both left/right regions toggle
-                self._options_hitboxes[(idx, "minus")] = (minus_x, y, btn_w * 2 + gap, btn_h)
-                self._options_hitboxes[(idx, "plus")] = (minus_x, y, btn_w * 2 + gap, btn_h)
+                # One region covering both sides; a tap steps back like "-"
+                self.menu_hits.add((idx, "minus"), (minus_x, y, btn_w * 2 + gap, btn_h))
 
-        self._center_label("Left/Right to adjust, Up/Down to switch, Enter to return", self.height * 0.26, font_px=32, color=(1, 1, 1, 0.8))
+        self._center_label("Left/Right to adjust, Up/Down to switch, Enter to return", self.height * 0.06, font_px=32, color=(1, 1, 1, 0.8))
 
     # --------------------------------------------------------
     # TOUCH UI
@@ -1427,6 +1521,7 @@ class FighterGame(Widget):
     def _layout_touch_ui(self):
         self.touch_group.clear()
         self.touch_button_boxes = {}
+        self.touch_hits.clear()
 
         if self.control_mode != "touch":
             return
@@ -1436,6 +1531,9 @@ class FighterGame(Widget):
         w = float(self.width or Window.size[0] or 1)
         h = float(self.height or Window.size[1] or 1)
         size = min(max(70.0, min(w, h) * 0.09), 140.0)
+        # Buttons accept touches a little outside their drawn edge
+        hit_pad = max(6.0, min(float(self.width or 0), float(self.height or 0)) * 0.01)
+        self.touch_hits.clear(cell=size)
         pad = w * 0.07
         bottom = h * 0.12
         spacing = size * 1.05
@@ -1455,6 +1553,7 @@ class FighterGame(Widget):
             label = {"left": "\u2190", "right": "\u2192", "up": "\u2191", "down": "\u2193"}[action]
             self._draw_touch_button(px, py, size, label)
             self.touch_button_boxes[action] = (px, py, size, size)
+            self.touch_hits.add(action, (px, py, size, size), pad=hit_pad)
 
         # Action buttons (right side)
         act_spacing = size * 1.2
@@ -1466,8 +1565,12 @@ class FighterGame(Widget):
             py = act_y
             self._draw_touch_button(px, py, size, label)
             self.touch_button_boxes[action] = (px, py, size, size)
+            self.touch_hits.add(action, (px, py, size, size), pad=hit_pad)
 
     def _enter_main_menu(self):
+        self._close_replay()  # an abandoned match keeps its replay, minus the end-state check
+        self.dump_latency()
+        self.save_habits()
         self.state = "main_menu"
         self._hide_banner()
         self._reset_round_data()
@@ -1496,9 +1599,12 @@ class FighterGame(Widget):
         self.transition_lock = False
         self._render_options()
 
-    def _move_character_cursor(self, direction):
-        total = len(self.character_options)
-        self.selected_character_index = (self.selected_character_index + direction) % max(1, total)
+    def _move_character_cursor(self, direction, player=0):
+        total = max(1, len(self.character_options))
+        if player == 1 and self.versus:
+            self.selected_p2_index = (self.selected_p2_index + direction) % total
+        else:
+            self.selected_character_index = (self.selected_character_index + direction) % total
         self._render_character_select()
         self._play_sfx("optionscroll")
 
@@ -1517,10 +1623,10 @@ class FighterGame(Widget):
         if self.state == "main_menu":
             self._render_main_menu()
             self._play_sfx("optionscroll")
-        self.input.reset()
+        self.router.reset()
+        self.pad_events.reset()
         self.touch_actions.clear()
-        self._pending_jump = False
-        self._pending_attack = False
+        self._pending_presses = [0, 0]
         self._layout_touch_ui()
         # Ensure any transient navigation lock is cleared after toggling modes
         self.transition_lock = False
@@ -1538,41 +1644,30 @@ class FighterGame(Widget):
         return closest_idx
 
     def _handle_touch_menu(self, touch):
+        hit = self.menu_hits.first(touch.x, touch.y)
         if self.state == "main_menu":
-            x, y = touch.x, touch.y
-            if self._main_menu_play_rect:
-                px, py, pw, ph = self._main_menu_play_rect
-                if px <= x <= px + pw and py <= y <= py + ph:
-                    self.main_menu_index = 0
-                    self.transition_lock = True
-                    self._play_sfx_and_then("gamestart", lambda: self._enter_character_select())
-                    return True
-            if self._main_menu_options_rect:
-                ox, oy, ow, oh = self._main_menu_options_rect
-                if ox <= x <= ox + ow and oy <= y <= oy + oh:
-                    self.main_menu_index = 1
-                    self._enter_options()
-                    return True
-            if self._main_menu_home_rect:
-                hx, hy, hw, hh = self._main_menu_home_rect
-                if hx <= x <= hx + hw and hy <= y <= hy + hh:
-                    self.main_menu_index = 2
-                    self._return_to_launcher()
-                    return True
-            # tap elsewhere still starts
+            if hit == 1:
+                self.main_menu_index = 1
+                self._enter_options()
+                return True
+            if hit == 2:
+                self.main_menu_index = 2
+                self._return_to_launcher()
+                return True
+            # Play, or a tap elsewhere, starts
+            if hit == 0:
+                self.main_menu_index = 0
             self.transition_lock = True
             self._play_sfx_and_then("gamestart", lambda: self._enter_character_select())
             return True
 
         if self.state == "options":
-            for key, rect in self._options_hitboxes.items():
-                x, y, w, h = rect
-                if x <= touch.x <= x + w and y <= touch.y <= y + h:
-                    idx, kind = key
-                    self.options_index = idx
-                    delta = 0.1 if kind == "plus" else -0.1
-                    self._adjust_option(idx, delta)
-                    return True
+            if hit is not None:
+                idx, kind = hit
+                self.options_index = idx
+                delta = 0.1 if kind == "plus" else -0.1
+                self._adjust_option(idx, delta)
+                return True
             # tap outside returns to main menu
             self._play_sfx_and_then("optionconfirm", lambda: self._enter_main_menu())
             return True
@@ -1604,29 +1699,22 @@ class FighterGame(Widget):
             return True
 
         if self.state == "match_over_win":
-            for key, rect in self._win_button_rects.items():
-                x, y, w, h = rect
-                if x <= touch.x <= x + w and y <= touch.y <= y + h:
-                    self.win_menu_index = 0 if key == "restart" else 1
-                    self.transition_lock = True
-                    self._play_sfx_and_then("optionconfirm", lambda: self._reset_match() if key == "restart" else self._enter_main_menu())
-                    return True
-            return False
+            if hit is None:
+                return False
+            self.win_menu_index = 0 if hit == "restart" else 1
+            self.transition_lock = True
+            self._play_sfx_and_then("optionconfirm", lambda: self._reset_match() if hit == "restart" else self._enter_main_menu())
+            return True
 
         if self.state == "continue":
-            if self._continue_buttons:
-                for key, rect in self._continue_buttons.items():
-                    x, y, w, h = rect
-                    if x <= touch.x <= x + w and y <= y + h:
-                        if key == "give_up":
-                            self.transition_lock = True
-                            self._play_sfx_and_then("optionconfirm", lambda: self._play_music("gameover", loop=False) or self._enter_main_menu())
-                        else:
-                            self.transition_lock = True
-                            self._play_sfx_and_then("optionconfirm", lambda: self._reset_match())
-                        return True
-            return False
-            return False
+            if hit is None:
+                return False
+            self.transition_lock = True
+            if hit == "give_up":
+                self._play_sfx_and_then("optionconfirm", lambda: self._play_music("gameover", loop=False) or self._enter_main_menu())
+            else:
+                self._play_sfx_and_then("optionconfirm", lambda: self._reset_match())
+            return True
 
         if self.state == "game_over":
             self.transition_lock = True
@@ -1636,7 +1724,7 @@ class FighterGame(Widget):
         return False
 
     # --------------------------------------------------------
-    # INPUT HANDLING (P1 ONLY)
+    # INPUT HANDLING (ROUTED PER PLAYER)
     # --------------------------------------------------------
     def _return_to_launcher(self):
         """Go back to the top-level game selector."""
@@ -1651,22 +1739,11 @@ class FighterGame(Widget):
         finally:
             self.transition_lock = False
 
-    def _action_from_keyname(self, name):
-        if name in ("enter", "space", "r"):
-            return "confirm"
-        if name in ("left", "a"):
-            return "left"
-        if name in ("right", "d"):
-            return "right"
-        if name in ("up", "w"):
-            return "up"
-        if name in ("down", "s"):
-            return "down"
-        if name in ("m", "escape", "backspace"):
-            return "back"
-        return None
-
-    def _handle_menu_action(self, action):
+    def _action_from_keycode(self, keycode):
+        """Menu action bound to a key (see `bindings.py`), or None."""
+        return self.bindings.menu_keys.get(keycode)
+
+    def _handle_menu_action(self, action, player=0):
         # Only block actions that would trigger a screen change while a confirm SFX is still playing
         if self.transition_lock and action == "confirm":
             return True
@@ -1694,10 +1771,10 @@ class FighterGame(Widget):
 
         if self.state == "character_select":
             if action in ("left", "up"):
-                self._move_character_cursor(-1)
+                self._move_character_cursor(-1, player)
                 return True
             if action in ("right", "down"):
-                self._move_character_cursor(1)
+                self._move_character_cursor(1, player)
                 return True
             if action == "confirm":
                 self.transition_lock = True
@@ -1725,7 +1802,7 @@ class FighterGame(Widget):
                 self._play_sfx("optionscroll")
                 return True
             if action == "down":
-                self.options_index = min(2, self.options_index + 1)
+                self.options_index = min(3, self.options_index + 1)
                 self._render_options()
                 self._play_sfx("optionscroll")
                 return True
@@ -1772,156 +1849,128 @@ class FighterGame(Widget):
 
         return False
 
-    def _queue_jump(self):
-        self._pending_jump = True
+    def _queue_jump(self, player=0):
+        self._pending_presses[player] |= JUMP_PRESSED
 
-    def _queue_attack(self):
-        self._pending_attack = True
+    def _queue_attack(self, player=0):
+        self._pending_presses[player] |= PUNCH_PRESSED
 
-    def _on_key_down(self, window, keycode, scancode, codepoint, modifiers):
-        name = keyname_from_event(keycode, codepoint)
-        action = self._action_from_keyname(name)
+    def _press_action(self, action, source, player=0):
+        """Hold a gameplay action for `source` on `player`; a fresh up/punch press also queues the jump/attack. True if fresh."""
+        if not self.inputs[player].set(action, True, source):
+            return False
+        if action == "up":
+            self._queue_jump(player)
+        elif action == "punch":
+            self._queue_attack(player)
+        return True
 
-        if action and self._handle_menu_action(action):
-            return True
+    def _stamp_input(self, device):
+        """Start the latency clock for a fresh gameplay press from `device` (keyboard / pad / touch)."""
+        if self.latency is not None and self.state == "playing":
+            self.latency.stamp(device)
 
-        source = "keyboard"
-
-        if name in ("left", "a"):
-            self.input.set("left", True, source)
-        elif name in ("right", "d"):
-            self.input.set("right", True, source)
-        elif name in ("w", "up"):
-            if self.input.set("up", True, source):
-                self._queue_jump()
-        elif name in ("s", "down"):
-            self.input.set("down", True, source)
-        elif name in ("j", "space"):
-            if self.input.set("punch", True, source):
-                self._queue_attack()
+    def _on_key_down(self, window, keycode, scancode, codepoint, modifiers):
+        route = self.router.keys.get(keycode)  # (player, gameplay action) or None
+        action = self._action_from_keycode(keycode)
+        if action and self._handle_menu_action(action, route[0] if route else 0):
+            return True
 
+        if route is not None and self._press_action(route[1], KEYBOARD, route[0]):
+            self._stamp_input("keyboard")
         return True
 
     def _on_key_up(self, window, keycode, *args):
-        name = keyname_from_keyup(keycode)
-        source = "keyboard"
-
-        if name in ("left", "a"):
-            self.input.set("left", False, source)
-        elif name in ("right", "d"):
-            self.input.set("right", False, source)
-        elif name in ("w", "up"):
-            self.input.set("up", False, source)
-        elif name in ("s", "down"):
-            self.input.set("down", False, source)
-        elif name in ("j", "space"):
-            self.input.set("punch", False, source)
-
+        route = self.router.keys.get(keycode)
+        if route is not None:
+            self.inputs[route[0]].set(route[1], False, KEYBOARD)
         return True
 
     def _on_joy_axis(self, window, stickid, axisid, value):
-        """Map joystick axes to actions. Axis 0: horizontal; Axis 1: vertical (jump)."""
-        source = f"pad:{stickid}"
-        deadzone = 0.35
-        if axisid == 0:
-            if value < -deadzone:
-                self.input.set("left", True, source)
-                self.input.set("right", False, source)
-            elif value > deadzone:
-                self.input.set("right", True, source)
-                self.input.set("left", False, source)
-            else:
-                self.input.set("left", False, source)
-                self.input.set("right", False, source)
-        elif axisid == 1:
-            if value < -0.55:
-                if self.input.set("up", True, source):
-                    self._queue_jump()
-            else:
-                self.input.set("up", False, source)
+        """Buffer a stick report (axis 0: horizontal, axis 1: up jumps); `_apply_pad_events` applies it."""
+        self.pad_events.axis(stickid, axisid, value)
         return True
 
     def _on_joy_hat(self, window, stickid, hatid, value):
-        source = f"pad:{stickid}:hat{hatid}"
-        x, y = value
-        self.input.set("left", x < 0, source)
-        self.input.set("right", x > 0, source)
-
-        if y > 0:
-            if self.input.set("up", True, source):
-                self._queue_jump()
-        else:
-            self.input.set("up", False, source)
-
-        self.input.set("down", y < 0, source)
-
-        # Let the D-pad also steer menus
-        if x < 0:
-            self._handle_menu_action("left")
-        elif x > 0:
-            self._handle_menu_action("right")
-        elif y > 0:
-            self._handle_menu_action("up")
-        elif y < 0:
-            self._handle_menu_action("down")
+        self.pad_events.hat(stickid, hatid, value)
         return True
 
-    def _on_joy_button_down(self, window, stickid, buttonid):
-        source = f"pad:{stickid}"
-
-        if self.state != "playing" and buttonid in (0, 1, 2, 3, 7):
-            if self._handle_menu_action("confirm"):
-                return True
+    def _apply_pad_events(self):
+        """Turn the stick/hat reports since the last tick into action changes (once per tick)."""
+        menu_action = None
+        for source, action, held, steers_menu in self.pad_events.resolve():
+            player = self.router.pad(source[0]).player
+            if held:
+                self._press_action(action, source, player)
+                # Let the D-pad also steer menus, one step per fresh press
+                if steers_menu and menu_action is None:
+                    menu_action = (action, player)
+            else:
+                self.inputs[player].set(action, False, source)
+        if menu_action is not None:
+            self._handle_menu_action(*menu_action)
 
-        if buttonid in (0, 3):  # A / Y
-            if self.input.set("up", True, source):
-                self._queue_jump()
-        elif buttonid in (1, 2):  # B / X
-            if self.input.set("punch", True, source):
-                self._queue_attack()
-        elif buttonid in (7,):  # Start / Options
-            if self._handle_menu_action("confirm"):
-                return True
+    def _on_joy_button_down(self, window, stickid, buttonid):
+        pad = self.router.pad(stickid)  # a stick's first event plugs it in
+        action = self.bindings.pad_menu.get(buttonid)
+        if action == "swap":
+            return self._swap_pad(stickid)
+        # In a fight, buttons bound to gameplay stay gameplay-only (Start still confirms)
+        if action and (self.state != "playing" or buttonid not in self.bindings.pad_buttons) and self._handle_menu_action(action, pad.player):
+            return True
 
+        action = self.bindings.pad_buttons.get(buttonid)
+        if action is not None and self._press_action(action, pad, pad.player):
+            self._stamp_input("pad")
         return True
 
     def _on_joy_button_up(self, window, stickid, buttonid):
-        source = f"pad:{stickid}"
+        action = self.bindings.pad_buttons.get(buttonid)
+        if action is not None:
+            pad = self.router.pad(stickid)
+            self.inputs[pad.player].set(action, False, pad)
+        return True
 
-        if buttonid in (0, 3):
-            self.input.set("up", False, source)
-        elif buttonid in (1, 2):
-            self.input.set("punch", False, source)
+    def _on_window_focus(self, window, focused):
+        if not focused:
+            self._release_pads()
 
+    def _release_pads(self, *args):
+        """Let go of everything the pads hold: their release events may never reach a window in the background."""
+        self.router.release_pads()
+        self.pad_events.reset()
+
+    def _swap_pad(self, stickid):
+        """On the versus character select, move a pad to the other player."""
+        if self.state != "character_select" or not self.versus:
+            return True
+        self.router.reassign(stickid)
+        self.pad_events.forget(stickid)
+        self._render_character_select()
+        self._play_sfx("optionscroll")
         return True
 
     def _actions_from_touch(self, touch):
         """Map touch position to actions using the on-screen buttons."""
         if self.control_mode != "touch":
             return set()
-        actions = set()
-        hit_pad = max(6.0, min(float(self.width or 0), float(self.height or 0)) * 0.01)
-        for action, (x, y, w, h) in self.touch_button_boxes.items():
-            if (x - hit_pad) <= touch.x <= (x + w + hit_pad) and (y - hit_pad) <= touch.y <= (y + h + hit_pad):
-                actions.add(action)
-        return actions
+        return set(self.touch_hits.hits(touch.x, touch.y))
 
     def _apply_touch_actions(self, touch, actions):
-        source = f"touch:{touch.uid}"
-        prev_actions = self.touch_actions.get(touch.uid, set())
+        source = touch.uid
+        player = self.router.touch_player
+        prev_actions = self.touch_actions.get(source, set())
 
         # Clear actions that ended
         for action in prev_actions - actions:
-            self.input.set(action, False, source)
+            self.inputs[player].set(action, False, source)
 
         # Set new/continued actions
+        fresh = False
         for action in actions:
-            became_active = self.input.set(action, True, source)
-            if became_active:
-                if action == "up":
-                    self._queue_jump()
-                elif action in ("punch",):
-                    self._queue_attack()
+            fresh |= self._press_action(action, source, player)
+        if fresh:
+            self._stamp_input("touch")
 
         if actions:
             self.touch_actions[touch.uid] = actions
@@ -1960,218 +2009,28 @@ class FighterGame(Widget):
     def on_touch_up(self, touch):
         if self.control_mode != "touch":
             return super().on_touch_up(touch)
-        source = f"touch:{touch.uid}"
-        self.input.clear_source(source)
+        self.inputs[self.router.touch_player].clear_source(touch.uid)
         self.touch_actions.pop(touch.uid, None)
         return True
 
-    def _apply_input_p1(self, dt):
-        if self._pending_jump:
-            self.p1.jump()
-            self._pending_jump = False
-        if self._pending_attack:
-            self.p1.start_attack()
-            self._pending_attack = False
-
-        left = self.input.get("left")
-        right = self.input.get("right")
-
-        if left and not right:
-            self.p1.move_left()
-        elif right and not left:
-            self.p1.move_right()
-        else:
-            self.p1.stop()
+    def _apply_input(self, player=0):
+        """Pack a player's held (or tapped since the last tick) actions plus queued one-shot presses into this tick's command bits."""
+        cmd = self.inputs[player].tick_mask() | self._pending_presses[player]
+        self._pending_presses[player] = 0
+        return cmd
 
     # --------------------------------------------------------
-    # ENEMY AI (state machine + simple pathfinding)
+    # MATCH EVENTS (hits / KOs reported by the simulation)
     # --------------------------------------------------------
-    def _ai_path_dir(self, start_x, target_x, step=32):
-        """
-        Lightweight 1D pathfinding toward a target x using a greedy A*-style step.
-        In one dimension with uniform cost, the optimal move is simply to step toward
-        the target; this satisfies the pathfinding requirement without heavy overhead.
-        """
-        if abs(target_x - start_x) <= step * 0.5:
-            return 0
-        return 1 if target_x > start_x else -1
-
-    def _ai_update(self, dt):
-        if self.state != "playing":
-            return
-
-        p1 = self.p1
-        p2 = self.p2
-
-        distance = abs(p1.x - p2.x)
-        horiz_dir = 1 if p1.x > p2.x else -1
-
-        # Always face the player unless intentionally backing out of a corner
-        if not (self._ai_ctx.get("state") == "evade" and (p2.x < STAGE_MARGIN + SPRITE_SIZE * 0.4 or p2.x > self.stage_width - SPRITE_SIZE * 1.4 - STAGE_MARGIN)):
-            p2.facing = 1 if p2.x < p1.x else -1
-
-        # AI context/state machine
-        ctx = self._ai_ctx
-        ctx["timer"] = max(0.0, ctx.get("timer", 0.0) - dt)
-        ctx["cooldown"] = max(0.0, ctx.get("cooldown", 0.0) - dt)
-        ctx["jump_cooldown"] = max(0.0, ctx.get("jump_cooldown", 0.0) - dt)
-        # Track idle time to break stalemates: if AI stands still too long, force an advance/attack
-        if abs(p2.vx) < 1e-3 and not p2.attack:
-            ctx["idle"] = ctx.get("idle", 0.0) + dt
-        else:
-            ctx["idle"] = 0.0
-
-        # If stunned/defeated, let physics handle recovery
-        if p2.hitstun > 0 or p2.defeated or p2.victorious:
-            return
-
-        corner_left = STAGE_MARGIN + SPRITE_SIZE * 0.4
-        corner_right = self.stage_width - SPRITE_SIZE * 1.4 - STAGE_MARGIN
-        cornered = p2.x < corner_left or p2.x > corner_right
-        player_attacking = p1.attack and p1.attack["phase"] in ("startup", "active")
-
-        # Decision tree to pick state, biased to avoid corner stun-lock.
-        # Only choose a new state when the think timer elapses.
-        if ctx["timer"] <= 0:
-            if cornered and (player_attacking or distance < 200):
-                ctx["state"] = "evade"
-                ctx["timer"] = 0.4
-                ctx["target_x"] = self.stage_width * 0.5  # move toward center to reset space
-            elif distance < 170:
-                ctx["state"] = "pressure"
-                ctx["timer"] = 0.25
-                ctx["target_x"] = p1.x - horiz_dir * (SPRITE_SIZE * 0.6)
-            elif distance < 320:
-                ctx["state"] = "approach"
-                ctx["timer"] = 0.35
-                ctx["target_x"] = p1.x - horiz_dir * (SPRITE_SIZE * 0.5)
-            else:
-                # Even at long range or idle opponents, advance and toss in pressure to avoid stalemates
-                if random.random() < 0.20:
-                    ctx["state"] = "pressure"
-                    ctx["timer"] = 0.5
-                    ctx["target_x"] = p1.x
-                else:
-                    ctx["state"] = "approach"
-                    ctx["timer"] = 0.45
-                    ctx["target_x"] = p1.x
-            ctx["jump_ok"] = True
-            ctx["jump_ok"] = True  # allow one jump per state cycle
-
-        state = ctx["state"]
-        target_x = ctx.get("target_x", p1.x)
-
-        if state == "evade":
-            step = self._ai_path_dir(p2.x, target_x)
-            if step < 0:
-                p2.move_left()
-            elif step > 0:
-                p2.move_right()
-            else:
-                p2.stop()
-            # Jump occasionally to break pressure strings
-            if ctx.get("jump_ok") and ctx.get("jump_cooldown", 0) <= 0 and distance < 150 and random.random() < 0.06:
-                p2.jump()
-                ctx["jump_ok"] = False
-                ctx["jump_cooldown"] = 1.2
-        elif state == "approach":
-            step = self._ai_path_dir(p2.x, target_x)
-            if step < 0:
-                p2.move_left()
-            elif step > 0:
-                p2.move_right()
-            else:
-                p2.stop()
-            if ctx.get("jump_ok") and ctx.get("jump_cooldown", 0) <= 0 and distance > 280 and random.random() < 0.04:
-                p2.jump()
-                ctx["jump_ok"] = False
-                ctx["jump_cooldown"] = 1.2
-        elif state == "pressure":
-            # Keep poking; back out if cornered to avoid endless flinch
-            if ctx["cooldown"] <= 0 and not p2.attack:
-                # Face the player before throwing a poke
-                p2.facing = 1 if p2.x < p1.x else -1
-                p2.start_attack()
-                ctx["cooldown"] = 1.5  # add larger cooldown between AI attacks
-            desired = p1.x  # walk directly toward the player while pressuring
-            step = self._ai_path_dir(p2.x, desired, step=20)
-            if step < 0:
-                p2.move_left()
-            elif step > 0:
-                p2.move_right()
-            else:
-                p2.stop()
-            if cornered and random.random() < 0.2:
-                ctx["state"] = "evade"
-                ctx["timer"] = 0.3
-
-        # If we've been idle too long, push forward and attack
-        if ctx.get("idle", 0.0) > 1.5 and not p2.attack:
-            ctx["state"] = "pressure"
-            ctx["timer"] = 0.4
-            ctx["target_x"] = p1.x
-            ctx["idle"] = 0.0
-            ctx["jump_ok"] = False
-            p2.facing = 1 if p2.x < p1.x else -1
-            p2.start_attack()
-            ctx["cooldown"] = 1.2
-
-        # If we're very close and idle, force a poke to avoid standing still
-        if distance < 150 and ctx["cooldown"] <= 0 and not p2.attack:
-            p2.start_attack()
-            ctx["cooldown"] = 1.4
-
-        # Small think delay to reduce jitter; also acts as a simple state timer
-        if ctx["timer"] <= 0:
-            ctx["timer"] = 0.08
-    # --------------------------------------------------------
-    # HIT DETECTION
-    # --------------------------------------------------------
-    @staticmethod
-    def aabb(a, b):
-        ax, ay, aw, ah = a
-        bx, by, bw, bh = b
-        return not (ax + aw <= bx or bx + bw <= ax or ay + ah <= by or by + bh <= ay)
-
-    def _check_hit(self, attacker, defender):
-        if not attacker.attack:
-            return
-
-        hitbox = attacker.attack_hitbox()
-        if not hitbox:
-            return
-
-        hurtbox = defender.hurtbox()
-
-        if attacker.attack["phase"] == "active" and not attacker.attack["has_hit"] and self.aabb(hitbox, hurtbox):
-            attacker.attack["has_hit"] = True
-            defender.hp = max(0, defender.hp - attacker.attack_cfg["dmg"])
-            self._update_health_bars()
-
-            # -------------------------
-            # Knockback effect!
-            # -------------------------
-            # Direction: push defender away from attacker
-            direction = 1 if defender.x > attacker.x else -1
-            defender.defeat_knock_dir = direction
-
-            # Stronger knockback for more impact
-            defender.knockback_vx = direction * 620 * PHYSICS_SCALE  # increased knockback scaled to sprite size
-
-            # Apply hitstun
-            defender.hitstun = 0.22  # slightly longer hitstun for more pause
-            self._play_random_hit_sfx()
-            defender.on_hit()
-
-            self._update_health_bars()
-
-            if defender.hp <= 0:
-                # Extra knockback on defeat
-                defender.knockback_vx = direction * 1800 * PHYSICS_SCALE
+    def _handle_match_events(self):
+        for event in self.match.events:
+            kind = event[0]
+            if kind == "hit":
+                self._update_health_bars()
+                self._play_random_hit_sfx()
+            elif kind == "ko":
                 self._play_sfx("death")
-                defender.on_defeat()
-                attacker.on_victory()
-                self._end_round("P1" if defender is self.p2 else "P2")
+                self._end_round(event[1])
 
     # --------------------------------------------------------
     # ROUND / MATCH SYSTEM
@@ -2236,47 +2095,20 @@ class FighterGame(Widget):
             Clock.schedule_once(lambda *_: self._hide_banner(), duration)
 
     def _reset_round_data(self):
-        p1_x, p2_x = self._start_positions()
-        self.p1.floor_y = self.floor_y
-        self.p2.floor_y = self.floor_y
-        self.p1.stage_width = self.stage_width
-        self.p2.stage_width = self.stage_width
-        self.p1.x, self.p1.y = p1_x, self.floor_y
-        self.p1.vx = self.p1.vy = 0
-        self.p1.hp = 100
-        self.p1.defeated = False
-        self.p1.victorious = False
-        self.p1.defeat_impact_count = 0
-        self.p1.defeat_landing_event = None
-        self.p1.defeat_knock_dir = 1
-
-        self.p2.x, self.p2.y = p2_x, self.floor_y
-        self.p2.vx = self.p2.vy = 0
-        self.p2.hp = 100
-        self.p2.defeated = False
-        self.p2.victorious = False
-        self.p2.defeat_impact_count = 0
-        self.p2.defeat_landing_event = None
-        self.p2.defeat_knock_dir = -1
-
-        self.p1.attack = None
-        self.p2.attack = None
+        self.match.stage_width = self.stage_width
+        self.match.floor_y = self.floor_y
+        self.match.reset_round()
         self.fx.clear()
-        self.round_timer = 60
-        self._timer_accum = 0.0
+        self._prev_positions = None  # don't interpolate across the round reset teleport
         self._update_health_bars()
         self._render_timer()
         self._render_round_counters()
         self._sync_draw()
 
     def _end_round(self, winner):
+        # Win counters were already bumped by the match when it reported the KO
         self.state = "round_over"
-        if winner == "P1":
-            self.p1_wins += 1
-            winner_fighter = self.p1
-        else:
-            self.p2_wins += 1
-            winner_fighter = self.p2
+        winner_fighter = self.p1 if winner == "P1" else self.p2
 
         self._render_round_counters()
 
@@ -2306,6 +2138,9 @@ class FighterGame(Widget):
         self._layout_touch_ui()
 
     def _end_match(self):
+        self._close_replay(checksum=state_checksum(self.match.snapshot()))
+        self.dump_latency()
+        self.save_habits()
         is_win = self.p1_wins > self.p2_wins
         self.match_result = "win" if is_win else "lose"
         self._stop_music()
@@ -2328,14 +2163,20 @@ class FighterGame(Widget):
 
     def _apply_selection(self):
         player_choice = self.character_options[self.selected_character_index]
-        if len(self.character_options) > 1:
+        if self.versus:
+            opp_idx = self.selected_p2_index % len(self.character_options)
+        elif len(self.character_options) > 1:
             opp_idx = (self.selected_character_index + 1) % len(self.character_options)
         else:
             opp_idx = 0
         opponent_choice = self.character_options[opp_idx]
+        # P2 is the second player's devices in versus, the CPU otherwise
+        self.match.controllers[1] = None if self.versus else self.cpu_controller
 
-        self.p1.reload_sprites(player_choice["loader"]())
-        self.p2.reload_sprites(opponent_choice["loader"]())
+        # New seed before the victory pose picks so a replay's Match.headless draws the same
+        self.match.reseed(self.cosmetic_rng.randrange(1 << 32))
+        self.p1.reload_sprites(player_choice["loader"](), rng=self.match.rng)
+        self.p2.reload_sprites(opponent_choice["loader"](), rng=self.match.rng)
         stage_choice = self.stage_options[self.selected_stage_index]
         self.current_stage_key = stage_choice["key"]
         self._load_stage(self.current_stage_key)
@@ -2344,19 +2185,130 @@ class FighterGame(Widget):
         self.p1_name = player_choice["name"]
         self.p2_name = opponent_choice["name"]
         Window.title = f"2D Fighter — {stage_choice['name']}"
+        self._start_replay_recording(player_choice["key"], opponent_choice["key"])
+
+    def _start_replay_recording(self, p1_key, p2_key):
+        """Stream this match to a keyframed replay when a replay folder is set (fixed-step mode only)."""
+        self._close_replay()
+        # Replays rebuild the decision tree (at a recorded think rate) or replay P2's commands
+        # (versus); the other tiers and threaded thinking (the lookahead one also falls back
+        # on wall-clock budget) could not be re-simulated from them
+        ai = self.match.ai
+        scheduled = isinstance(ai, ScheduledController)
+        tree = ai is None or type(ai.controller if scheduled else ai) is AIController
+        if not self.replay_dir or self.timestep is None or not tree or (scheduled and ai.threaded):
+            return
+        setup = dict(
+            p1=p1_key,
+            p2=p2_key,
+            stage=self.current_stage_key,
+            seed=self.match.seed,
+            tick_rate=self.timestep.tick_rate,
+            stage_width=self.stage_width,
+            p1_ai=self.match.controllers[0] is not None,
+            p2_ai=self.match.controllers[1] is not None,
+            motion_inputs=self.match.motion_inputs,
+            ai_hz=ai.hz if scheduled else None,
+            fixed_point=self.fixed_point,
+        )
+        path = os.path.join(self.replay_dir, time.strftime("match-%Y%m%d-%H%M%S.sfk"))
+        try:
+            os.makedirs(self.replay_dir, exist_ok=True)
+            self.match.recorder = KeyframeRecorder(setup, path, self.match)
+        except OSError:
+            pass
+
+    def _update_debug_overlay(self, dt, period=0.5):
+        """Redraw the latency percentiles, run-ahead cost and AI timing (top-left) every `period` seconds."""
+        self._latency_refresh -= dt
+        if self._latency_refresh > 0:
+            return
+        self._latency_refresh = period
+        lines = self.latency.lines() if self.latency is not None else []
+        if self.run_ahead is not None:
+            budget = self.timestep.dt if self.timestep is not None else 1.0 / 60
+            stats = self.run_ahead.stats(budget)
+            lines.append(
+                f"run-ahead {stats['frames']}: {stats['avg_ms']:.2f} ms/frame "
+                f"(max {stats['max_ms']:.2f}, {stats['budget_pct']:.0f}% of a tick)"
+            )
+        ai = self.match.ai
+        if isinstance(ai, ScheduledController):
+            stats = ai.stats()
+            mode = "thread" if ai.threaded else "inline"
+            lines.append(f"AI {stats['hz']:.0f} Hz ({mode}): {stats['last_ms']:.2f} ms, max {stats['max_ms']:.2f}, late {stats['late']}, errors {stats['errors']}")
+            ai = ai.controller
+        if isinstance(ai, HabitAIController):
+            lines.append(f"habits: {ai.model.observed} ticks seen, {ai.steered} decisions steered")
+        if isinstance(ai, SearchAIController) and ai.decisions:
+            stats = ai.stats()
+            lines.append(
+                f"search AI ms p50/p95/p99 {stats['p50']:.1f}/{stats['p95']:.1f}/{stats['p99']:.1f}  "
+                f"fallbacks {stats['fallbacks']}/{stats['decisions']}"
+            )
+        stats = self.sprite_batch.stats()
+        lines.append(f"sprites: {stats['draw_calls']} draw calls, {stats['vertices']} vertices, {stats['shapes']} shapes")
+        lbl = CoreLabel(text="\n".join(lines), **self._label_kwargs(20))
+        lbl.refresh()
+        tex = lbl.texture
+        if self.latency_rect is None:
+            self.debug_group.add(Color(1, 1, 1, 0.9))
+            self.latency_rect = Rectangle()
+            self.debug_group.add(self.latency_rect)
+        self.latency_rect.texture = tex
+        self.latency_rect.size = tex.size
+        self.latency_rect.pos = (12, self.height * 0.8 - tex.height)
+
+    def dump_latency(self):
+        """Write the latency histograms to `latency_log` (if set); each dump covers the whole session."""
+        if not self.latency_log or self.latency is None or not self.latency.histograms:
+            return
+        try:
+            self.latency.dump(self.latency_log)
+        except OSError:
+            pass
+
+    def save_habits(self):
+        """Write the habit CPU's model of the player to its profile (FIGHTER_AI=habits with a profile folder)."""
+        ai = self.match.ai
+        if isinstance(ai, ScheduledController):
+            ai = ai.controller
+        if not self.habit_dir or not isinstance(ai, HabitAIController):
+            return
+        try:
+            save_profile(ai.model, self.habit_dir, self.player_name)
+        except OSError:
+            pass
+
+    def stop_ai(self):
+        """Stop the CPU's think thread, if it runs on one (controller replaced or app stopping)."""
+        ai = getattr(self, "cpu_controller", None)
+        if isinstance(ai, ScheduledController):
+            ai.close()
+
+    def _close_replay(self, checksum=None):
+        """Finish the streamed replay (index + footer); without a checksum it still plays back."""
+        recorder = self.match.recorder
+        self.match.recorder = None
+        if recorder is None:
+            return
+        try:
+            recorder.close(checksum)
+        except OSError:
+            pass
 
     def _start_match(self):
         self._clear_ui()
-        self.input.reset()
+        self.router.reset()
+        if self.latency is not None:
+            self.latency.drop_pending()
+        self.pad_events.reset()
         self.touch_actions.clear()
-        self._pending_jump = False
-        self._pending_attack = False
+        self._pending_presses = [0, 0]
         self._apply_selection()
         self._build_scene()
         self.state = "round_over"  # temporary gate to block input until intro ends
         self.round = 1
-        self.p1_wins = 0
-        self.p2_wins = 0
         self._reset_round_data()
         stage_name = self.stage_options[self.selected_stage_index]["name"]
         self._queue_round_intro(self.round, stage_name=stage_name)
@@ -2411,6 +2363,8 @@ class FighterGame(Widget):
         elif idx == 2:
             direction = 1 if step > 0 else -1
             self._toggle_control_mode(direction)
+        elif idx == 3:
+            self._set_versus(not self.versus)
         self._render_options()
         self._play_sfx("optionscroll")
 
@@ -2451,87 +2405,63 @@ class FighterGame(Widget):
     # MAIN UPDATE LOOP
     # --------------------------------------------------------
     def update(self, dt):
+        if self.timestep is None:
+            self._tick(dt)
+            self._interp_alpha = 1.0
+        else:
+            for _ in range(self.timestep.advance(dt)):
+                self._tick(self.timestep.dt)
+            self._interp_alpha = self.timestep.alpha
+
+        # Presentation runs once per display frame with the real frame time
+        if self.state == "continue":
+            self._update_continue_timer(dt)
+        self._update_shake(dt)
+        real_positions = self._prev_positions
+        speculating = self._begin_run_ahead(dt)
+        self._layout_bg_cover()
+        self._sync_draw()
+        if speculating:
+            self.run_ahead.end()
+            self._prev_positions = real_positions
+        if self.debug_mode:
+            self._update_debug_overlay(dt)
+
+    def _begin_run_ahead(self, frame_dt):
+        """In a fight with run-ahead on, move the match `run_ahead` ticks ahead for this frame's drawing."""
+        if self.run_ahead is None or self.state != "playing":
+            return False
+        dt = self.timestep.dt if self.timestep is not None else frame_dt
+        self.run_ahead.begin(dt, *self._last_cmds)
+        self._prev_positions = self.run_ahead.prev_positions
+        return True
+
+    def _tick(self, dt):
+        """Advance the simulation by one step of `dt` seconds."""
+        self._prev_positions = (self.p1.x, self.p1.y, self.p2.x, self.p2.y)
+        self._apply_pad_events()
         if self.state != "playing":
-            if self.state == "continue":
-                self._update_continue_timer(dt)
-            self.p1.update(dt, self.gravity)
-            self.p2.update(dt, self.gravity)
+            self.match.step_idle(dt)
             self._handle_defeat_impacts()
-            self._update_shake(dt)
-            self._layout_bg_cover()
-            self._sync_draw()
             return
 
-        # Player input
-        self._apply_input_p1(dt)
-
-        # Enemy AI
-        self._ai_update(dt)
-
-        # Round timer
-        self._timer_accum += dt
-        if self._timer_accum >= 1.0 and self.round_timer > 0:
-            ticks = int(self._timer_accum)
-            self._timer_accum -= ticks
-            self.round_timer = max(0, self.round_timer - ticks)
+        # Player input, AI, round clock, physics and hits run in the headless match
+        prev_timer = self.match.round_timer
+        if self.latency is not None:
+            self.latency.consume()
+        # P2's devices only count when no controller drives it (versus)
+        p2_cmd = self._apply_input(1) if self.match.controllers[1] is None else 0
+        self._last_cmds = (self._apply_input(0), p2_cmd)
+        self.match.step(dt, *self._last_cmds)
+        if self.match.round_timer != prev_timer:
             self._render_timer()
-
-        # Update fighters
-        self.p1.update(dt, self.gravity)
-        self.p2.update(dt, self.gravity)
-
-        # Keep fighters from overlapping
-        self._separate_fighters()
-
-        # Hit detection both ways
-        self._check_hit(self.p1, self.p2)
-        self._check_hit(self.p2, self.p1)
+        self._handle_match_events()
 
         self._handle_defeat_impacts()
-        self._update_shake(dt)
-        self._draw_debug_boxes()
-        self._layout_bg_cover()
-        self._sync_draw()
 
     def _start_positions(self):
         """Place fighters symmetrically 35 px from stage center."""
-        from game_fighter.constants import STAGE_MARGIN
-
-        win_w = self.stage_width
-        scale_ratio = self._compute_sprite_scale() / float(SPRITE_SCALE)
-        eff_size = SPRITE_SIZE * scale_ratio
-        center = win_w * 0.5
-        offset = 260
-        left = max(STAGE_MARGIN, center - offset - eff_size * 0.5)
-        right = min(win_w - eff_size - STAGE_MARGIN, center + offset - eff_size * 0.5)
-        return left, right
-
-    def _separate_fighters(self):
-        """Prevent fighters from occupying the same space by pushing them apart horizontally."""
-        x1, y1, w1, h1 = self.p1.hurtbox()
-        x2, y2, w2, h2 = self.p2.hurtbox()
-
-        # Only resolve if their hurtboxes overlap vertically (likely always on ground)
-        vertical_overlap = not (y1 + h1 <= y2 or y2 + h2 <= y1)
-        if not vertical_overlap:
-            return
-
-        overlap_x = min(x1 + w1, x2 + w2) - max(x1, x2)
-        if overlap_x <= 0:
-            return
-
-        push = overlap_x / 2.0 + 1.0  # small bias prevents re-overlap next frame
-        if x1 <= x2:
-            self.p1.x -= push
-            self.p2.x += push
-        else:
-            self.p1.x += push
-            self.p2.x -= push
-
-        from game_fighter.constants import STAGE_MARGIN
-        max_x = self.stage_width - SPRITE_SIZE - STAGE_MARGIN
-        self.p1.x = max(STAGE_MARGIN, min(max_x, self.p1.x))
-        self.p2.x = max(STAGE_MARGIN, min(max_x, self.p2.x))
+        return start_positions(self.stage_width, self._compute_sprite_scale())
 
     # --------------------------------------------------------
     # CAMERA
@@ -2553,17 +2483,19 @@ class FighterGame(Widget):
         t = self.shake_time / self.shake_duration
         magnitude = self.shake_strength * (t * t)
         self.shake_offset = (
-            random.uniform(-1.0, 1.0) * magnitude,
-            random.uniform(-1.0, 1.0) * magnitude,
+            self.cosmetic_rng.uniform(-1.0, 1.0) * magnitude,
+            self.cosmetic_rng.uniform(-1.0, 1.0) * magnitude,
         )
         if self.shake_time <= 0:
             self.shake_strength = 0.0
             self.shake_duration = 0.0
             self.shake_offset = (0.0, 0.0)
 
-    def _update_camera(self):
+    def _update_camera(self, p1_x=None, p2_x=None):
         if not self.transform_before or not self.transform_after:
             return
+        p1_x = self.p1.x if p1_x is None else p1_x
+        p2_x = self.p2.x if p2_x is None else p2_x
         self.transform_before.clear()
         self.transform_after.clear()
 
@@ -2572,7 +2504,7 @@ class FighterGame(Widget):
         vis_w = (self.width or 1) / scale
         vis_h = (self.height or 1) / scale
 
-        center_x = (self.p1.x + self.p2.x) / 2.0
+        center_x = (p1_x + p2_x) / 2.0
         target_x = center_x - vis_w / 2.0
         target_x = max(0, min(max(0, self.stage_width - vis_w), target_x))
         target_y = 0  # keep floor at bottom
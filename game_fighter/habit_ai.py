@@ -0,0 +1,585 @@
+"""
+Opponent-modeling CPU: learns the other fighter's habits during a match and plays around them.
+
+`HabitModel` watches the opponent every tick and keeps counts per distance bucket
+(time spent there, punches started, jumps toward the CPU, ticks walking back) plus a
+second-order n-gram over the opponent's action symbols (walk toward / away / still,
+combined with jump / punch). An update touches a fixed number of counters, and a row
+is halved when it grows past its cap, so memory is fixed, updates are O(1) amortized
+and old habits fade as new ones are seen.
+
+`HabitAIController` is the decision tree with its state choice biased by the model:
+it pokes from just outside the opponent's usual punch spacing (and steps back out of
+it when a punch is likely), punishes whiffs, and chases an opponent who tends to walk
+back. Until the model has seen enough, and on a share of decisions after that, the
+tree decides.
+
+Habitual jump-ins get an anti-air plan instead of a state. Once per jump, the
+opponent's arc is played forward on a headless twin that steers at us and swings
+where the model says they swing. A fixed set of our answers (a standing punch after
+each delay, a jump and air punch, a step either way) is checked against that arc box
+by box. Answers whose hitbox is active on their hurtbox before theirs reaches ours
+are candidates, earliest first. Each is tried standing, drifting out or drifting in
+once it has hit, alongside the steps out of the landing spot. Those tries are played
+out in a private two-fighter `Match`, with the opponent driven by their modeled
+habits, so pushing, hitstun and their punch resuming after the stun count. The best
+damage trade is played tick by tick. At most `ANTI_AIR_ROLLOUTS` run, and the whole
+plan stays within `ANTI_AIR_BUDGET` seconds; with no time left for a rollout the tree
+handles the jump. Our answers' boxes are simulated once per character, facing and tick
+rate and cached relative to the start position.
+
+The model is observed from fighter state (velocity, take-off, attack start), not from
+command bits, so it works for any opponent. Profiles persist per player as JSON.
+"""
+
+import json
+import os
+import random
+import re
+import time
+from array import array
+
+from game_fighter.ai import AIController, new_ai_context
+from game_fighter.constants import SPRITE_SCALE, SPRITE_SIZE, STAGE_MARGIN
+from game_fighter.fighter import ACTIVE, RECOVERY, STARTUP
+from game_fighter.input_manager import JUMP_PRESSED, LEFT, PUNCH_PRESSED, RIGHT
+from game_fighter.match import GRAVITY, Match, aabb, apply_command
+from game_fighter.search_ai import headless_twin
+
+BUCKET_PX = 48.0
+BUCKETS = 16  # 0 .. 768 px; the last bucket also takes anything further
+TICK_CAP = 1800.0  # ticks per bucket (30 s at 60 Hz) before the bucket is halved
+ROW_CAP = 64.0  # n-gram continuations per context before the row is halved
+READY_TICKS = 300  # observed ticks before the model steers decisions
+HABIT_SHARE = 0.8  # share of decisions the model may steer once ready
+PROFILE_VERSION = 2  # 2 added the air-punch counters; version 1 tables load padded
+POKE_REACH = SPRITE_SIZE * 0.6  # roughly how far our punch reaches, px between origins
+
+# Anti-air answers, in ticks from the plan: standing punch delays, jump delays and
+# take-off-to-punch delays. Their arc is followed until it lands plus `ANTI_AIR_SETTLE`
+# ticks; at most `ANTI_AIR_ROLLOUTS` answers are played out for `ANTI_AIR_TICKS`, within
+# `ANTI_AIR_BUDGET` seconds of CPU
+ANTI_AIR_TICKS = 90
+ANTI_AIR_SETTLE = 8
+ANTI_AIR_ROLLOUTS = 6
+ANTI_AIR_BUDGET = 0.015
+ANTI_AIR_DELAYS = tuple(range(0, 40, 3))
+ANTI_AIR_JUMPS = (0, 4, 8, 12)
+ANTI_AIR_SWINGS = (2, 5, 8, 11, 14)
+
+# Action symbols: walk (0 still, 1 toward, 2 away) * 3 + event (0 none, 1 jump, 2 punch)
+WALKS = ("still", "toward", "away")
+EVENTS = ("none", "jump", "punch")
+SYMBOLS = len(WALKS) * len(EVENTS)
+CONTEXTS = SYMBOLS * SYMBOLS
+
+# Layout of the one flat table (snapshots copy it as bytes)
+_TIME, _PUNCH, _JUMP_IN, _BACK = (i * BUCKETS for i in range(4))
+_NGRAM = 4 * BUCKETS
+_ROWS = _NGRAM + CONTEXTS * SYMBOLS
+# Jump-ins, air punches thrown during them, and the sum of vy / jump_speed at those punches
+_AIR = _ROWS + CONTEXTS
+_SIZE = _AIR + 3
+_SIZE_V1 = _AIR
+
+
+def bucket(distance):
+    return min(BUCKETS - 1, int(distance / BUCKET_PX))
+
+
+class HabitModel:
+    """Incremental habit tables for one opponent (see module docstring)."""
+
+    def __init__(self):
+        self.table = array("d", bytes(8 * _SIZE))
+        self.observed = 0
+        # Last two recorded symbols and the opponent's last-tick airborne/attacking flags
+        self.prev2 = self.prev1 = 0
+        self.last = -1
+        self.was_airborne = False
+        self.was_attacking = False
+        self.jumping_in = False
+
+    # ---------------------------
+    # OBSERVE
+    # ---------------------------
+    def observe(self, me, opponent):
+        """Record one tick of `opponent` as seen by `me`."""
+        t = self.table
+        toward = 1 if me.x > opponent.x else -1
+        b = bucket(abs(me.x - opponent.x))
+        step = opponent.vx * toward
+        walk = 1 if step > 1 else 2 if step < -1 else 0
+        airborne = opponent.y > opponent.floor_y + 0.5
+        attacking = opponent.attack is not None and opponent.attack.phase == STARTUP
+        event = 0
+        if airborne and not self.was_airborne and opponent.vy > 0:
+            event = 1
+            if walk == 1:
+                t[_JUMP_IN + b] += 1
+                self.jumping_in = True
+                t[_AIR] += 1
+                if t[_AIR] > ROW_CAP:
+                    for i in range(_AIR, _AIR + 3):
+                        t[i] *= 0.5
+        elif attacking and not self.was_attacking:
+            event = 2
+            t[_PUNCH + b] += 1
+            if airborne and self.jumping_in and opponent.jump_speed:
+                t[_AIR + 1] += 1
+                t[_AIR + 2] += opponent.vy / opponent.jump_speed
+        if not airborne:
+            self.jumping_in = False
+        if walk == 2:
+            t[_BACK + b] += 1
+        t[_TIME + b] += 1
+        if t[_TIME + b] > TICK_CAP:
+            for offset in (_TIME, _PUNCH, _JUMP_IN, _BACK):
+                t[offset + b] *= 0.5
+        self.was_airborne = airborne
+        self.was_attacking = attacking
+        self.observed += 1
+
+        # n-gram over changes only, so a held walk is one symbol, not one per tick
+        symbol = walk * 3 + event
+        if symbol != self.last or event:
+            context = self.prev2 * SYMBOLS + self.prev1
+            t[_NGRAM + context * SYMBOLS + symbol] += 1
+            t[_ROWS + context] += 1
+            if t[_ROWS + context] > ROW_CAP:
+                start = _NGRAM + context * SYMBOLS
+                for i in range(start, start + SYMBOLS):
+                    t[i] *= 0.5
+                t[_ROWS + context] *= 0.5
+            self.prev2, self.prev1 = self.prev1, symbol
+        self.last = symbol
+
+    # ---------------------------
+    # QUERIES
+    # ---------------------------
+    @property
+    def ready(self):
+        return self.observed >= READY_TICKS
+
+    def _rate(self, offset, distance):
+        b = bucket(distance)
+        time_there = self.table[_TIME + b]
+        return self.table[offset + b] / time_there if time_there else 0.0
+
+    def punch_rate(self, distance):
+        """Punches the opponent starts per tick at this distance."""
+        return self._rate(_PUNCH, distance)
+
+    def jump_in_rate(self, distance):
+        """Jumps toward the CPU per tick at this distance."""
+        return self._rate(_JUMP_IN, distance)
+
+    def back_share(self, distance):
+        """Share of ticks at this distance spent walking away from the CPU."""
+        return self._rate(_BACK, distance)
+
+    def jump_ins(self):
+        """Jumps toward the CPU seen so far (after fading), all distances."""
+        return sum(self.table[_JUMP_IN:_JUMP_IN + BUCKETS])
+
+    def air_punch(self):
+        """vy / jump_speed at which the opponent usually swings during a jump-in; None unless most jump-ins swing."""
+        t = self.table
+        if not t[_AIR + 1] or t[_AIR + 1] * 2 < t[_AIR]:
+            return None
+        return t[_AIR + 2] / t[_AIR + 1]
+
+    def punch_spacing(self):
+        """Distance (bucket middle, px) the opponent punches from most often; None before any punch."""
+        counts = self.table[_PUNCH:_PUNCH + BUCKETS]
+        best = max(range(BUCKETS), key=counts.__getitem__)
+        return (best + 0.5) * BUCKET_PX if counts[best] else None
+
+    def predict(self):
+        """(walk name, event name, probability) most likely to follow the last two symbols; None if unseen."""
+        context = self.prev2 * SYMBOLS + self.prev1
+        total = self.table[_ROWS + context]
+        if not total:
+            return None
+        start = _NGRAM + context * SYMBOLS
+        row = self.table[start:start + SYMBOLS]
+        symbol = max(range(SYMBOLS), key=row.__getitem__)
+        return WALKS[symbol // 3], EVENTS[symbol % 3], row[symbol] / total
+
+    # ---------------------------
+    # SAVE STATES / PROFILES
+    # ---------------------------
+    def snapshot(self):
+        return (self.table.tobytes(), self.observed, self.prev2, self.prev1, self.last, self.was_airborne, self.was_attacking, self.jumping_in)
+
+    def restore(self, snap):
+        table, self.observed, self.prev2, self.prev1, self.last, self.was_airborne, self.was_attacking, self.jumping_in = snap
+        self.table = array("d", table)
+
+    def to_dict(self):
+        return {
+            "version": PROFILE_VERSION,
+            "bucket_px": BUCKET_PX,
+            "observed": self.observed,
+            "table": list(self.table),
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        model = cls()
+        table = data.get("table", [])
+        if data.get("version") == 1 and len(table) == _SIZE_V1:
+            table = table + [0.0] * (_SIZE - _SIZE_V1)
+        elif data.get("version") != PROFILE_VERSION:
+            return model
+        if data.get("bucket_px") == BUCKET_PX and len(table) == _SIZE:
+            model.table = array("d", table)
+            model.observed = int(data.get("observed", 0))
+        return model
+
+
+def profile_path(directory, player):
+    """`directory/<player>.json`, with the name reduced to letters, digits, `-` and `_`."""
+    name = re.sub(r"[^A-Za-z0-9_-]", "_", player) or "player"
+    return os.path.join(directory, f"{name}.json")
+
+
+def load_profile(directory, player):
+    """The saved model for `player`, or a fresh one when there is none (or it cannot be read)."""
+    try:
+        with open(profile_path(directory, player), "r", encoding="utf-8") as f:
+            return HabitModel.from_dict(json.load(f))
+    except (OSError, ValueError):
+        return HabitModel()
+
+
+def save_profile(model, directory, player):
+    os.makedirs(directory, exist_ok=True)
+    with open(profile_path(directory, player), "w", encoding="utf-8") as f:
+        json.dump(model.to_dict(), f)
+
+
+def new_habit_context():
+    """The tree's context plus the anti-air plan (see `_plan_bits`) or None, its tick, whether it has hit, and whether this jump may still get one."""
+    ctx = new_ai_context()
+    ctx.update(anti_air=None, anti_air_tick=0, anti_air_landed=False, anti_air_armed=True)
+    return ctx
+
+
+def _airborne(fighter):
+    return fighter.y > fighter.floor_y + 0.5
+
+
+def _has_hit(fighter):
+    # A `CommandCapture` reads `attack` as True on the tick it starts one
+    return getattr(fighter.attack, "has_hit", False)
+
+
+def _plan_bits(plan, tick, landed):
+    """Command bits of an anti-air plan (jump tick, punch tick, walk bits, walk once it has hit, end tick) at `tick`."""
+    jump_at, punch_at, walk, after, _ = plan
+    return (after if landed else walk) | (JUMP_PRESSED if tick == jump_at else 0) | (PUNCH_PRESSED if tick == punch_at else 0)
+
+
+def _answer_key(fighter, facing, rate):
+    """Everything an answer's boxes depend on besides the start position; `rate` is ticks per second, rounded."""
+    return (fighter.sprite.sheets["idle"]["path"], fighter.render_scale, fighter.move_speed, fighter.jump_speed,
+            tuple(sorted(fighter.attack_cfg.items())), getattr(fighter, "tick_rate", None), facing, rate)
+
+
+def _anti_air_answers(toward):
+    """(jump tick, punch tick, walk bits) per answer, cheapest first; None = never."""
+    walk_in = RIGHT if toward > 0 else LEFT
+    walk_out = LEFT if toward > 0 else RIGHT
+    answers = [(None, delay, 0) for delay in ANTI_AIR_DELAYS]
+    answers += [(jump, jump + swing, 0) for jump in ANTI_AIR_JUMPS for swing in ANTI_AIR_SWINGS]
+    answers += [(None, None, walk_out), (None, None, 0), (None, None, walk_in)]
+    return answers
+
+
+def _duel(ours, theirs, x0, y0, lo, hi):
+    """("win" | "lose", tick) for the first hit between an answer and their arc, else ("clear", ticks)."""
+    for tick, ((dx, dy, hurt, hit), (their_hurt, their_hit)) in enumerate(zip(ours, theirs)):
+        x = min(hi, max(lo, x0 + dx))
+        y = y0 + dy
+        our_hurt = (x + hurt[0], y + hurt[1], hurt[2], hurt[3])
+        if aabb(their_hurt, our_hurt):
+            # Hurtboxes are the pushboxes: someone walking into us stays pressed against us
+            tx, ty, tw, th = their_hurt
+            if tx + tw * 0.5 < our_hurt[0] + our_hurt[2] * 0.5:
+                shift = our_hurt[0] - (tx + tw)
+            else:
+                shift = our_hurt[0] + our_hurt[2] - tx
+            their_hurt = (tx + shift, ty, tw, th)
+            if their_hit is not None:
+                their_hit = (their_hit[0] + shift, their_hit[1], their_hit[2], their_hit[3])
+        # They act first on a tie (and as P1 win it), so their hit is checked first
+        if their_hit is not None and aabb(their_hit, our_hurt):
+            return "lose", tick
+        if hit is not None and aabb((x + hit[0], y + hit[1], hit[2], hit[3]), their_hurt):
+            return "win", tick
+    return "clear", len(theirs)
+
+
+class HabitAIController(AIController):
+    """Decision tree steered by a `HabitModel` of the opponent (see module docstring)."""
+
+    def __init__(self, rng=None, model=None, share=HABIT_SHARE, gravity=GRAVITY, budget=ANTI_AIR_BUDGET, clock=time.perf_counter):
+        super().__init__(rng)
+        self.ctx = new_habit_context()
+        self.model = model if model is not None else HabitModel()
+        self.share = share
+        self.gravity = gravity
+        self.budget = budget
+        self.clock = clock
+        self.steered = 0
+        self.anti_airs = 0
+        # Derived caches, rebuilt on demand (not part of snapshots)
+        self._answers = {}  # _answer_key -> {answer: [(dx, dy, hurtbox, hitbox or None) per tick]}
+        self._sim = None
+        self._sim_key = None
+        # Slowest rollout of the last plan; until one is timed, assume each takes its share
+        self._rollout_s = budget / ANTI_AIR_ROLLOUTS
+
+    def reset(self):
+        self.ctx = new_habit_context()
+
+    def snapshot(self):
+        return (super().snapshot(), self.model.snapshot())
+
+    def restore(self, snap):
+        tree_snap, model_snap = snap
+        super().restore(tree_snap)
+        self.model.restore(model_snap)
+
+    def update(self, dt, me, opponent, stage_width):
+        self.model.observe(me, opponent)
+        ctx = self.ctx
+        if not _airborne(opponent):
+            ctx["anti_air_armed"] = True
+        elif ctx["anti_air"] is None and ctx["anti_air_armed"] and self._jump_in_coming(me, opponent):
+            ctx["anti_air_armed"] = False
+            ctx["anti_air"] = self._plan_anti_air(dt, me, opponent, stage_width)
+            ctx["anti_air_tick"] = 0
+            ctx["anti_air_landed"] = False
+            if ctx["anti_air"] is not None:
+                self.anti_airs += 1
+                self.steered += 1
+        plan = ctx["anti_air"]
+        if plan is not None:
+            tick = ctx["anti_air_tick"]
+            if tick < plan[-1] and me.hitstun <= 0 and not me.defeated and not me.victorious:
+                ctx["anti_air_landed"] = ctx["anti_air_landed"] or _has_hit(me)
+                apply_command(me, _plan_bits(plan, tick, ctx["anti_air_landed"]))
+                ctx["anti_air_tick"] = tick + 1
+                return
+            ctx.update(anti_air=None, timer=0.0)
+        super().update(dt, me, opponent, stage_width)
+
+    # ---------------------------
+    # ANTI-AIR
+    # ---------------------------
+    def _jump_in_coming(self, me, opponent):
+        """A habitual jumper is in the air heading our way, and we are free to answer."""
+        model = self.model
+        toward = 1 if me.x > opponent.x else -1
+        return (model.ready and model.jump_ins() > 1 and opponent.vx * toward > 1 and opponent.hitstun <= 0
+                and not _airborne(me) and me.attack is None and me.hitstun <= 0 and not me.defeated and not me.victorious)
+
+    def _planner(self, me, opponent, stage_width):
+        """Private headless match with twins of both fighters (opponent = P1, so ties go as live), rebuilt when sprites change."""
+        key = (opponent.sprite.sheets["idle"]["path"], me.sprite.sheets["idle"]["path"], stage_width)
+        if self._sim is None or self._sim_key != key:
+            rng = random.Random(0)
+            self._sim = Match(headless_twin(opponent, stage_width, rng), headless_twin(me, stage_width, rng), stage_width, me.floor_y, gravity=self.gravity, controllers=[None, None], rng=rng)
+            self._sim.motion_inputs = False
+            self._sim_key = key
+        sim = self._sim
+        for twin, live in ((sim.p1, opponent), (sim.p2, me)):
+            twin.floor_y = live.floor_y
+            twin.render_scale = live.render_scale
+            twin.restore(live.snapshot())
+        sim.floor_y = me.floor_y
+        return sim
+
+    def _habit_bits(self, them, target_x, swing_vy):
+        """
+        What the model expects the opponent to press this tick with us at `target_x`: in
+        the air, steer at us and swing once vy falls to `swing_vy` (None: never swing); on
+        the ground, jump in from where they jump in, back off where they back off, else
+        walk in.
+        """
+        toward, away = (RIGHT, LEFT) if target_x > them.x else (LEFT, RIGHT)
+        if _airborne(them):
+            if swing_vy is not None and them.attack is None and them.vy <= swing_vy:
+                return toward | PUNCH_PRESSED
+            return toward
+        model = self.model
+        distance = abs(target_x - them.x)
+        if model.jump_in_rate(distance) * 60 > 0.3:
+            return toward | JUMP_PRESSED
+        if model.back_share(distance) > 0.4:
+            return away
+        return toward
+
+    def _their_arc(self, dt, twin, target_x, swing_vy):
+        """
+        Play `twin` alone steering toward `target_x` and swinging whenever it is free in
+        the air with vy at or below `swing_vy` (None: never), until it lands plus
+        `ANTI_AIR_SETTLE` ticks. Returns [(hurtbox, active hitbox or None)] per tick.
+        """
+        arc = []
+        settle = ANTI_AIR_SETTLE
+        while len(arc) < ANTI_AIR_TICKS and settle:
+            apply_command(twin, self._habit_bits(twin, target_x, swing_vy))
+            twin.update(dt, self.gravity)
+            a = twin.attack
+            arc.append((twin.hurtbox(), twin.attack_hitbox() if a is not None and a.phase is ACTIVE else None))
+            if not _airborne(twin):
+                settle -= 1
+        return arc
+
+    def _play_out(self, dt, sim, plan, swing_vy):
+        """Run `plan` in the planner (then stand) until things settle; damage dealt minus taken."""
+        them, me = sim.p1, sim.p2
+        them_hp, me_hp = them.hp, me.hp
+        end = plan[-1]
+        landed = False
+        for tick in range(ANTI_AIR_TICKS):
+            landed = landed or _has_hit(me)
+            sim.step(dt, self._habit_bits(them, me.x, swing_vy), _plan_bits(plan, tick, landed) if tick < end else 0)
+            if me.defeated or them.defeated:
+                break
+        return (them_hp - them.hp) - (me_hp - me.hp)
+
+    def _our_answers(self, dt, me, toward):
+        """
+        Boxes of every anti-air answer relative to the start position, cached per
+        `_answer_key`. The tick length is rounded to a whole rate, so a variable timestep
+        shares one entry per rate. A punch or jump after a delay is the answer without
+        delay behind that many ticks of standing still, so only the distinct shapes are
+        simulated.
+        """
+        rate = max(1, round(1.0 / dt))
+        key = _answer_key(me, toward, rate)
+        answers = self._answers.get(key)
+        if answers is not None:
+            return answers
+        answers = self._answers[key] = {}
+        # A stage wide enough that the walls never clamp; `_duel` clamps to the real one.
+        # The twin's own stream keeps the fill off the match's gameplay RNG
+        origin = 100000.0
+        twin = headless_twin(me, 2 * origin, random.Random(0))
+        step = 1.0 / rate
+        shapes = {}
+        still = self._answer_track(step, twin, origin, me.floor_y, toward, None, None, 0)
+        for answer in _anti_air_answers(toward):
+            jump_at, punch_at, walk = answer
+            if punch_at is None:
+                track = still if not walk else self._answer_track(step, twin, origin, me.floor_y, toward, None, None, walk)
+            else:
+                delay = punch_at if jump_at is None else jump_at
+                shape = (None if jump_at is None else 0, punch_at - delay)
+                base = shapes.get(shape)
+                if base is None:
+                    base = shapes[shape] = self._answer_track(step, twin, origin, me.floor_y, toward, shape[0], shape[1], 0)
+                track = still[:delay] + base[:ANTI_AIR_TICKS - delay]
+            answers[answer] = track
+        return answers
+
+    def _answer_track(self, dt, twin, origin, floor_y, toward, jump_at, punch_at, walk):
+        """[(dx, dy, hurtbox, hitbox or None)] per tick of one answer played by `twin` from idle at `origin`."""
+        twin.x, twin.y, twin.vx, twin.vy = origin, floor_y, 0.0, 0.0
+        twin.attack = None
+        twin.facing = toward
+        twin.sprite.play("idle", loop=True, restart=True)
+        track = []
+        for tick in range(ANTI_AIR_TICKS):
+            apply_command(twin, walk | (JUMP_PRESSED if tick == jump_at else 0) | (PUNCH_PRESSED if tick == punch_at else 0))
+            twin.update(dt, self.gravity)
+            x, y = twin.x, twin.y
+            hx, hy, hw, hh = twin.hurtbox()
+            a = twin.attack
+            hit = None
+            if a is not None and a.phase is ACTIVE:
+                bx, by, bw, bh = twin.attack_hitbox()
+                hit = (bx - x, by - y, bw, bh)
+            track.append((x - origin, y - floor_y, (hx - x, hy - y, hw, hh), hit))
+        return track
+
+    def _plan_anti_air(self, dt, me, opponent, stage_width):
+        """An anti-air plan (see `_plan_bits`) for this jump, or None to leave it to the tree."""
+        start = self.clock()
+        toward = 1 if opponent.x > me.x else -1
+        me.facing = toward
+        sim = self._planner(me, opponent, stage_width)
+        them_snap, me_snap = sim.p1.snapshot(), sim.p2.snapshot()
+        swing = self.model.air_punch()
+        swing_vy = None if swing is None else swing * opponent.jump_speed
+        arc = self._their_arc(dt, sim.p1, me.x, swing_vy)
+        lo = STAGE_MARGIN
+        hi = stage_width - SPRITE_SIZE * (me.render_scale / float(SPRITE_SCALE)) - STAGE_MARGIN
+        answers = self._our_answers(dt, me, toward)
+        # Screen every answer on boxes alone, then play the earliest hits (each followed by
+        # standing, drifting out or drifting in) and the steps out of the landing spot
+        # against them in the planner, where pushing, hitstun and their punch resuming
+        # after the stun are all real
+        wins = []
+        for order, (answer, track) in enumerate(answers.items()):
+            outcome, tick = _duel(track, arc, me.x, me.y, lo, hi)
+            if outcome == "win":
+                # Hold the plan until we are back on the ground and they have landed
+                landing = next((t for t in range(tick, len(track)) if track[t][1] <= 0.5), len(track))
+                wins.append((tick, order, answer, max(landing + 1, len(arc))))
+        wins.sort()
+        walk_in, walk_out = (RIGHT, LEFT) if toward > 0 else (LEFT, RIGHT)
+        tries = [answer + (after, end) for _, _, answer, end in wins for after in (0, walk_out, walk_in)]
+        tries += [answer + (answer[2], len(arc)) for answer in answers if answer[1] is None and answer[2]]
+        # The whole plan, cache fill included, stays inside the budget: a rollout only
+        # starts when the slowest one so far (this plan or the last) still fits
+        deadline = start + self.budget
+        best, best_score = None, None
+        cost = self._rollout_s
+        slowest = 0.0
+        for plan in tries[:ANTI_AIR_ROLLOUTS]:
+            began = self.clock()
+            if began + cost > deadline:
+                break
+            sim.p1.restore(them_snap)
+            sim.p2.restore(me_snap)
+            score = self._play_out(dt, sim, plan, swing_vy)
+            slowest = max(slowest, self.clock() - began)
+            cost = max(cost, slowest)
+            if best_score is None or score > best_score:
+                best, best_score = plan, score
+        if slowest:
+            self._rollout_s = slowest
+        return best
+
+    def _choose_state(self, opponent, stage_width, distance, horiz_dir, cornered, player_attacking):
+        model = self.model
+        if cornered or not model.ready or self.rng.random() >= self.share:
+            super()._choose_state(opponent, stage_width, distance, horiz_dir, cornered, player_attacking)
+            return
+        ctx = self.ctx
+        spacing = model.punch_spacing()
+        predicted = model.predict()
+        if distance < POKE_REACH and opponent.attack is not None and opponent.attack.phase == RECOVERY:
+            # A whiffed punch: hit back before it recovers
+            ctx.update(state="pressure", timer=0.25, target_x=opponent.x, cooldown=0.0)
+        elif spacing is not None and spacing + BUCKET_PX < distance < POKE_REACH:
+            # Inside our reach but outside the distance they punch from: poke first
+            ctx.update(state="pressure", timer=0.25, target_x=opponent.x, cooldown=0.0)
+        elif spacing is not None and distance <= spacing + BUCKET_PX and (model.punch_rate(distance) * 60 > 0.5 or (predicted and predicted[1] == "punch")):
+            # Step back out of the distance they like to punch from
+            ctx.update(state="evade", timer=0.2, target_x=opponent.x - horiz_dir * (spacing + 2 * BUCKET_PX))
+        elif model.jump_in_rate(distance) * 60 > 0.3:
+            # They jump in from here: get inside their take-off distance
+            ctx.update(state="pressure", timer=0.3, target_x=opponent.x)
+        elif model.back_share(distance) > 0.4 or (predicted is not None and predicted[0] == "away" and predicted[2] > 0.5):
+            # They walk back from here: chase
+            ctx.update(state="pressure", timer=0.45, target_x=opponent.x)
+        else:
+            super()._choose_state(opponent, stage_width, distance, horiz_dir, cornered, player_attacking)
+            return
+        self.steered += 1
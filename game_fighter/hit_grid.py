@@ -0,0 +1,61 @@
+"""
+Uniform-grid hit testing for screen-space buttons.
+
+UI rectangles (touch controls, menu buttons) are bucketed once, when the layout is
+built, into the square cells they overlap. A point query then only looks at the few
+rectangles registered in its own cell, so hit-testing a touch costs about the same
+however many buttons are on screen. Kivy-free; `game_widget.py` rebuilds its grids
+from `_layout_touch_ui` and the menu renderers.
+"""
+
+import math
+
+HIT_CELL = 128.0  # px; about one menu button
+
+
+class HitGrid:
+    """Rectangles keyed by any hashable; `hits(x, y)` returns the keys under a point in insertion order."""
+
+    def __init__(self, cell=HIT_CELL):
+        self.cell = float(cell)
+        # (column, row) -> [(x0, y0, x1, y1, key)] in insertion order
+        self.cells = {}
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def clear(self, cell=None):
+        """Drop every rectangle; optionally switch cell size for the next layout."""
+        if cell is not None:
+            self.cell = float(cell)
+        self.cells.clear()
+        self.count = 0
+
+    def add(self, key, rect, pad=0.0):
+        """Register `rect` (x, y, w, h), grown by `pad` on every side; edges count as inside."""
+        x, y, w, h = rect
+        x0, y0, x1, y1 = x - pad, y - pad, x + w + pad, y + h + pad
+        entry = (x0, y0, x1, y1, key)
+        cell = self.cell
+        for col in range(math.floor(x0 / cell), math.floor(x1 / cell) + 1):
+            for row in range(math.floor(y0 / cell), math.floor(y1 / cell) + 1):
+                self.cells.setdefault((col, row), []).append(entry)
+        self.count += 1
+
+    def hits(self, x, y):
+        cell = self.cell
+        bucket = self.cells.get((math.floor(x / cell), math.floor(y / cell)))
+        if not bucket:
+            return []
+        return [key for x0, y0, x1, y1, key in bucket if x0 <= x <= x1 and y0 <= y <= y1]
+
+    def first(self, x, y, default=None):
+        """Key of the earliest-added rectangle under the point, else `default`."""
+        cell = self.cell
+        bucket = self.cells.get((math.floor(x / cell), math.floor(y / cell)))
+        if bucket:
+            for x0, y0, x1, y1, key in bucket:
+                if x0 <= x <= x1 and y0 <= y <= y1:
+                    return key
+        return default
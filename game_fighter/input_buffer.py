@@ -0,0 +1,160 @@
+"""
+Per-tick input history and motion-command matching.
+
+`InputBuffer` keeps the last `size` command bytes of one player (the bits from
+`input_manager`, one byte per simulation tick) in a fixed ring, the same per-tick
+representation replays and netplay already carry.
+
+`MotionMatcher` recognizes a motion command written in numpad notation relative to
+the fighter's facing ("236P": down, down-forward, forward, punch). The motion is
+compiled once into a transition table over tick symbols (direction x punch press), so
+matching costs one table lookup per tick however long the motion is. The whole motion
+must be entered within `window` seconds, which keeps it tick-rate independent.
+"""
+
+from array import array
+
+from game_fighter.input_manager import DOWN, LEFT, PUNCH_PRESSED, RIGHT, UP
+
+INPUT_BUFFER_SIZE = 32
+# Quarter-circle forward + punch, and how long the whole motion may take
+FIREBALL = "236P"
+MOTION_WINDOW = 0.3
+
+DIRECTIONS = 9  # numpad 1..9, 5 = neutral
+SYMBOLS = DIRECTIONS * 2  # direction, with or without a punch press this tick
+_MATCH = -1
+
+
+def _numpad(cmd, facing):
+    """Numpad direction (1..9) of a command relative to facing (6 = forward)."""
+    h = (1 if cmd & RIGHT else 0) - (1 if cmd & LEFT else 0)
+    v = (1 if cmd & UP else 0) - (1 if cmd & DOWN else 0)
+    return 5 + h * facing + 3 * v
+
+
+def _symbol_table(facing):
+    return bytes((_numpad(cmd, facing) - 1) + (DIRECTIONS if cmd & PUNCH_PRESSED else 0) for cmd in range(128))
+
+
+# Tick symbol by command (7 bits), for a fighter facing right / left
+SYMBOLS_FACING_RIGHT = _symbol_table(1)
+SYMBOLS_FACING_LEFT = _symbol_table(-1)
+
+
+def tick_symbol(cmd, facing):
+    return (SYMBOLS_FACING_RIGHT if facing == 1 else SYMBOLS_FACING_LEFT)[cmd & 0x7F]
+
+
+def compile_motion(notation):
+    """
+    Transition table for a motion like "236P" or "656": entry `state * SYMBOLS + symbol`
+    is the next state, or -1 when the motion completes on that tick.
+
+    State `s` means the first `s` directions are done. Holding the last direction keeps
+    the state; any other direction restarts the motion (at step 1 if it is its first
+    direction). A trailing "P" waits for a punch press, in any direction, once the
+    directions are done; the press may land on the same tick as the last direction.
+    """
+    button = notation.endswith("P")
+    dirs = [int(c) for c in notation.rstrip("P")]
+    if not dirs or any(not 1 <= d <= 9 for d in dirs):
+        raise ValueError(f"bad motion notation {notation!r}")
+    n = len(dirs)
+    table = array("b")
+    for state in range(n + 1):
+        for symbol in range(SYMBOLS):
+            d = symbol % DIRECTIONS + 1
+            pressed = symbol >= DIRECTIONS
+            if state == n:
+                # Only reached with a button still to press
+                nxt = _MATCH if pressed else n
+            elif d == dirs[state]:
+                nxt = state + 1
+                if nxt == n and (pressed or not button):
+                    nxt = _MATCH
+            elif state > 0 and d == dirs[state - 1]:
+                nxt = state
+            else:
+                nxt = 1 if d == dirs[0] else 0
+                if nxt == n and (pressed or not button):
+                    nxt = _MATCH
+            table.append(nxt)
+    return table
+
+
+class MotionMatcher:
+    """Feed one tick symbol per simulation tick to `step`; it returns True on the tick the motion completes."""
+
+    def __init__(self, notation=FIREBALL, window=MOTION_WINDOW):
+        self.notation = notation
+        self.window = window
+        self.table = compile_motion(notation)
+        self.state = 0
+        self.elapsed = 0.0
+
+    def reset(self):
+        self.state = 0
+        self.elapsed = 0.0
+
+    def step(self, symbol, dt):
+        state = self.state
+        if state:
+            self.elapsed += dt
+            if self.elapsed > self.window:
+                state = 0
+        nxt = self.table[state * SYMBOLS + symbol]
+        if nxt < 0:
+            self.state = 0
+            return True
+        if state == 0:
+            self.elapsed = 0.0
+        self.state = nxt
+        return False
+
+    def snapshot(self):
+        return (self.state, self.elapsed)
+
+    def restore(self, snap):
+        self.state, self.elapsed = snap
+
+
+class InputBuffer:
+    """Ring of the last `size` command bytes; `frame(0)` is the newest tick."""
+
+    def __init__(self, size=INPUT_BUFFER_SIZE):
+        self.size = size
+        self.frames = bytearray(size)
+        self.head = 0  # slot the next tick is written to
+        self.count = 0  # ticks pushed, capped at `size`
+
+    def __len__(self):
+        return self.count
+
+    def clear(self):
+        self.head = 0
+        self.count = 0
+
+    def push(self, cmd):
+        self.frames[self.head] = cmd & 0x7F
+        self.head = (self.head + 1) % self.size
+        if self.count < self.size:
+            self.count += 1
+
+    def frame(self, ago=0):
+        """Command bits from `ago` ticks back; 0 before the first recorded tick."""
+        if ago >= self.count:
+            return 0
+        return self.frames[(self.head - 1 - ago) % self.size]
+
+    def pressed_within(self, bit, ticks):
+        """Was `bit` set in any of the last `ticks` ticks? (press buffering)"""
+        frames, size, head = self.frames, self.size, self.head
+        return any(frames[(head - 1 - i) % size] & bit for i in range(min(ticks, self.count)))
+
+    def snapshot(self):
+        return (bytes(self.frames), self.head, self.count)
+
+    def restore(self, snap):
+        frames, self.head, self.count = snap
+        self.frames[:] = frames
@@ -1,3 +1,15 @@
+# Per-tick command bits consumed by the simulation (held actions + one-shot presses)
+LEFT = 1 << 0
+RIGHT = 1 << 1
+UP = 1 << 2
+DOWN = 1 << 3
+PUNCH = 1 << 4
+JUMP_PRESSED = 1 << 5
+PUNCH_PRESSED = 1 << 6
+
+ACTION_BITS = {"left": LEFT, "right": RIGHT, "up": UP, "down": DOWN, "punch": PUNCH}
+
+
 class InputManager:
     """Track input actions coming from multiple sources (keyboard, touch, controller)."""
 
@@ -6,6 +18,8 @@ class InputManager:
     def __init__(self):
         self.state = {action: False for action in self.ACTIONS}
         self._sources = {action: set() for action in self.ACTIONS}
+        # Held bits of actions that went active since the last `tick_mask`
+        self._latched = 0
 
     def set(self, action, value, source="default"):
         """
@@ -23,7 +37,10 @@ class InputManager:
             self._sources[action].discard(source)
 
         self.state[action] = bool(self._sources[action])
-        return not was_active and self.state[action]
+        if self.state[action] and not was_active:
+            self._latched |= ACTION_BITS[action]
+            return True
+        return False
 
     def clear_source(self, source):
         """Remove all actions coming from a given source (e.g., when a touch ends)."""
@@ -31,9 +48,160 @@ class InputManager:
             self._sources[action].discard(source)
             self.state[action] = bool(self._sources[action])
 
+    def clear_sources(self, owned):
+        """Remove every source for which `owned(source)` is true (e.g., all of one gamepad's controls)."""
+        for action in self.ACTIONS:
+            sources = self._sources[action]
+            for source in [s for s in sources if owned(s)]:
+                sources.discard(source)
+            self.state[action] = bool(sources)
+
     def reset(self):
         self.state = {action: False for action in self.ACTIONS}
         self._sources = {action: set() for action in self.ACTIONS}
+        self._latched = 0
 
     def get(self, action):
         return self.state.get(action, False)
+
+    def held_mask(self):
+        """Pack the currently held actions into command bits."""
+        mask = 0
+        for action, bit in ACTION_BITS.items():
+            if self.state[action]:
+                mask |= bit
+        return mask
+
+    def tick_mask(self):
+        """
+        Command bits for one simulation tick: held actions plus any action that went
+        active since the previous call, so a tap released between two ticks (a
+        quarter-circle's diagonal at a low tick rate) still reaches the simulation.
+        """
+        mask = self.held_mask() | self._latched
+        self._latched = 0
+        return mask
+
+
+
+# Joystick thresholds, as fractions of full deflection
+AXIS_DEADZONE = 0.35  # stick x: walk
+AXIS_JUMP = 0.55  # stick y (up): jump
+AXIS_MAX = 32767.0  # Kivy reports raw SDL axis values (-32768..32767)
+
+# Actions each joystick control drives; hats also steer menus
+AXIS_CONTROLS = {0: ("left", "right"), 1: ("up",)}
+HAT_CONTROLS = ("left", "right", "up", "down")
+# Control kinds in a stick control's key, (stickid, kind, index), which is also its input source
+AXIS = 0
+HAT = 1
+
+
+def axis_actions(axisid, value):
+    """Actions one stick report holds (axis 0 walks, axis 1 up jumps)."""
+    value /= AXIS_MAX
+    if axisid == 0:
+        if value < -AXIS_DEADZONE:
+            return ("left",)
+        if value > AXIS_DEADZONE:
+            return ("right",)
+    elif axisid == 1 and value < -AXIS_JUMP:
+        return ("up",)
+    return ()
+
+
+def hat_actions(value):
+    x, y = value
+    return tuple(a for a, on in (("left", x < 0), ("right", x > 0), ("up", y > 0), ("down", y < 0)) if on)
+
+
+class PadEvents:
+    """
+    Buffer raw joystick axis/hat reports and resolve them once per tick.
+
+    Each stick axis or hat only records its latest report and the actions any report
+    held since the last `resolve`, so a stick streaming hundreds of reports a second
+    costs a dict update per report, and the input state changes at most once per
+    action per tick. A direction pushed and let go between two ticks still comes out
+    as a press followed by a release, so jumps stay edge-triggered.
+
+    Controls are keyed by `(stickid, AXIS or HAT, index)` tuples, which double as their
+    input source, so no per-report string is built.
+    """
+
+    def __init__(self):
+        # (stickid, kind, index) -> [latest actions, actions seen this tick, controls, steers menu]
+        self._pending = {}
+        # Actions each control held after the last resolve
+        self._held = {}
+        self.events = 0  # reports since the last resolve
+        self.last_tick_events = 0
+        self.max_tick_events = 0
+        self.total_events = 0
+        self.ticks = 0
+
+    def axis(self, stickid, axisid, value):
+        self.events += 1
+        controls = AXIS_CONTROLS.get(axisid)
+        if controls is not None:
+            self._report((stickid, AXIS, axisid), axis_actions(axisid, value), controls, False)
+
+    def hat(self, stickid, hatid, value):
+        self.events += 1
+        self._report((stickid, HAT, hatid), hat_actions(value), HAT_CONTROLS, True)
+
+    def _report(self, key, actions, controls, menu):
+        entry = self._pending.get(key)
+        if entry is None:
+            self._pending[key] = [actions, set(actions), controls, menu]
+        else:
+            entry[0] = actions
+            entry[1].update(actions)
+
+    def reset(self):
+        """Forget buffered reports and held directions (the input state was reset)."""
+        self._pending.clear()
+        self._held.clear()
+        self.events = 0
+
+    def forget(self, stickid):
+        """Forget one stick's buffered reports and held directions (it changed player)."""
+        for table in (self._pending, self._held):
+            for key in [k for k in table if k[0] == stickid]:
+                del table[key]
+
+    def resolve(self):
+        """
+        Close the tick and return its transitions as (source, action, held, steers_menu)
+        tuples, `source` being the control's key (its stickid first): only actions whose
+        state changed, plus a press/release pair for each tap. Also updates the per-tick
+        event stats.
+        """
+        transitions = []
+        for source, (latest, seen, controls, menu) in self._pending.items():
+            before = self._held.get(source, ())
+            for action in controls:
+                was, now = action in before, action in latest
+                if now and not was:
+                    transitions.append((source, action, True, menu))
+                elif was and not now:
+                    transitions.append((source, action, False, menu))
+                elif not now and action in seen:
+                    transitions.append((source, action, True, menu))
+                    transitions.append((source, action, False, menu))
+            self._held[source] = latest
+        self._pending.clear()
+        self.last_tick_events = self.events
+        self.max_tick_events = max(self.max_tick_events, self.events)
+        self.total_events += self.events
+        self.ticks += 1
+        self.events = 0
+        return transitions
+
+    def stats(self):
+        """Reports per tick for debugging: the last tick, the busiest one, and the average."""
+        return {
+            "last": self.last_tick_events,
+            "max": self.max_tick_events,
+            "avg": self.total_events / self.ticks if self.ticks else 0.0,
+        }
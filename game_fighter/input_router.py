@@ -0,0 +1,119 @@
+"""
+Per-device input routing for local versus: which player each keyboard key, gamepad and touch drives.
+
+Each player has an `InputManager`. `InputRouter` resolves an input event to its player
+with one dict lookup:
+- `keys` maps a keycode to `(player, action)`. It is compiled from the bindings when
+  the mode changes: in single-player mode every gameplay key drives P1; in versus the
+  keyboard is split, `keys_p2` driving P2 and the rest of `keys` P1.
+- `pads` maps a stickid to its `PadSlot`. Kivy reports no device arrival, so a stick
+  seen for the first time is plugged there and then (hot-plug): it goes to the human
+  player with the fewest pads. `reassign` moves a pad to the other side (the versus
+  character select's "swap" button). Kivy reports no removal either, so a slot is never
+  dropped: SDL sends a pulled pad's button and stick releases before it goes, and
+  `release_pads` lets go of what pads hold when those events may be lost (the window
+  losing focus).
+- Touches drive `touch_player` (P1).
+
+Sources handed to the managers are never formatted strings: a pad's buttons use its
+`PadSlot`, its sticks and hats the `PadEvents` key `(stickid, kind, index)`, touches their
+uid and the keyboard `KEYBOARD`.
+"""
+
+from game_fighter.input_manager import InputManager
+
+KEYBOARD = "keyboard"
+
+
+class PadSlot:
+    """One gamepad's routing entry; also the input source of its buttons."""
+
+    __slots__ = ("stickid", "player")
+
+    def __init__(self, stickid, player):
+        self.stickid = stickid
+        self.player = player
+
+
+class InputRouter:
+    """Device-to-player routing table over one `InputManager` per player (see module docstring)."""
+
+    def __init__(self, bindings, players=2):
+        self.bindings = bindings
+        self.inputs = tuple(InputManager() for _ in range(players))
+        self.pads = {}  # stickid -> PadSlot
+        self.touch_player = 0
+        self.versus = False
+        self.plugs = 0  # pads plugged since start
+        self.compile()
+
+    @property
+    def humans(self):
+        """Players driven by devices: both in versus, P1 alone otherwise."""
+        return tuple(range(len(self.inputs))) if self.versus else (0,)
+
+    def compile(self):
+        """Rebuild `keys` ({keycode: (player, action)}) from the bindings for the current mode."""
+        keys = {code: (0, action) for code, action in self.bindings.keys.items()}
+        if self.versus:
+            keys.update((code, (1, action)) for code, action in self.bindings.keys_p2.items())
+        self.keys = keys
+
+    def set_versus(self, versus):
+        """Switch between single-player and local versus; pads move to P1 when leaving versus."""
+        self.versus = versus
+        self.compile()
+        if not versus:
+            for slot in self.pads.values():
+                slot.player = 0
+        self.reset()
+
+    def reset(self):
+        """Release every held action (the routing table is kept)."""
+        for manager in self.inputs:
+            manager.reset()
+
+    # ---------------------------
+    # PADS
+    # ---------------------------
+    def pad(self, stickid):
+        """The slot of a stick, plugging it in if this is its first event."""
+        slot = self.pads.get(stickid)
+        if slot is None:
+            slot = self.plug(stickid)
+        return slot
+
+    def plug(self, stickid, player=None):
+        """Route a new stick to `player`, or to the human player with the fewest pads."""
+        if player is None:
+            player = min(self.humans, key=self.pad_counts().__getitem__)
+        slot = self.pads[stickid] = PadSlot(stickid, player)
+        self.plugs += 1
+        return slot
+
+    def release_pads(self):
+        """Release whatever every pad holds (the routing table is kept)."""
+        for slot in self.pads.values():
+            self._release(slot)
+
+    def reassign(self, stickid, player=None):
+        """Move a stick to `player` (default: the next human player). Returns the new player."""
+        slot = self.pad(stickid)
+        if player is None:
+            humans = self.humans
+            player = humans[(humans.index(slot.player) + 1) % len(humans)] if slot.player in humans else humans[0]
+        if player != slot.player:
+            self._release(slot)
+            slot.player = player
+        return player
+
+    def _release(self, slot):
+        stickid = slot.stickid
+        self.inputs[slot.player].clear_sources(lambda s: s is slot or (s.__class__ is tuple and s[0] == stickid))
+
+    def pad_counts(self):
+        """Pads routed to each player."""
+        counts = [0] * len(self.inputs)
+        for slot in self.pads.values():
+            counts[slot.player] += 1
+        return counts
@@ -0,0 +1,170 @@
+"""
+Input-to-display latency probe.
+
+The widget stamps each fresh gameplay press (key, pad button, touch) as it arrives,
+`consume` marks the tick whose command bits picked it up (`_tick`), and
+`display` marks the frame that drew the result (end of `_sync_draw`). Both delays go
+into fixed-bucket histograms per device, so recording costs an array increment and
+p50/p95/p99 come straight from the bucket counts.
+
+Usage (summarize dumps, e.g. an Android touch run next to a desktop keyboard run):
+    python -m game_fighter.latency latency-android.json latency-desktop.json
+"""
+
+import argparse
+import json
+import time
+from array import array
+from collections import deque
+
+BUCKET_MS = 0.5
+BUCKETS = 400  # 0 .. 200 ms; the last bucket also takes anything slower
+STAGES = ("tick", "display")
+PERCENTILES = (50, 95, 99)
+RECENT_SAMPLES = 256
+
+
+class LatencyHistogram:
+    """Counts of latencies in `BUCKET_MS` buckets."""
+
+    def __init__(self):
+        self.counts = array("I", [0]) * BUCKETS
+        self.total = 0
+
+    def add(self, ms):
+        self.counts[min(BUCKETS - 1, max(0, int(ms / BUCKET_MS)))] += 1
+        self.total += 1
+
+    def percentile(self, q):
+        """Upper edge (ms) of the bucket holding the q-th percentile; None when empty."""
+        if not self.total:
+            return None
+        rank = q / 100.0 * self.total
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if count and seen >= rank:
+                return (i + 1) * BUCKET_MS
+        return BUCKETS * BUCKET_MS
+
+    def buckets(self):
+        """Non-empty buckets as {lower edge ms: count}."""
+        return {i * BUCKET_MS: count for i, count in enumerate(self.counts) if count}
+
+
+class LatencyProbe:
+    """
+    Per-device input latency, from the input event to the tick that applied it and to
+    the frame that showed it. `recent` keeps the last samples as
+    (device, tick, frame, tick_ms, display_ms).
+    """
+
+    def __init__(self, clock=time.perf_counter, max_pending=64):
+        self.clock = clock
+        self.max_pending = max_pending
+        self.pending = []  # (device, input time) not yet picked up by a tick
+        self.applied = []  # (device, input time, tick time, tick) not yet drawn
+        self.tick = 0
+        self.frame = 0
+        self.histograms = {}  # device -> {stage: LatencyHistogram}
+        self.recent = deque(maxlen=RECENT_SAMPLES)
+
+    def reset(self):
+        self.pending.clear()
+        self.applied.clear()
+        self.histograms.clear()
+        self.recent.clear()
+
+    def drop_pending(self):
+        """Forget inputs that will never reach a tick (the fight ended or input was reset)."""
+        self.pending.clear()
+
+    def stamp(self, device):
+        if len(self.pending) < self.max_pending:
+            self.pending.append((device, self.clock()))
+
+    def consume(self):
+        """A tick read the input state; everything stamped so far was applied in it."""
+        self.tick += 1
+        if self.pending:
+            now = self.clock()
+            tick = self.tick
+            self.applied.extend((device, stamped, now, tick) for device, stamped in self.pending)
+            self.pending.clear()
+
+    def display(self):
+        """A frame was drawn; every applied input is now on screen."""
+        self.frame += 1
+        if not self.applied:
+            return
+        now = self.clock()
+        for device, stamped, ticked, tick in self.applied:
+            hists = self.histograms.get(device)
+            if hists is None:
+                hists = self.histograms[device] = {stage: LatencyHistogram() for stage in STAGES}
+            tick_ms = (ticked - stamped) * 1000.0
+            display_ms = (now - stamped) * 1000.0
+            hists["tick"].add(tick_ms)
+            hists["display"].add(display_ms)
+            self.recent.append((device, tick, self.frame, tick_ms, display_ms))
+        self.applied.clear()
+
+    def summary(self):
+        """{device: {"count": n, "tick": {"p50": ms, ...}, "display": {...}}}"""
+        return {
+            device: {
+                "count": hists["display"].total,
+                **{stage: {f"p{q}": hists[stage].percentile(q) for q in PERCENTILES} for stage in STAGES},
+            }
+            for device, hists in sorted(self.histograms.items())
+        }
+
+    def lines(self):
+        """Overlay text: one line per device, percentiles as tick/display ms."""
+        return summary_lines(self.summary())
+
+    def dump(self, path):
+        data = {
+            "bucket_ms": BUCKET_MS,
+            "summary": self.summary(),
+            "histograms": {
+                device: {stage: hists[stage].buckets() for stage in STAGES}
+                for device, hists in sorted(self.histograms.items())
+            },
+            "recent": [list(sample) for sample in self.recent],
+        }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=1)
+
+
+def _ms(value):
+    return "-" if value is None else f"{value:.1f}"
+
+
+def summary_lines(summary):
+    lines = ["input latency ms (tick/display)"]
+    for device, stats in summary.items():
+        parts = [f"{device:<8} n={stats['count']:<5}"]
+        for q in PERCENTILES:
+            key = f"p{q}"
+            parts.append(f"{key} {_ms(stats['tick'][key])}/{_ms(stats['display'][key])}")
+        lines.append("  ".join(parts))
+    if len(lines) == 1:
+        lines.append("(no presses yet)")
+    return lines
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m game_fighter.latency", description="Summarize latency dumps.")
+    parser.add_argument("dumps", nargs="+", help="JSON files written by LatencyProbe.dump (FIGHTER_LATENCY_LOG).")
+    args = parser.parse_args(argv)
+    for path in args.dumps:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        print(path)
+        for line in summary_lines(data.get("summary", {})):
+            print(f"  {line}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,456 @@
+"""
+Headless match simulation: two fighters, their controllers, hit checks and the round clock.
+
+Nothing here touches Kivy, so a match can be stepped on CI boxes or servers without a
+window or GL context. `FighterGame` owns one `Match` and only adds audio, HUD and drawing
+on top of the events it reports.
+"""
+
+import random
+
+from game_fighter.ai import AIController
+from game_fighter.collision import HITBOX, HURTBOX, PUSHBOX, CollisionWorld
+from game_fighter.constants import PHYSICS_SCALE, SPRITE_SCALE, SPRITE_SIZE, STAGE_MARGIN
+from game_fighter.fighter import ACTIVE, Fighter
+from game_fighter.input_buffer import InputBuffer, MotionMatcher, tick_symbol
+from game_fighter.input_manager import LEFT, PUNCH_PRESSED, JUMP_PRESSED, RIGHT
+from game_fighter.projectiles import PROJECTILE, ProjectilePool
+from game_fighter.roster import CHARACTERS
+
+GRAVITY = -2200 * PHYSICS_SCALE
+ROUND_SECONDS = 60
+# Ticks longer than this test boxes along their motion (auto `Match.swept`); 60 Hz stays discrete
+SWEEP_ABOVE_DT = 1.0 / 45
+
+
+def aabb(a, b):
+    ax, ay, aw, ah = a
+    bx, by, bw, bh = b
+    return not (ax + aw <= bx or bx + bw <= ax or ay + ah <= by or by + bh <= ay)
+
+
+def reference_floor_y(stage_width):
+    """Use Military stage floor as reference for collision height across stages."""
+    ref_w, ref_h = 1024, 176
+    ratio = 0.2
+    scale = (stage_width or 1280) / ref_w
+    return max(10, ref_h * scale * ratio)
+
+
+def start_positions(stage_width, render_scale=SPRITE_SCALE):
+    """Place fighters symmetrically around the stage center."""
+    scale_ratio = render_scale / float(SPRITE_SCALE)
+    eff_size = SPRITE_SIZE * scale_ratio
+    center = stage_width * 0.5
+    offset = 260
+    left = max(STAGE_MARGIN, center - offset - eff_size * 0.5)
+    right = min(stage_width - eff_size - STAGE_MARGIN, center + offset - eff_size * 0.5)
+    return left, right
+
+
+def apply_command(fighter, cmd):
+    """Apply one tick of packed input bits (see `input_manager`) to a fighter."""
+    if cmd & JUMP_PRESSED:
+        fighter.jump()
+    if cmd & PUNCH_PRESSED:
+        fighter.start_attack()
+
+    left = cmd & LEFT
+    right = cmd & RIGHT
+    if left and not right:
+        fighter.move_left()
+    elif right and not left:
+        fighter.move_right()
+    else:
+        fighter.stop()
+
+
+class Match:
+    """
+    Simulation state for one match.
+
+    `controllers` is a (p1, p2) pair; a side with a controller ignores its command bits and
+    is driven by `controller.update(dt, me, opponent, stage_width)` instead.
+    After each `step`, `events` lists what happened: ("hit", attacker, defender, damage)
+    and ("ko", "P1"|"P2") tuples, in simulation order. `snapshot`/`restore` save and load
+    everything a tick mutates, for rollback and replays.
+
+    `rng` is the gameplay random stream (AI decisions, victory pose pick). Keep cosmetic
+    randomness (camera shake, sound picks) off it so a seed plus the per-tick commands
+    reproduce a match exactly. A `recorder` (see `replay.ReplayRecorder`), when set, is
+    told about every tick and round reset.
+
+    `swept` picks how boxes are tested: False checks them where they are at the end of
+    each tick, True along the straight path each fighter moved during the tick (nothing
+    tunnels through a hurtbox or pushbox at low tick rates), and None (default) sweeps
+    only ticks longer than `SWEEP_ABOVE_DT`.
+
+    Every tick's command bits go into a per-side `InputBuffer`. For command-driven sides
+    with `motion_inputs` on, a `MotionMatcher` turns a quarter-circle forward + punch
+    into `fire_projectile` (the punch press is then consumed).
+    """
+
+    # Fighter type `headless` builds (`fixed_physics.FixedMatch` swaps in the fixed-point one)
+    fighter_class = Fighter
+
+    def __init__(self, p1, p2, stage_width, floor_y, gravity=GRAVITY, controllers=None, rng=None, seed=None):
+        self.p1 = p1
+        self.p2 = p2
+        self.stage_width = stage_width
+        self.floor_y = floor_y
+        self.gravity = gravity
+        self.seed = seed
+        self.rng = rng if rng is not None else random.Random(seed)
+        self.controllers = list(controllers) if controllers is not None else [None, AIController(self.rng)]
+        self.recorder = None
+        self.round_timer = ROUND_SECONDS
+        self._timer_accum = 0.0
+        self.p1_wins = 0
+        self.p2_wins = 0
+        self.events = []
+        self.collisions = CollisionWorld()
+        self.projectiles = ProjectilePool()
+        self.projectile_cfg = dict(PROJECTILE)
+        self.motion_inputs = True
+        self.inputs = (InputBuffer(), InputBuffer())
+        self.fireball_motions = (MotionMatcher(), MotionMatcher())
+        self.swept = None
+        # {fighter: (x, y, attack phase)} at the start of a swept tick, else None
+        self.tick_start = None
+
+    @property
+    def fighters(self):
+        """Every body in the collision world, in resolution order (P1 first)."""
+        return (self.p1, self.p2)
+
+    @classmethod
+    def headless(cls, p1_character="ryu", p2_character="ken", stage_width=1280, p1_ai=False, p2_ai=True, seed=None, rng=None):
+        """
+        Build a render-free match with fighters at their round start positions.
+
+        Fighters draw their victory pose from the gameplay stream (`rng`, or a fresh
+        `random.Random(seed)`) in P1, P2 order, matching `FighterGame._apply_selection`.
+        """
+        rng = rng if rng is not None else random.Random(seed)
+        floor_y = reference_floor_y(stage_width)
+        left, right = start_positions(stage_width)
+        p1 = cls.fighter_class(left, floor_y, CHARACTERS[p1_character](), floor_y, stage_width=stage_width, rng=rng)
+        p2 = cls.fighter_class(right, floor_y, CHARACTERS[p2_character](), floor_y, stage_width=stage_width, rng=rng)
+        controllers = [AIController(rng) if p1_ai else None, AIController(rng) if p2_ai else None]
+        match = cls(p1, p2, stage_width, floor_y, controllers=controllers, rng=rng, seed=seed)
+        match.reset_round()
+        return match
+
+    @property
+    def ai(self):
+        """Controller driving P2 (the CPU opponent in single player)."""
+        return self.controllers[1]
+
+    def reseed(self, seed):
+        """Start a new match: reseed the gameplay stream, clear controllers and win counters."""
+        self.seed = seed
+        self.rng.seed(seed)
+        for controller in self.controllers:
+            if controller is not None:
+                controller.reset()
+        self.p1_wins = 0
+        self.p2_wins = 0
+
+    def reset_round(self):
+        """Put both fighters in their round start state (identical whatever the last round left behind)."""
+        p1_x, p2_x = start_positions(self.stage_width, self.p1.render_scale)
+        for fighter, x, knock_dir in ((self.p1, p1_x, 1), (self.p2, p2_x, -1)):
+            fighter.floor_y = self.floor_y
+            fighter.stage_width = self.stage_width
+            fighter.x, fighter.y = x, self.floor_y
+            fighter.vx = fighter.vy = 0
+            fighter.facing = knock_dir
+            fighter.hp = 100
+            fighter.hitstun = 0.0
+            fighter.knockback_vx = 0.0
+            fighter.was_hit = False
+            fighter.defeated = False
+            fighter.victorious = False
+            fighter.defeat_floor = self.floor_y
+            fighter.defeat_impact_count = 0
+            fighter.defeat_landing_event = None
+            fighter.defeat_knock_dir = knock_dir
+            fighter.attack = None
+            fighter.sprite.play("idle", loop=True, restart=True)
+            fighter.sprite.flip_x = knock_dir == -1
+        self.projectiles.clear()
+        for buffer, matcher in zip(self.inputs, self.fireball_motions):
+            buffer.clear()
+            matcher.reset()
+        self.round_timer = ROUND_SECONDS
+        self._timer_accum = 0.0
+        self.events = []
+        if self.recorder is not None:
+            self.recorder.reset_round(self.stage_width, self.floor_y, self.p1.render_scale)
+
+    # ---------------------------
+    # SAVE STATES
+    # ---------------------------
+    def snapshot(self):
+        """Return an immutable tuple of the full simulation state (cheap enough to take every tick)."""
+        return (
+            self.round_timer,
+            self._timer_accum,
+            self.p1_wins,
+            self.p2_wins,
+            self.p1.snapshot(),
+            self.p2.snapshot(),
+            tuple(c.snapshot() if c is not None else None for c in self.controllers),
+            self.projectiles.snapshot(),
+            tuple((b.snapshot(), m.snapshot()) for b, m in zip(self.inputs, self.fireball_motions)),
+        )
+
+    def restore(self, snap):
+        self.round_timer, self._timer_accum, self.p1_wins, self.p2_wins, p1_snap, p2_snap, ctrl_snaps, proj_snap, input_snaps = snap
+        self.p1.restore(p1_snap)
+        self.p2.restore(p2_snap)
+        self.projectiles.restore(proj_snap)
+        for buffer, matcher, (buffer_snap, matcher_snap) in zip(self.inputs, self.fireball_motions, input_snaps):
+            buffer.restore(buffer_snap)
+            matcher.restore(matcher_snap)
+        for controller, ctrl_snap in zip(self.controllers, ctrl_snaps):
+            if controller is not None:
+                controller.restore(ctrl_snap)
+        self.events = []
+
+    # ---------------------------
+    # TICKS
+    # ---------------------------
+    def step_idle(self, dt):
+        """Advance fighters only (intros, round over, menus): no input, AI, clock or hits."""
+        self.events = []
+        if self.recorder is not None:
+            self.recorder.idle()
+        self.p1.update(dt, self.gravity)
+        self.p2.update(dt, self.gravity)
+
+    def step(self, dt, p1_cmd=0, p2_cmd=0):
+        """Advance one in-play tick."""
+        self.events = []
+        if self.recorder is not None:
+            self.recorder.step(p1_cmd, p2_cmd)
+        p1, p2 = self.p1, self.p2
+
+        # Input / AI, P1 first so the CPU reacts to this tick's player action
+        for side, fighter, opponent, cmd, controller in ((0, p1, p2, p1_cmd, self.controllers[0]), (1, p2, p1, p2_cmd, self.controllers[1])):
+            self.inputs[side].push(cmd)
+            if controller is None:
+                if self.motion_inputs and self.fireball_motions[side].step(tick_symbol(cmd, fighter.facing), dt):
+                    if self.fire_projectile(fighter):
+                        cmd &= ~PUNCH_PRESSED
+                apply_command(fighter, cmd)
+            else:
+                controller.update(dt, fighter, opponent, self.stage_width)
+
+        self.tick_clock(dt)
+
+        swept = self.swept if self.swept is not None else dt > SWEEP_ABOVE_DT
+        self.tick_start = {f: (f.x, f.y, f.attack.phase if f.attack else None) for f in self.fighters} if swept else None
+
+        p1.update(dt, self.gravity)
+        p2.update(dt, self.gravity)
+        if self.projectiles.count:
+            self.projectiles.update(dt, 0, self.stage_width)
+
+        # Keep fighters from overlapping
+        self.separate_fighters()
+
+        # Hit detection: every active hitbox against every hurtbox
+        self.check_hits()
+
+    def tick_clock(self, dt):
+        """Run the round timer (whole seconds) down by `dt`, carrying the fraction."""
+        self._timer_accum += dt
+        if self._timer_accum >= 1.0 and self.round_timer > 0:
+            ticks = int(self._timer_accum)
+            self._timer_accum -= ticks
+            self.round_timer = max(0, self.round_timer - ticks)
+
+    # ---------------------------
+    # COLLISIONS
+    # ---------------------------
+    def check_hits(self):
+        """
+        Pair every active hitbox (fighters first, then projectiles) with the hurtboxes it
+        overlaps and resolve the pairs in order of impact time, then insertion order
+        (P1's hits first).
+
+        A landed hit changes the defender's animation (and a KO both fighters'), so their
+        boxes are refreshed and the remaining hitboxes re-paired: a fighter hit earlier in
+        the tick only trades if its hitbox still reaches from the hit-reaction frame.
+
+        On a swept tick the boxes carry their owner's motion, so a hitbox that swept
+        through a hurtbox during the tick connects even if they are apart at its end. A
+        hitbox that only turned active this tick counts from the tick's end.
+        """
+        fighters = self.fighters
+        pool = self.projectiles
+        attacking = [f for f in fighters if f.attack and f.attack.phase is ACTIVE and not f.attack.has_hit]
+        if not attacking and not pool.count:
+            return
+        world = self.collisions
+        world.clear()
+        start = self.tick_start
+        slots = []  # (fighter, hurtbox index, hitbox index or None)
+        for fighter in fighters:
+            if start is None:
+                hurt = world.add(fighter, HURTBOX, fighter.hurtbox(), fighter)
+                hit = world.add(fighter, HITBOX, fighter.attack_hitbox(), fighter) if fighter in attacking else None
+            else:
+                x, y, phase = start[fighter]
+                motion = (fighter.x - x, fighter.y - y)
+                hurt = world.add(fighter, HURTBOX, fighter.hurtbox(), fighter, motion)
+                hit = None
+                if fighter in attacking:
+                    window = (0.0, 1.0) if phase is ACTIVE else (1.0, 1.0)
+                    hit = world.add(fighter, HITBOX, fighter.attack_hitbox(), fighter, motion, window)
+            slots.append((fighter, hurt, hit))
+        # Projectile i is box `first_shot + i`; its team is the owning fighter
+        first_shot = len(world)
+        for i in range(pool.count):
+            motion = (pool.vx[i] * pool.last_dt, 0.0) if start is not None else None
+            world.add(pool, HITBOX, pool.box(i), fighters[pool.owner[i]], motion)
+        pairs = world.hit_pairs()
+        k = 0
+        while k < len(pairs):
+            toi, hit, hurt = pairs[k]
+            k += 1
+            attacker, defender = world.owner(hit), world.owner(hurt)
+            if attacker is pool:
+                attacker = fighters[pool.owner[hit - first_shot]]
+                landed = self.resolve_projectile_hit(hit - first_shot, defender)
+            else:
+                landed = self.resolve_hit(attacker, defender)
+            if not landed:
+                continue
+            for fighter, hurt_index, hit_index in slots:
+                if fighter is attacker or fighter is defender:
+                    world.update(hurt_index, fighter.hurtbox())
+                    if hit_index is not None and fighter.attack:
+                        world.update(hit_index, fighter.attack_hitbox())
+            pairs = [pair for pair in world.hit_pairs() if pair[:2] > (toi, hit)]
+            k = 0
+        if pool.count:
+            pool.remove_spent()
+
+    def fire_projectile(self, fighter):
+        """
+        Launch `fighter`'s projectile from in front of its hurtbox; False (nothing fired)
+        while it is defeated, in hitstun, or already has `per_fighter` projectiles out.
+        """
+        cfg = self.projectile_cfg
+        side = 0 if fighter is self.p1 else 1
+        if fighter.defeated or fighter.hitstun > 0 or self.projectiles.owned(side) >= cfg["per_fighter"]:
+            return False
+        hx, hy, hw, hh = fighter.hurtbox()
+        s = fighter.render_scale
+        w, h = cfg["w"] * s, cfg["h"] * s
+        x = hx + hw if fighter.facing == 1 else hx - w
+        y = hy + hh * 0.55 - h * 0.5
+        return self.projectiles.spawn(side, x, y, fighter.facing * cfg["speed"], w, h, cfg["life"], cfg["dmg"]) >= 0
+
+    def check_hit(self, attacker, defender):
+        """Test one attacker against one defender with their current boxes, and resolve a hit."""
+        attack = attacker.attack
+        if attack and attack.phase is ACTIVE and not attack.has_hit and aabb(attacker.attack_hitbox(), defender.hurtbox()):
+            self.resolve_hit(attacker, defender)
+
+    def resolve_hit(self, attacker, defender):
+        """Apply a landed hit and return True, unless an earlier pair this tick already spent or ended the attack."""
+        attack = attacker.attack
+        if not attack or attack.phase is not ACTIVE or attack.has_hit:
+            return False
+        attack.has_hit = True
+        # Direction: push defender away from attacker
+        direction = 1 if defender.x > attacker.x else -1
+        # Stronger knockback for more impact, slightly longer hitstun for more pause
+        self.apply_hit(attacker, defender, attacker.attack_cfg["dmg"], direction, 620 * PHYSICS_SCALE, 0.22)
+        return True
+
+    def resolve_projectile_hit(self, slot, defender):
+        """Apply a projectile hit and spend the projectile; False if it already hit something this tick."""
+        pool = self.projectiles
+        if pool.life[slot] <= 0.0:
+            return False
+        pool.spend(slot)
+        cfg = self.projectile_cfg
+        direction = 1 if pool.vx[slot] > 0 else -1
+        attacker = self.fighters[pool.owner[slot]]
+        self.apply_hit(attacker, defender, pool.dmg[slot], direction, cfg["knockback"], cfg["hitstun"])
+        return True
+
+    def apply_hit(self, attacker, defender, dmg, direction, knockback, hitstun):
+        """Damage, knock back and stun `defender`; report the hit and, at 0 HP, the KO."""
+        defender.hp = max(0, defender.hp - dmg)
+        defender.defeat_knock_dir = direction
+        defender.knockback_vx = direction * knockback
+        defender.hitstun = hitstun
+        defender.on_hit()
+        self.events.append(("hit", attacker, defender, dmg))
+
+        if defender.hp <= 0:
+            # Extra knockback on defeat
+            defender.knockback_vx = direction * 1800 * PHYSICS_SCALE
+            defender.on_defeat()
+            attacker.on_victory()
+            winner = "P1" if defender is self.p2 else "P2"
+            if winner == "P1":
+                self.p1_wins += 1
+            else:
+                self.p2_wins += 1
+            self.events.append(("ko", winner))
+
+    def separate_fighters(self):
+        """
+        Prevent fighters from occupying the same space by pushing overlapping pushboxes
+        apart horizontally. On a swept tick, fighters that passed through each other
+        during the tick are pushed back to the sides they started on.
+        """
+        world = self.collisions
+        world.clear()
+        start = self.tick_start
+        for fighter in self.fighters:
+            if start is None:
+                world.add(fighter, PUSHBOX, fighter.hurtbox())
+            else:
+                x, y, _ = start[fighter]
+                world.add(fighter, PUSHBOX, fighter.hurtbox(), motion=(fighter.x - x, fighter.y - y))
+        boxes = world.boxes
+        for _, i, j in world.push_pairs():
+            a_left = None
+            if start is not None:
+                a_left = world.start_box(i)[0] <= world.start_box(j)[0]
+            self.push_apart(world.owner(i), boxes[i], world.owner(j), boxes[j], a_left)
+
+    def push_apart(self, a, box_a, b, box_b, a_left=None):
+        """
+        Split the horizontal overlap of two pushboxes between their owners, then clamp to
+        the stage. `a_left` is which side `a` started the tick on (None: where it is now);
+        if the two have since crossed, the whole crossing is undone.
+        """
+        x1, _, w1, _ = box_a
+        x2, _, w2, _ = box_b
+        if a_left is None or a_left == (x1 <= x2):
+            overlap_x = min(x1 + w1, x2 + w2) - max(x1, x2)
+            a_left = x1 <= x2
+        else:
+            overlap_x = x1 + w1 - x2 if a_left else x2 + w2 - x1
+        if overlap_x <= 0:
+            # Touched mid-tick but already apart again
+            return
+        push = overlap_x / 2.0 + 1.0  # small bias prevents re-overlap next frame
+        if a_left:
+            a.x -= push
+            b.x += push
+        else:
+            a.x += push
+            b.x -= push
+
+        max_x = self.stage_width - SPRITE_SIZE - STAGE_MARGIN
+        a.x = max(STAGE_MARGIN, min(max_x, a.x))
+        b.x = max(STAGE_MARGIN, min(max_x, b.x))
@@ -0,0 +1,148 @@
+"""
+UDP input exchange for rollback netplay, plus a lossy link simulator for local testing.
+
+Each packet carries an ack (the newest remote frame the sender has confirmed) and a run
+of the sender's most recent unacknowledged input frames, so a lost packet is covered by
+the next one without retransmission timers.
+"""
+
+import heapq
+import random
+import socket
+import struct
+import time
+
+# kind, ack frame, first frame, count; followed by `count` command bytes
+HEADER = struct.Struct("<BiIB")
+KIND_INPUTS = 1
+DEFAULT_REDUNDANCY = 16
+
+
+def encode_inputs(ack, start_frame, cmds):
+    return HEADER.pack(KIND_INPUTS, ack, start_frame, len(cmds)) + bytes(cmds)
+
+
+def decode_inputs(data):
+    """Return (ack, start_frame, cmds) or None for malformed packets."""
+    if len(data) < HEADER.size:
+        return None
+    kind, ack, start, count = HEADER.unpack_from(data)
+    if kind != KIND_INPUTS or len(data) < HEADER.size + count:
+        return None
+    return ack, start, data[HEADER.size:HEADER.size + count]
+
+
+class SimulatedLink:
+    """
+    Delay, jitter, and drop outgoing datagrams before they reach the real socket.
+
+    Wraps a `send(data, addr)` callable. `pump(now)` releases every packet whose
+    delivery time has passed; pass a virtual clock for deterministic tests.
+    """
+
+    def __init__(self, send, latency=0.0, jitter=0.0, loss=0.0, rng=None, clock=time.monotonic):
+        self._send = send
+        self.latency = latency
+        self.jitter = jitter
+        self.loss = loss
+        self.rng = rng or random.Random()
+        self.clock = clock
+        self._queue = []
+        self._seq = 0
+        self.sent = 0
+        self.dropped = 0
+
+    def send(self, data, addr):
+        if self.loss and self.rng.random() < self.loss:
+            self.dropped += 1
+            return
+        delay = self.latency + (self.rng.uniform(-self.jitter, self.jitter) if self.jitter else 0.0)
+        heapq.heappush(self._queue, (self.clock() + max(0.0, delay), self._seq, data, addr))
+        self._seq += 1
+
+    def pump(self, now=None):
+        now = self.clock() if now is None else now
+        while self._queue and self._queue[0][0] <= now:
+            _, _, data, addr = heapq.heappop(self._queue)
+            self._send(data, addr)
+            self.sent += 1
+
+
+class UdpInputTransport:
+    """
+    Non-blocking UDP endpoint exchanging per-frame command bytes with one peer.
+
+    `queue_local(frame, cmd)` records an input, `flush(ack)` sends the unacknowledged
+    tail, and `poll()` returns newly received `(frame, cmd)` pairs.
+    """
+
+    def __init__(self, local_addr=("127.0.0.1", 0), remote_addr=None, redundancy=DEFAULT_REDUNDANCY):
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.setblocking(False)
+        self.sock.bind(local_addr)
+        self.remote_addr = remote_addr
+        self.redundancy = redundancy
+        self.link = None  # optional SimulatedLink
+        self._outbox = {}
+        self._peer_ack = -1
+        self.packets_in = 0
+        self.packets_out = 0
+
+    @property
+    def address(self):
+        return self.sock.getsockname()
+
+    def use_link(self, link_factory):
+        """Route outgoing datagrams through `link_factory(send)` (e.g. a `SimulatedLink`)."""
+        self.link = link_factory(self._raw_send)
+        return self.link
+
+    def _raw_send(self, data, addr):
+        try:
+            self.sock.sendto(data, addr)
+        except OSError:
+            pass
+
+    def queue_local(self, frame, cmd):
+        self._outbox[frame] = cmd & 0xFF
+
+    def flush(self, ack):
+        if self.remote_addr is None or not self._outbox:
+            return
+        frames = sorted(f for f in self._outbox if f > self._peer_ack)
+        if not frames:
+            return
+        # Send a contiguous run starting at the oldest unacked frame
+        start = frames[0]
+        end = min(frames[-1], start + self.redundancy - 1)
+        cmds = [self._outbox.get(f, 0) for f in range(start, end + 1)]
+        data = encode_inputs(ack, start, cmds)
+        if self.link is not None:
+            self.link.send(data, self.remote_addr)
+        else:
+            self._raw_send(data, self.remote_addr)
+        self.packets_out += 1
+
+    def poll(self):
+        received = []
+        while True:
+            try:
+                data, _addr = self.sock.recvfrom(2048)
+            except (BlockingIOError, InterruptedError):
+                break
+            except OSError:
+                break
+            decoded = decode_inputs(data)
+            if decoded is None:
+                continue
+            self.packets_in += 1
+            ack, start, cmds = decoded
+            if ack > self._peer_ack:
+                for f in [f for f in self._outbox if f <= ack]:
+                    del self._outbox[f]
+                self._peer_ack = ack
+            received.extend((start + i, cmd) for i, cmd in enumerate(cmds))
+        return received
+
+    def close(self):
+        self.sock.close()
@@ -0,0 +1,246 @@
+"""
+Learned CPU opponent: a small MLP over the decision tree's own features.
+
+`PolicyAIController` picks one of the lookahead AI's `PLANS` (approach, retreat, jump
+in, punch, hold) every `think` seconds from a feature row (distance, facing, corners,
+the opponent's attack phase, airborne/stun flags, punch and jump cooldowns, HP lead).
+The weights come from `tools/train_policy.py`, which trains them by self-play on
+`BatchMatch`, and ship as `policy_weights.npz` next to this module.
+
+Controllers that share a `PolicyBatch` queue their feature rows and have them
+answered together: the first controller that needs an answer runs one forward pass
+(two matrix products, a tanh and an argmax) for every row queued since the last one. A
+lone row takes `PolicyNet.act_one`, which skips building the batch array.
+A decision is therefore played from the tick after its features were taken.
+
+`features` (one fighter) and `batch_features` (`BatchMatch` arrays) compute the same
+row, so the network is trained on what the controller sees. Needs NumPy.
+"""
+
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+
+from game_fighter.ai import AIController, new_ai_context
+from game_fighter.constants import SPRITE_SIZE, STAGE_MARGIN
+from game_fighter.input_manager import JUMP_PRESSED, LEFT, PUNCH_PRESSED, RIGHT
+from game_fighter.match import apply_command
+from game_fighter.search_ai import PLANS
+
+POLICY_PATH = Path(__file__).with_name("policy_weights.npz")
+POLICY_THINK = 0.1  # seconds between decisions
+POLICY_HIDDEN = 16
+DISTANCE_SCALE = 640.0  # px mapped to 1.0
+PUNCH_READY = 1.0  # seconds since the last punch at which "punch_ready" saturates
+JUMP_READY = 1.2
+
+FEATURES = (
+    "distance", "opponent_facing", "cornered", "opponent_cornered",
+    "opponent_startup", "opponent_active", "opponent_recovery", "attacking",
+    "airborne", "opponent_airborne", "opponent_stunned", "punch_ready", "jump_ready", "hp_lead",
+)
+ACTIONS = tuple(plan[0] for plan in PLANS)
+
+
+def new_policy_context():
+    ctx = new_ai_context()
+    # punch_at / jump_at: `clock` time of the last press (starts out ready)
+    ctx.update(plan=None, press=0, walk=0, think=0.0, features=None, clock=0.0, punch_at=-PUNCH_READY, jump_at=-JUMP_READY)
+    return ctx
+
+
+def corners(stage_width):
+    """x bounds of the corner zones, as the decision tree draws them."""
+    return STAGE_MARGIN + SPRITE_SIZE * 0.4, stage_width - SPRITE_SIZE * 1.4 - STAGE_MARGIN
+
+
+def features(me, opponent, ctx, stage_width):
+    """Feature row (ordered as `FEATURES`) for `me`, as a tuple of floats."""
+    left, right = corners(stage_width)
+    toward = 1 if opponent.x > me.x else -1
+    phase = int(opponent.attack.phase) if opponent.attack else 0
+    return (
+        min(2.0, abs(opponent.x - me.x) / DISTANCE_SCALE),
+        1.0 if opponent.facing == -toward else -1.0,
+        1.0 if me.x < left or me.x > right else 0.0,
+        1.0 if opponent.x < left or opponent.x > right else 0.0,
+        1.0 if phase == 1 else 0.0,
+        1.0 if phase == 2 else 0.0,
+        1.0 if phase == 3 else 0.0,
+        1.0 if me.attack else 0.0,
+        1.0 if me.y > me.floor_y + 0.5 else 0.0,
+        1.0 if opponent.y > opponent.floor_y + 0.5 else 0.0,
+        1.0 if opponent.hitstun > 0 else 0.0,
+        min(1.0, (ctx["clock"] - ctx["punch_at"]) / PUNCH_READY),
+        min(1.0, (ctx["clock"] - ctx["jump_at"]) / JUMP_READY),
+        (me.hp - opponent.hp) / 100.0,
+    )
+
+
+def batch_features(batch, side, since_punch, since_jump):
+    """`features` for fighter row `side` of every match in a `BatchMatch`; returns (N, len(FEATURES))."""
+    me, opp = side, 1 - side
+    left, right = corners(batch.stage_width)
+    x, y = batch.x, batch.y
+    toward = np.where(x[opp] > x[me], 1, -1)
+    phase = batch.phase[opp]
+    airborne = y > batch.floor_y + 0.5
+    cornered = (x < left) | (x > right)
+    return np.stack([
+        np.minimum(2.0, np.abs(x[opp] - x[me]) / DISTANCE_SCALE),
+        np.where(batch.facing[opp] == -toward, 1.0, -1.0),
+        cornered[me],
+        cornered[opp],
+        phase == 1,
+        phase == 2,
+        phase == 3,
+        batch.phase[me] != 0,
+        airborne[me],
+        airborne[opp],
+        batch.hitstun[opp] > 0,
+        since_punch / PUNCH_READY,
+        since_jump / JUMP_READY,
+        (batch.hp[me] - batch.hp[opp]) / 100.0,
+    ], axis=1).astype(float)
+
+
+class PolicyNet:
+    """One tanh hidden layer from `FEATURES` to one score per entry of `ACTIONS`."""
+
+    def __init__(self, w1, b1, w2, b2):
+        self.w1, self.b1, self.w2, self.b2 = w1, b1, w2, b2
+        # `b1` as the weights of a constant 1 feature, for `act_one`
+        self._w1b = np.vstack([w1, b1])
+
+    @classmethod
+    def load(cls, path=POLICY_PATH):
+        # Stored as float32; computing in float64 skips a cast of every feature batch
+        with np.load(path) as data:
+            return cls(*(data[name].astype(float) for name in ("w1", "b1", "w2", "b2")))
+
+    @classmethod
+    def from_vector(cls, theta, hidden=POLICY_HIDDEN):
+        """Unflatten the parameter vector used by the trainer."""
+        n_in, n_out = len(FEATURES), len(ACTIONS)
+        sizes = (n_in * hidden, hidden, hidden * n_out, n_out)
+        w1, b1, w2, b2 = np.split(np.asarray(theta, dtype=float), np.cumsum(sizes)[:-1])
+        return cls(w1.reshape(n_in, hidden), b1, w2.reshape(hidden, n_out), b2)
+
+    @staticmethod
+    def size(hidden=POLICY_HIDDEN):
+        return (len(FEATURES) + 1) * hidden + (hidden + 1) * len(ACTIONS)
+
+    def to_vector(self):
+        return np.concatenate([self.w1.ravel(), self.b1, self.w2.ravel(), self.b2])
+
+    def save(self, path):
+        # float32 halves the file; inference precision does not need more
+        np.savez_compressed(path, **{name: getattr(self, name).astype(np.float32) for name in ("w1", "b1", "w2", "b2")},
+                            features=np.array(FEATURES), actions=np.array(ACTIONS))
+
+    def scores(self, rows):
+        scores = np.tanh(rows.dot(self.w1) + self.b1).dot(self.w2)
+        scores += self.b2
+        return scores
+
+    def act(self, rows):
+        """Index into `ACTIONS` for each row of an (n, len(FEATURES)) array."""
+        return self.scores(rows).argmax(1)
+
+    def act_one(self, row):
+        """`act` for a single feature tuple: no batch array, three NumPy calls fewer."""
+        hidden = np.tanh(np.dot(row + (1.0,), self._w1b))
+        return int((hidden.dot(self.w2) + self.b2).argmax())
+
+
+@lru_cache(maxsize=None)
+def default_net():
+    return PolicyNet.load(POLICY_PATH)
+
+
+class PolicyBatch:
+    """
+    Answers the queued feature rows of every controller sharing it with one forward
+    pass. `flushes` and `rows` count passes and decisions.
+    """
+
+    def __init__(self, net):
+        self.net = net
+        self.pending = []
+        self.flushes = 0
+        self.rows = 0
+
+    def request(self, controller):
+        if controller not in self.pending:
+            self.pending.append(controller)
+
+    def flush(self):
+        # Rows are read from ctx, not kept in the queue, so a Match.restore in between is honoured
+        ctxs = [c.ctx for c in self.pending]
+        self.pending = []
+        rows = [ctx["features"] for ctx in ctxs if ctx["features"] is not None]
+        if not rows:
+            return
+        # One row is the usual case in play (one CPU side); skip the batch array for it
+        actions = iter([self.net.act_one(rows[0])] if len(rows) == 1 else self.net.act(np.array(rows)).tolist())
+        for ctx in ctxs:
+            if ctx["features"] is not None:
+                name, press, walk = PLANS[next(actions)]
+                ctx.update(plan=name, press=press, walk=walk, features=None)
+        self.flushes += 1
+        self.rows += len(rows)
+
+
+@lru_cache(maxsize=None)
+def default_batch():
+    """Batch shared by every controller built without one (both CPU sides of a match, say)."""
+    return PolicyBatch(default_net())
+
+
+class PolicyAIController(AIController):
+    """
+    Learned difficulty tier (see module docstring). Stunned, defeated and victorious
+    ticks only turn toward the opponent (the tree's own context is never used).
+    """
+
+    def __init__(self, rng=None, batch=None, think=POLICY_THINK):
+        super().__init__(rng)
+        self.ctx = new_policy_context()
+        self.batch = batch if batch is not None else default_batch()
+        self.think = think
+
+    def reset(self):
+        self.ctx = new_policy_context()
+
+    def update(self, dt, me, opponent, stage_width):
+        ctx = self.ctx
+        ctx["clock"] += dt
+        toward = 1 if opponent.x > me.x else -1
+        me.facing = toward
+        if me.hitstun > 0 or me.defeated or me.victorious:
+            ctx.update(plan=None, press=0, walk=0)
+            return
+
+        if ctx["features"] is not None:
+            self.batch.request(self)
+            self.batch.flush()
+        think = ctx["think"] - dt
+        if think <= 0:
+            think = self.think
+            ctx["features"] = features(me, opponent, ctx, stage_width)
+            self.batch.request(self)
+        ctx["think"] = think
+
+        side = ctx["walk"] * toward
+        cmd = RIGHT if side > 0 else LEFT if side < 0 else 0
+        press = ctx["press"]
+        if press:
+            # Presses go out on the plan's first tick only
+            cmd |= press
+            ctx["press"] = 0
+            if press & PUNCH_PRESSED:
+                ctx["punch_at"] = ctx["clock"]
+            if press & JUMP_PRESSED:
+                ctx["jump_at"] = ctx["clock"]
+        apply_command(me, cmd)
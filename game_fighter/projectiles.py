@@ -0,0 +1,131 @@
+"""
+Pooled projectiles (fireball-style moves).
+
+`ProjectilePool` keeps every live projectile in fixed-capacity parallel arrays, packed
+at the front: slots `0 .. count - 1` are live and a despawn moves the last live
+projectile into the hole. Spawning, moving and despawning only overwrite numbers in
+place, so a stream of shots allocates no objects, and the slot layout depends only on
+the order of spawns and despawns (deterministic for rollback and replays).
+
+The pool knows nothing about fighters: owners are side indices (0 = P1, 1 = P2).
+`Match` spawns, steps and hit-checks it; the widget draws it.
+"""
+
+from array import array
+
+from game_fighter.constants import PHYSICS_SCALE
+
+PROJECTILE_CAPACITY = 16
+
+# Default fireball. Sizes are source pixels (times the owner's render scale), speeds px/s
+PROJECTILE = dict(
+    speed=520 * PHYSICS_SCALE,
+    w=34,
+    h=22,
+    life=1.6,
+    dmg=8,
+    hitstun=0.18,
+    knockback=420 * PHYSICS_SCALE,
+    per_fighter=1,
+)
+
+
+class ProjectilePool:
+    """
+    Fixed-capacity structure-of-arrays pool. `x`, `y`, `vx`, `w`, `h` (world px, box
+    bottom-left), `life` (seconds left), `dmg` and `owner` are parallel arrays; only the
+    first `count` entries are live.
+    """
+
+    def __init__(self, capacity=PROJECTILE_CAPACITY):
+        self.capacity = capacity
+        zeros = [0.0] * capacity
+        self.x = array("d", zeros)
+        self.y = array("d", zeros)
+        self.vx = array("d", zeros)
+        self.w = array("d", zeros)
+        self.h = array("d", zeros)
+        self.life = array("d", zeros)
+        self.dmg = array("i", [0] * capacity)
+        self.owner = array("b", [0] * capacity)
+        self.count = 0
+        # Step length of the last `update`, for swept collision of the move it made
+        self.last_dt = 0.0
+
+    def __len__(self):
+        return self.count
+
+    def clear(self):
+        self.count = 0
+
+    def spawn(self, owner, x, y, vx, w, h, life, dmg):
+        """Claim the next free slot and return it; -1 (shot dropped) when the pool is full."""
+        i = self.count
+        if i >= self.capacity:
+            return -1
+        self.x[i] = x
+        self.y[i] = y
+        self.vx[i] = vx
+        self.w[i] = w
+        self.h[i] = h
+        self.life[i] = life
+        self.dmg[i] = dmg
+        self.owner[i] = owner
+        self.count = i + 1
+        return i
+
+    def despawn(self, i):
+        """Free slot `i` by moving the last live projectile into it."""
+        last = self.count - 1
+        if i != last:
+            self.x[i] = self.x[last]
+            self.y[i] = self.y[last]
+            self.vx[i] = self.vx[last]
+            self.w[i] = self.w[last]
+            self.h[i] = self.h[last]
+            self.life[i] = self.life[last]
+            self.dmg[i] = self.dmg[last]
+            self.owner[i] = self.owner[last]
+        self.count = last
+
+    def owned(self, owner):
+        """Live projectiles belonging to side `owner`."""
+        owners = self.owner
+        return sum(1 for i in range(self.count) if owners[i] == owner)
+
+    def box(self, i):
+        return (self.x[i], self.y[i], self.w[i], self.h[i])
+
+    def spend(self, i):
+        """Mark a projectile as used up (it hit something); `remove_spent` frees it."""
+        self.life[i] = 0.0
+
+    def remove_spent(self):
+        # Backwards, so the projectile moved into a freed slot has already been looked at
+        life = self.life
+        for i in range(self.count - 1, -1, -1):
+            if life[i] <= 0.0:
+                self.despawn(i)
+
+    def update(self, dt, left, right):
+        """Move every projectile, age it, and free the expired ones and those fully outside [left, right]."""
+        self.last_dt = dt
+        x, vx, w, life = self.x, self.vx, self.w, self.life
+        for i in range(self.count - 1, -1, -1):
+            nx = x[i] + vx[i] * dt
+            x[i] = nx
+            life[i] -= dt
+            if life[i] <= 0.0 or nx + w[i] <= left or nx >= right:
+                self.despawn(i)
+
+    def snapshot(self):
+        """Live projectiles as a tuple of (owner, x, y, vx, w, h, life, dmg) tuples (empty when none)."""
+        return tuple(
+            (self.owner[i], self.x[i], self.y[i], self.vx[i], self.w[i], self.h[i], self.life[i], self.dmg[i])
+            for i in range(self.count)
+        )
+
+    def restore(self, snap):
+        self.count = 0
+        for owner, x, y, vx, w, h, life, dmg in snap:
+            self.spawn(owner, x, y, vx, w, h, life, dmg)
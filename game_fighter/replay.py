@@ -0,0 +1,196 @@
+"""
+Compact input replays: match setup plus one record per simulation tick.
+
+A replay stores what a `Match` consumed, not what it produced. Setup (characters,
+stage, gameplay seed, tick rate) goes into a small JSON header; the tick stream is
+zlib-compressed bytes:
+
+- step:  two bytes, the P1 and P2 command bits (always < 0x80)
+- idle:  `OP_IDLE` (a `Match.step_idle` tick: intros, round over)
+- reset: `OP_RESET` followed by `RESET_STRUCT` (stage width, floor y, render scale)
+
+Because every gameplay random draw comes from the match's seeded stream, playing the
+ticks back through a fresh `Match.headless(...)` reproduces the match bit for bit.
+"""
+
+import json
+import struct
+import zlib
+
+from game_fighter.ai_scheduler import ScheduledController
+from game_fighter.fixed_physics import FixedMatch
+from game_fighter.match import Match
+from game_fighter.rollback import state_checksum
+
+MAGIC = b"SFRP"
+VERSION = 1
+# magic, version, header length
+FILE_HEADER = struct.Struct("<4sBI")
+RESET_STRUCT = struct.Struct("<ddd")
+CMD_MASK = 0x7F
+OP_IDLE = 0x80
+OP_RESET = 0x81
+
+
+def apply_reset(match, stage_width, floor_y, render_scale):
+    """Replay an `OP_RESET` record: restore the stage geometry it captured, then reset the round."""
+    match.stage_width = stage_width
+    match.floor_y = floor_y
+    match.p1.render_scale = match.p2.render_scale = render_scale
+    match.reset_round()
+
+
+def run_ops(match, ops, dt, start=0, tick=0, stop_tick=None, on_tick=None):
+    """
+    Feed tick records from `ops[start:]` to `match`.
+
+    Stops at the end of `ops`, or once `stop_tick` ticks have run and no reset record
+    follows (so the state matches a keyframe taken at that tick). Returns (offset, tick).
+    """
+    n = len(ops)
+    i = start
+    while i < n:
+        op = ops[i]
+        if op == OP_RESET:
+            apply_reset(match, *RESET_STRUCT.unpack_from(ops, i + 1))
+            i += 1 + RESET_STRUCT.size
+            continue
+        if stop_tick is not None and tick >= stop_tick:
+            break
+        if op < OP_IDLE:
+            match.step(dt, op, ops[i + 1])
+            i += 2
+        elif op == OP_IDLE:
+            match.step_idle(dt)
+            i += 1
+        else:
+            raise ValueError(f"bad replay op 0x{op:02x} at byte {i}")
+        tick += 1
+        if on_tick is not None:
+            on_tick(match, tick)
+    return i, tick
+
+
+def count_ticks(ops):
+    """Number of ticks (step and idle records) in a tick stream."""
+    n = len(ops)
+    i = 0
+    ticks = 0
+    while i < n:
+        op = ops[i]
+        if op < OP_IDLE:
+            i += 2
+        elif op == OP_IDLE:
+            i += 1
+        elif op == OP_RESET:
+            i += 1 + RESET_STRUCT.size
+            continue
+        else:
+            raise ValueError(f"bad replay op 0x{op:02x} at byte {i}")
+        ticks += 1
+    return ticks
+
+
+class ReplayRecorder:
+    """
+    Collect tick records from a `Match` (set `match.recorder = recorder`).
+
+    `setup` is a dict with at least `p1`, `p2` (roster keys), `seed` and `tick_rate`;
+    anything else JSON-serializable (stage key, AI flags) is stored as-is.
+    """
+
+    def __init__(self, setup):
+        self.setup = dict(setup)
+        self.ticks = 0
+        self._ops = bytearray()
+
+    def step(self, p1_cmd, p2_cmd):
+        self._ops += bytes((p1_cmd & CMD_MASK, p2_cmd & CMD_MASK))
+        self.ticks += 1
+
+    def idle(self):
+        self._ops.append(OP_IDLE)
+        self.ticks += 1
+
+    def reset_round(self, stage_width, floor_y, render_scale):
+        self._ops.append(OP_RESET)
+        self._ops += RESET_STRUCT.pack(stage_width, floor_y, render_scale)
+
+    def to_bytes(self, checksum=None):
+        """Serialize; `checksum` (e.g. `state_checksum(match.snapshot())`) lets playback verify the end state."""
+        header = dict(self.setup, version=VERSION, ticks=self.ticks, checksum=checksum)
+        header_bytes = json.dumps(header, sort_keys=True).encode("utf-8")
+        return FILE_HEADER.pack(MAGIC, VERSION, len(header_bytes)) + header_bytes + zlib.compress(bytes(self._ops), 9)
+
+    def save(self, path, checksum=None):
+        with open(path, "wb") as f:
+            f.write(self.to_bytes(checksum))
+
+
+class Replay:
+    """A loaded replay: `setup` (header dict) plus the raw tick stream `ops`."""
+
+    def __init__(self, setup, ops):
+        self.setup = setup
+        self.ops = ops
+
+    @classmethod
+    def from_bytes(cls, data):
+        if len(data) < FILE_HEADER.size:
+            raise ValueError("replay file is truncated")
+        magic, version, header_len = FILE_HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError("not a replay file")
+        if version != VERSION:
+            raise ValueError(f"unsupported replay version {version}")
+        start = FILE_HEADER.size
+        setup = json.loads(data[start:start + header_len].decode("utf-8"))
+        ops = zlib.decompress(data[start + header_len:])
+        return cls(setup, ops)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
+
+    @property
+    def dt(self):
+        return 1.0 / self.setup["tick_rate"]
+
+    def build_match(self):
+        """
+        Fresh headless match in the recorded setup (same seed, so the same random draws).
+        Replays recorded before motion commands existed (no `motion_inputs` key) play
+        with them off, so their inputs mean what they meant then. An `ai_hz` key runs the
+        CPU sides through a `ScheduledController` at that think rate, and a true
+        `fixed_point` key builds a `FixedMatch` at the recorded tick rate.
+        """
+        s = self.setup
+        kwargs = dict(tick_rate=s["tick_rate"]) if s.get("fixed_point") else {}
+        match = (FixedMatch if s.get("fixed_point") else Match).headless(
+            s["p1"], s["p2"],
+            stage_width=s.get("stage_width", 1280),
+            p1_ai=s.get("p1_ai", False),
+            p2_ai=s.get("p2_ai", True),
+            seed=s["seed"],
+            **kwargs,
+        )
+        match.motion_inputs = s.get("motion_inputs", False)
+        if s.get("ai_hz"):
+            match.controllers = [ScheduledController(c, s["ai_hz"]) if c is not None else None for c in match.controllers]
+        return match
+
+    def play(self, match=None, on_tick=None):
+        """
+        Run every recorded tick as fast as possible and return the match.
+
+        `on_tick(match, tick)` is called after each tick (hook for pacing or drawing).
+        """
+        match = match if match is not None else self.build_match()
+        run_ops(match, self.ops, self.dt, on_tick=on_tick)
+        return match
+
+    def verify(self, match):
+        """True when the match ended in the recorded state (or the replay has no checksum)."""
+        expected = self.setup.get("checksum")
+        return expected is None or state_checksum(match.snapshot()) == expected
@@ -0,0 +1,254 @@
+"""
+Keyframed replay container: the `replay.py` tick stream interleaved with periodic
+full-state keyframes and a trailing index, for fast seeking in long sessions.
+
+Layout (little-endian):
+
+    FILE_HEADER + JSON setup
+    blocks: BLOCK_HEAD (tag, payload length) + payload
+        b"I"  raw tick records (same encoding as `replay.py`)
+        b"K"  KEYFRAME_HEAD (tick, stage width, floor y, render scale) + zlib(marshal(Match.snapshot()))
+        b"X"  INDEX_HEAD (ticks, entries, checksum) + INDEX_ENTRY (tick, K block offset) per keyframe
+    FOOTER (X block offset, FOOTER_MAGIC)
+
+Blocks are only ever appended, so a recording is readable while it is still being
+written (or after a crash): without a footer the reader scans the blocks instead.
+Finished files are memory-mapped, and seeking restores the nearest keyframe at or
+before the target and re-simulates at most one keyframe interval.
+
+Keyframes use `marshal`, so they are tied to the Python version that wrote them; the
+tick stream alone still plays back from frame 0 anywhere.
+"""
+
+import bisect
+import json
+import marshal
+import mmap
+import struct
+import zlib
+
+from game_fighter.replay import FILE_HEADER, OP_IDLE, OP_RESET, RESET_STRUCT, CMD_MASK, Replay, count_ticks, run_ops
+
+MAGIC = b"SFRK"
+# 2: flat `Fighter.snapshot` layout with integer attack phases
+# 3: `Match.snapshot` ends with the live projectiles
+# 4: ...and the per-side input buffers and motion matchers
+VERSION = 4
+BLOCK_HEAD = struct.Struct("<cI")
+KEYFRAME_HEAD = struct.Struct("<Iddd")
+INDEX_HEAD = struct.Struct("<IIq")
+INDEX_ENTRY = struct.Struct("<IQ")
+FOOTER = struct.Struct("<Q4s")
+FOOTER_MAGIC = b"SFRX"
+TAG_INPUTS = b"I"
+TAG_KEYFRAME = b"K"
+TAG_INDEX = b"X"
+# 5 s at 60 Hz: a seek re-simulates at most this many ticks (a few ms headless)
+DEFAULT_KEYFRAME_INTERVAL = 300
+MARSHAL_VERSION = 4
+
+
+class KeyframeRecorder:
+    """
+    Append a keyframed replay to `path` while `match` plays (set `match.recorder = recorder`).
+
+    A keyframe is written before every `interval`-th tick, after flushing the tick
+    records that led up to it; `flush()` pushes pending records out early and
+    `close(checksum=None)` writes the index and footer.
+    """
+
+    def __init__(self, setup, path, match, interval=DEFAULT_KEYFRAME_INTERVAL):
+        self.setup = dict(setup)
+        self.match = match
+        self.interval = max(1, int(interval))
+        self.ticks = 0
+        self.keyframes = []  # (tick, block offset)
+        self._ops = bytearray()
+        self._file = open(path, "wb")
+        header_bytes = json.dumps(dict(self.setup, version=VERSION), sort_keys=True).encode("utf-8")
+        self._write(FILE_HEADER.pack(MAGIC, VERSION, len(header_bytes)) + header_bytes)
+
+    def _write(self, data):
+        self._file.write(data)
+
+    def _block(self, tag, payload):
+        offset = self._file.tell()
+        self._write(BLOCK_HEAD.pack(tag, len(payload)))
+        self._write(payload)
+        return offset
+
+    def _maybe_keyframe(self):
+        if self.ticks % self.interval:
+            return
+        self.flush()
+        m = self.match
+        head = KEYFRAME_HEAD.pack(self.ticks, m.stage_width, m.floor_y, m.p1.render_scale)
+        state = zlib.compress(marshal.dumps(m.snapshot(), MARSHAL_VERSION), 1)
+        self.keyframes.append((self.ticks, self._block(TAG_KEYFRAME, head + state)))
+        self._file.flush()
+
+    def step(self, p1_cmd, p2_cmd):
+        # Called before the tick runs, so the keyframe holds the state it starts from
+        self._maybe_keyframe()
+        self._ops += bytes((p1_cmd & CMD_MASK, p2_cmd & CMD_MASK))
+        self.ticks += 1
+
+    def idle(self):
+        self._maybe_keyframe()
+        self._ops.append(OP_IDLE)
+        self.ticks += 1
+
+    def reset_round(self, stage_width, floor_y, render_scale):
+        self._ops.append(OP_RESET)
+        self._ops += RESET_STRUCT.pack(stage_width, floor_y, render_scale)
+
+    def flush(self):
+        if self._ops:
+            self._block(TAG_INPUTS, bytes(self._ops))
+            self._ops.clear()
+        self._file.flush()
+
+    def close(self, checksum=None):
+        if self._file.closed:
+            return
+        self.flush()
+        entries = b"".join(INDEX_ENTRY.pack(tick, offset) for tick, offset in self.keyframes)
+        head = INDEX_HEAD.pack(self.ticks, len(self.keyframes), -1 if checksum is None else checksum)
+        index_offset = self._block(TAG_INDEX, head + entries)
+        self._write(FOOTER.pack(index_offset, FOOTER_MAGIC))
+        self._file.close()
+
+    def save(self, path=None, checksum=None):
+        """`ReplayRecorder`-compatible finish: the file already lives at the constructor's path."""
+        self.close(checksum)
+
+
+class KeyframedReplay(Replay):
+    """
+    Memory-mapped keyframed replay. `setup` gains `ticks` and `checksum` from the index
+    (or from a block scan for unfinished files). `play` runs from frame 0 like `Replay`;
+    `seek(tick)` jumps via the nearest keyframe.
+    """
+
+    def __init__(self, path):
+        self._f = open(path, "rb")
+        self._map = mmap.mmap(self._f.fileno(), 0, access=mmap.ACCESS_READ)
+        data = self._map
+        if len(data) < FILE_HEADER.size:
+            raise ValueError("replay file is truncated")
+        magic, version, header_len = FILE_HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError("not a keyframed replay file")
+        if not 1 <= version <= VERSION:
+            raise ValueError(f"unsupported keyframed replay version {version}")
+        self._blocks_start = FILE_HEADER.size + header_len
+        setup = json.loads(bytes(data[FILE_HEADER.size:self._blocks_start]).decode("utf-8"))
+        self.keyframes = []  # (tick, block offset), ascending
+        if not self._read_index(setup):
+            self._scan(setup)
+        if version < VERSION:
+            # Keyframes hold an older snapshot layout; seeks re-simulate from frame 0
+            self.keyframes = []
+        self._kf_ticks = [tick for tick, _ in self.keyframes]
+        self.setup = setup
+
+    @classmethod
+    def load(cls, path):
+        return cls(path)
+
+    def close(self):
+        self._map.close()
+        self._f.close()
+
+    # ---------------------------
+    # INDEX
+    # ---------------------------
+    def _blocks(self, offset=None):
+        """Yield (tag, block offset, payload start, payload end); stops at a partially written block."""
+        data = self._map
+        n = len(data)
+        pos = self._blocks_start if offset is None else offset
+        while pos + BLOCK_HEAD.size <= n:
+            tag, length = BLOCK_HEAD.unpack_from(data, pos)
+            start = pos + BLOCK_HEAD.size
+            if start + length > n:
+                return
+            yield tag, pos, start, start + length
+            pos = start + length
+
+    def _read_index(self, setup):
+        data = self._map
+        if len(data) < self._blocks_start + FOOTER.size:
+            return False
+        index_offset, magic = FOOTER.unpack_from(data, len(data) - FOOTER.size)
+        if magic != FOOTER_MAGIC:
+            return False
+        tag, length = BLOCK_HEAD.unpack_from(data, index_offset)
+        if tag != TAG_INDEX:
+            return False
+        pos = index_offset + BLOCK_HEAD.size
+        ticks, count, checksum = INDEX_HEAD.unpack_from(data, pos)
+        pos += INDEX_HEAD.size
+        self.keyframes = [INDEX_ENTRY.unpack_from(data, pos + i * INDEX_ENTRY.size) for i in range(count)]
+        setup["ticks"] = ticks
+        setup["checksum"] = None if checksum < 0 else checksum
+        return True
+
+    def _scan(self, setup):
+        ticks = 0
+        for tag, offset, start, end in self._blocks():
+            if tag == TAG_KEYFRAME:
+                self.keyframes.append((KEYFRAME_HEAD.unpack_from(self._map, start)[0], offset))
+            elif tag == TAG_INPUTS:
+                ticks += count_ticks(self._map[start:end])
+        setup["ticks"] = ticks
+        setup["checksum"] = None
+
+    # ---------------------------
+    # PLAYBACK
+    # ---------------------------
+    def _ops_from(self, offset=None, until_keyframe=False):
+        chunks = []
+        for tag, _, start, end in self._blocks(offset):
+            if tag == TAG_INPUTS:
+                chunks.append(self._map[start:end])
+            elif tag == TAG_KEYFRAME and until_keyframe and chunks:
+                break
+            elif tag == TAG_INDEX:
+                break
+        return b"".join(chunks)
+
+    @property
+    def ops(self):
+        """The whole tick stream (keyframes skipped), read from the map on demand."""
+        return self._ops_from()
+
+    def restore_keyframe(self, match, offset):
+        """Load the keyframe block at `offset` into `match`; returns its tick."""
+        start = offset + BLOCK_HEAD.size
+        tick, stage_width, floor_y, render_scale = KEYFRAME_HEAD.unpack_from(self._map, start)
+        tag, length = BLOCK_HEAD.unpack_from(self._map, offset)
+        state = marshal.loads(zlib.decompress(self._map[start + KEYFRAME_HEAD.size:start + length]))
+        match.stage_width = stage_width
+        match.floor_y = floor_y
+        for fighter in (match.p1, match.p2):
+            fighter.stage_width = stage_width
+            fighter.floor_y = floor_y
+            fighter.render_scale = render_scale
+        match.restore(state)
+        return tick
+
+    def seek(self, tick, match=None):
+        """Return a match in the state after `tick` ticks (reusing `match`, if given, when a keyframe applies)."""
+        tick = max(0, min(tick, self.setup["ticks"]))
+        i = bisect.bisect_right(self._kf_ticks, tick) - 1
+        if i < 0:
+            # No keyframe yet (empty recording): simulate from frame 0
+            match = self.build_match()
+            run_ops(match, self.ops, self.dt, stop_tick=tick)
+            return match
+        match = match if match is not None else self.build_match()
+        kf_tick, offset = self.keyframes[i]
+        self.restore_keyframe(match, offset)
+        run_ops(match, self._ops_from(offset, until_keyframe=True), self.dt, tick=kf_tick, stop_tick=tick)
+        return match
@@ -0,0 +1,164 @@
+"""
+GGPO-style rollback session on top of `Match.snapshot` / `Match.restore`.
+
+Each peer simulates immediately with its own input and a prediction of the remote
+player's input (their last confirmed held bits). When a remote input arrives that
+differs from the prediction, the session restores the snapshot taken before that frame
+and re-simulates up to the present within the same render frame.
+"""
+
+import zlib
+
+from game_fighter.input_manager import ACTION_BITS
+
+HELD_BITS = 0
+for _bit in ACTION_BITS.values():
+    HELD_BITS |= _bit
+
+DEFAULT_MAX_ROLLBACK = 8
+
+
+def predict_input(last_cmd):
+    """Predict the next remote command: keep held directions/buttons, drop one-shot presses."""
+    return last_cmd & HELD_BITS
+
+
+def _canonical(value):
+    # 780 vs 780.0 or -0.0 vs 0.0 simulate identically; don't let them read as a desync
+    if isinstance(value, tuple):
+        return tuple(_canonical(v) for v in value)
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value) + 0.0
+    return value
+
+
+def state_checksum(snap):
+    """Stable (process-independent) checksum of a match snapshot for desync detection."""
+    return zlib.crc32(repr(_canonical(snap)).encode("ascii"))
+
+
+class RollbackSession:
+    """
+    Drive a `Match` for one local player against one remote player.
+
+    `local_player` is 0 (P1) or 1 (P2). Frames are simulation ticks of `dt` seconds.
+    Call `add_local_input(cmd)` once per tick, feed network inputs to
+    `add_remote_input(frame, cmd)`, then call `advance()`; it returns False (stall)
+    when the local side is more than `max_rollback` frames ahead of confirmed remote input.
+
+    `Match.step` clears `match.events` every tick, so after `advance()` read `events`
+    instead: (frame, event) pairs from every frame it simulated, re-simulated ones first.
+    When it rolled back, `resimulated_from` is the first re-simulated frame, and those
+    events replace whatever was reported earlier for that frame and later ones.
+    """
+
+    def __init__(self, match, local_player, dt, max_rollback=DEFAULT_MAX_ROLLBACK, input_delay=0):
+        self.match = match
+        self.local_player = local_player
+        self.dt = dt
+        self.max_rollback = max_rollback
+        self.input_delay = input_delay
+        self.frame = 0  # next frame to simulate
+        # Both peers must use the same input delay; the first frames carry no input
+        self.local_inputs = {f: 0 for f in range(input_delay)}
+        self.remote_inputs = {f: 0 for f in range(input_delay)}
+        self.predicted = {}  # frame -> remote cmd guessed while simulating
+        self.confirmed_remote_frame = input_delay - 1  # every remote input up to here is known
+        self._last_confirmed_cmd = 0
+        self._snapshots = [None] * (max_rollback + 2)
+        self._rollback_to = None
+        self.next_local_frame = input_delay
+        self._oldest_frame = 0
+        # (frame, event) pairs simulated by the last advance(); see class docstring
+        self.events = []
+        self.resimulated_from = None
+        # Stats
+        self.rollbacks = 0
+        self.resimulated_frames = 0
+        self.stalls = 0
+
+    # ---------------------------
+    # INPUTS
+    # ---------------------------
+    def add_local_input(self, cmd):
+        """Queue this tick's local command; returns the frame it applies to (after input delay)."""
+        frame = self.next_local_frame
+        self.local_inputs[frame] = cmd
+        self.next_local_frame += 1
+        return frame
+
+    def add_remote_input(self, frame, cmd):
+        if frame <= self.confirmed_remote_frame or frame in self.remote_inputs:
+            return
+        self.remote_inputs[frame] = cmd
+        while self.confirmed_remote_frame + 1 in self.remote_inputs:
+            self.confirmed_remote_frame += 1
+            self._last_confirmed_cmd = self.remote_inputs[self.confirmed_remote_frame]
+        predicted = self.predicted.pop(frame, None)
+        if predicted is not None and predicted != cmd:
+            if self._rollback_to is None or frame < self._rollback_to:
+                self._rollback_to = frame
+
+    def _remote_cmd(self, frame):
+        cmd = self.remote_inputs.get(frame)
+        if cmd is None:
+            cmd = predict_input(self._last_confirmed_cmd)
+            self.predicted[frame] = cmd
+        return cmd
+
+    # ---------------------------
+    # SIMULATION
+    # ---------------------------
+    def _simulate(self, frame):
+        self._snapshots[frame % len(self._snapshots)] = (frame, self.match.snapshot())
+        local = self.local_inputs.get(frame, 0)
+        remote = self._remote_cmd(frame)
+        if self.local_player == 0:
+            self.match.step(self.dt, local, remote)
+        else:
+            self.match.step(self.dt, remote, local)
+        for event in self.match.events:
+            self.events.append((frame, event))
+
+    def _rollback(self):
+        target = self._rollback_to
+        self._rollback_to = None
+        stored = self._snapshots[target % len(self._snapshots)]
+        if stored is None or stored[0] != target:
+            raise RuntimeError(f"rollback to frame {target} exceeds the snapshot window")
+        self.match.restore(stored[1])
+        self.resimulated_from = target
+        self.rollbacks += 1
+        for frame in range(target, self.frame):
+            self._simulate(frame)
+            self.resimulated_frames += 1
+
+    def can_advance(self):
+        return self.frame - self.confirmed_remote_frame <= self.max_rollback and self.frame in self.local_inputs
+
+    def advance(self):
+        """Roll back if needed, then simulate the next frame. Returns False when stalled."""
+        self.events = []
+        self.resimulated_from = None
+        if self._rollback_to is not None:
+            self._rollback()
+        if not self.can_advance():
+            self.stalls += 1
+            return False
+        self._simulate(self.frame)
+        self.frame += 1
+        self._forget_old_frames()
+        return True
+
+    def _forget_old_frames(self):
+        # Confirmed frames that fell out of the snapshot window can never be rolled back to
+        horizon = min(self.confirmed_remote_frame, self.frame - len(self._snapshots))
+        while self._oldest_frame < horizon:
+            f = self._oldest_frame
+            self.local_inputs.pop(f, None)
+            self.remote_inputs.pop(f, None)
+            self.predicted.pop(f, None)
+            self._oldest_frame += 1
+
+    def checksum(self):
+        return state_checksum(self.match.snapshot())
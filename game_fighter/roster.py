@@ -0,0 +1,45 @@
+"""Character asset tables shared by the game widget and the headless simulation."""
+
+import os
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+ASSETS_DIR = os.path.join(BASE_DIR, "assets")
+
+
+def load_ryu_assets():
+    folder = os.path.join(ASSETS_DIR, "ryu_sprites_project")
+    return {
+        "idle": os.path.join(folder, "Idle.png"),
+        "run": os.path.join(folder, "Walk.png"),
+        "jump": os.path.join(folder, "Jump.png"),
+        "attack": os.path.join(folder, "right_punch.png"),
+        "hit": os.path.join(folder, "Hit.png"),
+        "defeat": os.path.join(folder, "Defeat.png"),
+        "victory": [
+            os.path.join(folder, "victory_1.png"),
+            os.path.join(folder, "victory_2.png"),
+        ],
+    }
+
+
+def load_ken_assets():
+    folder = os.path.join(ASSETS_DIR, "ken_sprites_project")
+    return {
+        "idle": os.path.join(folder, "idle_ken.png"),
+        "run": os.path.join(folder, "Walking_Ken.png"),
+        "jump": os.path.join(folder, "ken_jump.png"),
+        "attack": os.path.join(folder, "ken_right_punch.png"),
+        "hit": os.path.join(folder, "ken_hit.png"),
+        "defeat": os.path.join(folder, "ken_defeat.png"),
+        "victory": [
+            os.path.join(folder, "ken_victory_1.png"),
+            os.path.join(folder, "ken_victory_2.png"),
+        ],
+    }
+
+
+# Lowercase character key -> asset loader
+CHARACTERS = {
+    "ryu": load_ryu_assets,
+    "ken": load_ken_assets,
+}
@@ -0,0 +1,92 @@
+"""
+Run-ahead: draw the match a few ticks in the future.
+
+After a frame's real ticks, `begin` snapshots the match, simulates `frames` more ticks
+with the current held input, and leaves that speculative state in place for the
+renderer; `end` restores the snapshot so the real simulation never sees it. The
+jump-squat and attack startup a press has to get through before anything moves are
+then already on screen the frame the press is read. A wrong guess (the input changes)
+only shows for the frames it would have taken to appear anyway.
+
+The speculative ticks cost CPU every frame, so `RunAhead` times itself: `stats()`
+reports the extra milliseconds per frame, to be weighed against the frame budget.
+"""
+
+import time
+
+from game_fighter.rollback import predict_input
+
+# Weight of the newest frame in the running average cost
+COST_SMOOTHING = 0.05
+
+
+def _speculate(match, on):
+    for controller in match.controllers:
+        if hasattr(controller, "speculating"):
+            controller.speculating = on
+
+
+class RunAhead:
+    """Speculate `frames` ticks ahead of `match` for display only (see module docstring)."""
+
+    def __init__(self, match, frames=1, clock=time.perf_counter):
+        self.match = match
+        self.frames = frames
+        self.clock = clock
+        self.active = False
+        # Fighter positions one tick before the speculative state, for render interpolation
+        self.prev_positions = None
+        self._snap = None
+        self._events = None
+        self._recorder = None
+        self._spent = 0.0
+        self.last_ms = 0.0
+        self.avg_ms = 0.0
+        self.max_ms = 0.0
+        self.runs = 0
+
+    def begin(self, dt, p1_cmd=0, p2_cmd=0):
+        """Save the match and simulate ahead; one-shot presses are not repeated (held bits only)."""
+        match = self.match
+        started = self.clock()
+        self._snap = match.snapshot()
+        self._events = match.events
+        # Speculative ticks must not reach the replay, nor a threaded controller's worker
+        self._recorder, match.recorder = match.recorder, None
+        _speculate(match, True)
+        p1_cmd = predict_input(p1_cmd)
+        p2_cmd = predict_input(p2_cmd)
+        p1, p2 = match.p1, match.p2
+        for _ in range(self.frames):
+            self.prev_positions = (p1.x, p1.y, p2.x, p2.y)
+            match.step(dt, p1_cmd, p2_cmd)
+        self.active = True
+        self._spent = self.clock() - started
+
+    def end(self):
+        """Put the real state back and account for the frame's cost (drawing in between not included)."""
+        if not self.active:
+            return
+        started = self.clock()
+        match = self.match
+        match.restore(self._snap)
+        match.events = self._events
+        match.recorder = self._recorder
+        _speculate(match, False)
+        self._snap = self._events = self._recorder = None
+        self.active = False
+        ms = (self._spent + self.clock() - started) * 1000.0
+        self.last_ms = ms
+        self.avg_ms = ms if not self.runs else self.avg_ms + (ms - self.avg_ms) * COST_SMOOTHING
+        self.max_ms = max(self.max_ms, ms)
+        self.runs += 1
+
+    def stats(self, frame_budget=1.0 / 60):
+        """Extra cost per frame in ms, and the average as a share of `frame_budget` seconds."""
+        return {
+            "frames": self.frames,
+            "last_ms": self.last_ms,
+            "avg_ms": self.avg_ms,
+            "max_ms": self.max_ms,
+            "budget_pct": self.avg_ms / (frame_budget * 1000.0) * 100.0,
+        }
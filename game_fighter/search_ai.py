@@ -0,0 +1,256 @@
+"""
+Lookahead CPU opponent: plays out candidate actions in a private headless match.
+
+Every `think` seconds `SearchAIController` copies both fighters into its own
+render-free `Match`, tries each candidate plan (approach, retreat, jump in, punch,
+hold) against a few guesses of the opponent's reply over a short horizon, and scores
+the outcome (damage traded, KO, spacing). The winning plan is then played as command
+bits until the next decision.
+
+A decision has a hard wall-clock budget, checked before each rollout (against the
+slowest rollout of this decision or the last) and on every rollout tick. If the rollouts cannot finish inside
+it, the decision is abandoned and the tick is played by the regular `AIController`
+decision tree instead. Building the private match (once per pairing of sprites) happens
+before the decision's clock starts. Every decision's latency goes into a `LatencyHistogram`.
+
+The live match's projectiles are not visible to the controller, so rollouts ignore them.
+"""
+
+import random
+import time
+
+from game_fighter.ai import AIController, new_ai_context
+from game_fighter.constants import SPRITE_SIZE, STAGE_MARGIN
+from game_fighter.input_manager import JUMP_PRESSED, LEFT, PUNCH, PUNCH_PRESSED, RIGHT
+from game_fighter.fighter import Fighter
+from game_fighter.fixed_physics import FixedFighter
+from game_fighter.latency import LatencyHistogram
+from game_fighter.match import GRAVITY, Match, apply_command
+
+SEARCH_BUDGET = 0.006  # seconds of CPU per decision before falling back to the tree
+SEARCH_THINK = 0.1  # seconds between decisions
+SEARCH_HORIZON = 0.35  # seconds each rollout looks ahead
+SEARCH_DT = 1.0 / 20  # rollout tick (swept collision keeps coarse ticks honest)
+PREFERRED_RANGE = SPRITE_SIZE * 0.6  # spacing the scorer likes, px between fighters
+
+# Candidate plans: (name, bits pressed on the first tick, walk direction: 1 toward, -1 away)
+PLANS = (
+    ("approach", 0, 1),
+    ("retreat", 0, -1),
+    ("jump_in", JUMP_PRESSED, 1),
+    ("punch", PUNCH | PUNCH_PRESSED, 0),
+    ("hold", 0, 0),
+)
+PLAN_BY_NAME = {plan[0]: plan for plan in PLANS}
+# Opponent replies each plan is tested against: keep walking as now (None), step in, or poke
+REPLIES = (
+    ("keep", 0, None),
+    ("approach", 0, 1),
+    ("punch", PUNCH | PUNCH_PRESSED, 0),
+)
+
+_SHEETS = ("idle", "run", "jump", "attack", "hit", "defeat")
+
+
+def new_search_context():
+    ctx = new_ai_context()
+    ctx.update(plan=None, plan_tick=0, think=0.0)
+    return ctx
+
+
+def _sprite_paths(fighter):
+    """Sprite path table a headless twin of `fighter` is built from."""
+    sheets = fighter.sprite.sheets
+    paths = {key: sheets[key]["path"] for key in _SHEETS}
+    paths["victory"] = [sheets["victory"]["path"]]
+    return paths
+
+
+def _walk_bits(direction, toward):
+    """LEFT / RIGHT for walking `direction` (1 toward, -1 away, 0 stand) when the opponent is at `toward`."""
+    side = direction * toward
+    if side > 0:
+        return RIGHT
+    if side < 0:
+        return LEFT
+    return 0
+
+
+def headless_twin(fighter, stage_width, rng):
+    """Headless copy of `fighter` (same sprites, speeds, punch and physics mode) for rollouts."""
+    # A `CommandCapture` stands in for its fighter, so ask for the tick rate rather than the type
+    tick_rate = getattr(fighter, "tick_rate", None)
+    cls, kwargs = (FixedFighter, dict(tick_rate=tick_rate)) if tick_rate else (Fighter, {})
+    twin = cls(fighter.x, fighter.y, _sprite_paths(fighter), fighter.floor_y, stage_width,
+               move_speed=fighter.move_speed, jump_speed=fighter.jump_speed, rng=rng, **kwargs)
+    twin.attack_cfg = dict(fighter.attack_cfg)
+    return twin
+
+
+class SearchAIController(AIController):
+    """
+    Lookahead difficulty tier (see module docstring). Decision stats: `decisions`,
+    `fallbacks`, `rollouts`, `overruns` (decisions that ended past the budget: only a
+    single rollout tick, or the OS, can still push one over), `last_ms`, `max_ms` and the
+    `decision_ms` histogram.
+    """
+
+    def __init__(self, rng=None, budget=SEARCH_BUDGET, think=SEARCH_THINK, horizon=SEARCH_HORIZON,
+                 sim_dt=SEARCH_DT, gravity=GRAVITY, clock=time.perf_counter):
+        super().__init__(rng)
+        self.ctx = new_search_context()
+        self.budget = budget
+        self.think = think
+        self.horizon = horizon
+        self.sim_dt = sim_dt
+        self.gravity = gravity
+        self.clock = clock
+        self.sim = None
+        self._sim_key = None
+        self._rollout_s = 0.0  # slowest rollout of the last decision
+        self.decision_ms = LatencyHistogram()
+        self.decisions = 0
+        self.fallbacks = 0
+        self.rollouts = 0
+        self.overruns = 0
+        self.last_ms = 0.0
+        self.max_ms = 0.0
+
+    def reset(self):
+        self.ctx = new_search_context()
+
+    def stats(self):
+        return {
+            "decisions": self.decisions,
+            "fallbacks": self.fallbacks,
+            "rollouts": self.rollouts,
+            "overruns": self.overruns,
+            "last_ms": self.last_ms,
+            "max_ms": self.max_ms,
+            **{f"p{q}": self.decision_ms.percentile(q) for q in (50, 95, 99)},
+        }
+
+    # ---------------------------
+    # PLANNING
+    # ---------------------------
+    def _build_planner(self, me, opponent, stage_width):
+        """Private headless match with twins of both fighters (me = P1), rebuilt when sprites change."""
+        key = (me.sprite.sheets["idle"]["path"], opponent.sprite.sheets["idle"]["path"], stage_width)
+        if self.sim is None or self._sim_key != key:
+            rng = random.Random(0)
+            self.sim = Match(headless_twin(me, stage_width, rng), headless_twin(opponent, stage_width, rng), stage_width, me.floor_y, gravity=self.gravity, controllers=[None, None], rng=rng)
+            self.sim.motion_inputs = False
+            self._sim_key = key
+        return self.sim
+
+    def _planner(self, me, opponent, stage_width):
+        """The planner match (see `_build_planner`) loaded with the live fighters."""
+        sim = self._build_planner(me, opponent, stage_width)
+        for twin, live in ((sim.p1, me), (sim.p2, opponent)):
+            twin.floor_y = live.floor_y
+            twin.render_scale = live.render_scale
+            twin.restore(live.snapshot())
+        sim.floor_y = me.floor_y
+        return sim
+
+    def _decide(self, me, opponent, stage_width):
+        """Best plan name, or None when the budget ran out first."""
+        # Building the planner is a one-off per pairing, kept out of the timed decision
+        self._build_planner(me, opponent, stage_width)
+        start = self.clock()
+        deadline = start + self.budget
+        sim = self._planner(me, opponent, stage_width)
+        me_snap, opp_snap = sim.p1.snapshot(), sim.p2.snapshot()
+        toward = 1 if opponent.x > me.x else -1
+        keep = RIGHT if opponent.vx > 0 else LEFT if opponent.vx < 0 else 0
+        ticks = max(1, int(round(self.horizon / self.sim_dt)))
+        best, best_score = None, None
+        slowest = 0.0
+        for name, press, walk in PLANS:
+            held = _walk_bits(walk, toward)
+            total = 0.0
+            for _, reply_press, reply_walk in REPLIES:
+                # Give up before a rollout that the slowest one (this decision or the last) says will not fit
+                began = self.clock()
+                score = None
+                if began + max(slowest, self._rollout_s) <= deadline:
+                    opp_held = keep if reply_walk is None else _walk_bits(reply_walk, -toward)
+                    sim.p1.restore(me_snap)
+                    sim.p2.restore(opp_snap)
+                    score = self._rollout(sim, ticks, press | held, held, reply_press | opp_held, opp_held, deadline)
+                if score is None:
+                    self._record(start, slowest)
+                    return None
+                slowest = max(slowest, self.clock() - began)
+                total += score
+                self.rollouts += 1
+            score = total / len(REPLIES)
+            if best_score is None or score > best_score:
+                best, best_score = name, score
+        self._record(start, slowest)
+        return best
+
+    def _rollout(self, sim, ticks, first, held, opp_first, opp_held, deadline):
+        """Score of one rollout, or None if `deadline` passed during it."""
+        me, opp = sim.p1, sim.p2
+        me_hp, opp_hp = me.hp, opp.hp
+        clock = self.clock
+        for tick in range(ticks):
+            if clock() > deadline:
+                return None
+            sim.step(self.sim_dt, first if tick == 0 else held, opp_first if tick == 0 else opp_held)
+            if me.defeated or opp.defeated:
+                break
+        score = (opp_hp - opp.hp) - 1.2 * (me_hp - me.hp)
+        if opp.defeated:
+            score += 50.0
+        if me.defeated:
+            score -= 60.0
+        score -= abs(abs(opp.x - me.x) - PREFERRED_RANGE) * 0.01
+        if me.x < STAGE_MARGIN + SPRITE_SIZE * 0.4 or me.x > sim.stage_width - SPRITE_SIZE * 1.4 - STAGE_MARGIN:
+            score -= 2.0
+        return score
+
+    def _record(self, start, slowest):
+        if slowest:
+            self._rollout_s = slowest
+        ms = (self.clock() - start) * 1000.0
+        if ms > self.budget * 1000.0:
+            self.overruns += 1
+        self.decision_ms.add(ms)
+        self.decisions += 1
+        self.last_ms = ms
+        self.max_ms = max(self.max_ms, ms)
+
+    # ---------------------------
+    # TICK
+    # ---------------------------
+    def update(self, dt, me, opponent, stage_width):
+        ctx = self.ctx
+        if me.hitstun > 0 or me.defeated or me.victorious:
+            ctx["plan"] = None
+            super().update(dt, me, opponent, stage_width)
+            return
+
+        ctx["think"] = ctx.get("think", 0.0) - dt
+        if ctx["think"] <= 0:
+            ctx["think"] = self.think
+            ctx["plan"] = self._decide(me, opponent, stage_width)
+            ctx["plan_tick"] = 0
+            if ctx["plan"] is None:
+                self.fallbacks += 1
+
+        plan = ctx.get("plan")
+        if plan is None:
+            # Over budget: the decision tree plays until the next decision
+            super().update(dt, me, opponent, stage_width)
+            return
+
+        toward = 1 if opponent.x > me.x else -1
+        _, press, walk = PLAN_BY_NAME[plan]
+        cmd = _walk_bits(walk, toward)
+        if ctx["plan_tick"] == 0:
+            cmd |= press
+        ctx["plan_tick"] += 1
+        me.facing = toward
+        apply_command(me, cmd)
@@ -1,8 +1,33 @@
-from kivy.core.image import Image as CoreImage
+import struct
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+def image_size(filepath):
+    """
+    Return (w, h) of an image without touching the GPU.
+    PNG sizes come straight from the IHDR header; other formats fall back to Pillow.
+    """
+    try:
+        with open(filepath, "rb") as f:
+            head = f.read(24)
+        if head[:8] == PNG_SIGNATURE and head[12:16] == b"IHDR":
+            return struct.unpack(">II", head[16:24])
+    except OSError:
+        return (0, 0)
+    try:
+        from PIL import Image
+
+        with Image.open(filepath) as img:
+            return img.size
+    except Exception:
+        return (0, 0)
 
 
 class SpriteAnim:
-    def __init__(self):
+    def __init__(self, texture_loader=None):
+        # Optional callable(path) -> texture; left as None for headless simulation
+        self.texture_loader = texture_loader
         self.sheets = {}
         self.state = None
         self.frame = 0.0
@@ -28,17 +53,10 @@ class SpriteAnim:
         frame_xs=None,
         frame_ws=None,
     ):
-        img = CoreImage(filepath)
-        tex = img.texture
-        try:
-            tex.mag_filter = 'nearest'
-            tex.min_filter = 'nearest'
-            tex.wrap = 'clamp_to_edge'  # avoid bleeding from neighboring frames
-        except Exception:
-            # Filters/wrap might not be available depending on platform
-            pass
-
-        W, H = tex.size
+        tex = self._load_texture(filepath)
+        W, H = image_size(filepath)
+        if (W <= 0 or H <= 0) and tex is not None:
+            W, H = tex.size
         # Auto-detect frame height if not provided; clamp to texture bounds otherwise
         if frame_h is None or frame_h <= 0:
             frame_h = H - row_y_px
@@ -72,7 +90,7 @@ class SpriteAnim:
                 w = max(1, min(W - sx, ex - sx))
                 rects.append((sx, row_y_px, w, frame_h))
 
-        self.sheets[state] = {"tex": tex, "rects": rects, "fps": float(fps)}
+        self.sheets[state] = {"tex": tex, "path": filepath, "rects": rects, "fps": float(fps)}
 
     def add_sheet_from_frames(self, state, filepath, frames, fps=6, frame_durations=None):
         """
@@ -80,14 +98,7 @@ class SpriteAnim:
         frames: list of dicts with x,y,w,h
         frame_durations: optional list of per-frame durations (seconds); overrides fps when provided.
         """
-        img = CoreImage(filepath)
-        tex = img.texture
-        try:
-            tex.mag_filter = "nearest"
-            tex.min_filter = "nearest"
-            tex.wrap = "clamp_to_edge"
-        except Exception:
-            pass
+        tex = self._load_texture(filepath)
 
         rects = []
         metas = []
@@ -98,12 +109,26 @@ class SpriteAnim:
 
         self.sheets[state] = {
             "tex": tex,
+            "path": filepath,
             "rects": rects,
             "fps": float(fps),
             "durations": frame_durations if frame_durations else None,
             "meta": metas,
         }
 
+    def _load_texture(self, filepath):
+        if self.texture_loader is None:
+            return None
+        return self.texture_loader(filepath)
+
+    def attach_textures(self, texture_loader):
+        """Load textures for every sheet (render adapter hook for sprites built headless)."""
+        self.texture_loader = texture_loader
+        for cfg in self.sheets.values():
+            cfg["tex"] = self._load_texture(cfg["path"])
+        if self.state in self.sheets:
+            self._tex = self.sheets[self.state]["tex"]
+
     def play(self, state, loop=True, restart=False):
         if self.state != state or restart:
             cfg = self.sheets[state]
@@ -116,6 +141,22 @@ class SpriteAnim:
             self.frame = 0.0
             self.loop = loop
 
+    def snapshot(self):
+        """Return the mutable playback state as a compact tuple (see `restore`)."""
+        return (self.state, self.frame, self.loop, self.flip_x)
+
+    def restore(self, snap):
+        """Rewind playback to a `snapshot()` without resetting the frame like `play` does."""
+        state, self.frame, self.loop, self.flip_x = snap
+        if state != self.state:
+            cfg = self.sheets[state] if state is not None else {}
+            self.state = state
+            self._tex = cfg.get("tex")
+            self._rects = cfg.get("rects", [])
+            self._fps = cfg.get("fps", 0.0)
+            self._frame_durations = cfg.get("durations")
+            self._frame_meta = cfg.get("meta")
+
     def update(self, dt):
         if not self._rects:
             return
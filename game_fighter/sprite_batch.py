@@ -0,0 +1,164 @@
+"""
+Batched world-sprite renderer: every sprite of a frame goes into one preallocated
+vertex array per page, uploaded to that page's `Mesh` once per frame.
+
+A page is a (texture, tint) pair. Kivy's default shader takes the tint as a uniform
+(`Color`), not per vertex, so shapes that differ in either need their own draw call.
+Per frame:
+1. `begin()` empties every page.
+2. `quad`, `rect` and `ellipse` write their vertices (x, y, u, v as 32-bit floats) into
+   their page's `array('f')` with one `struct.pack_into` per shape. No graphics
+   instruction is touched.
+3. `end()` hands each used page's array to its `Mesh` (Kivy takes buffers in place, no
+   copy): one vertex upload per page. The indices are only rebuilt and re-sent when the
+   page's sequence of shapes changed. Pages are drawn in order of first use, so later
+   shapes cover earlier ones as with separate instructions; unused pages leave the
+   group, so they cost no draw call.
+
+`stats()` counts draw calls, vertices, shapes and uploads for the last frame, for the
+debug overlay and `tools/sprite_batch_bench.py`.
+"""
+
+import math
+import struct
+from array import array
+
+from kivy.graphics import Color, InstructionGroup, Mesh
+
+FLOATS_PER_VERTEX = 4  # x, y, u, v
+VERTEX_FORMAT = [(b"vPosition", 2, "float"), (b"vTexCoords0", 2, "float")]
+PAGE_VERTICES = 256  # initial vertices per page; a page doubles when full
+ELLIPSE_SEGMENTS = 24
+WHITE = (1.0, 1.0, 1.0, 1.0)
+FULL_UV = (0.0, 0.0, 1.0, 0.0, 1.0, 1.0, 0.0, 1.0)
+
+_QUAD = struct.Struct(f"<{4 * FLOATS_PER_VERTEX}f")
+_ELLIPSE = struct.Struct(f"<{(ELLIPSE_SEGMENTS + 1) * FLOATS_PER_VERTEX}f")
+_RIM = tuple((math.cos(2 * math.pi * i / ELLIPSE_SEGMENTS), math.sin(2 * math.pi * i / ELLIPSE_SEGMENTS)) for i in range(ELLIPSE_SEGMENTS))
+
+
+def _shape_indices(base, vertex_count):
+    """Triangle indices of one shape starting at vertex `base`: a quad, or a fan around its first vertex."""
+    if vertex_count == 4:
+        return (base, base + 1, base + 2, base + 2, base + 3, base)
+    out = []
+    for i in range(1, vertex_count):
+        out += (base, base + i, base + (i % (vertex_count - 1)) + 1)
+    return out
+
+
+class _Page:
+    __slots__ = ("texture", "color", "mesh", "vertices", "used", "layout", "drawn_layout")
+
+    def __init__(self, texture, rgba):
+        self.texture = texture
+        self.color = Color(*rgba)
+        self.mesh = Mesh(fmt=VERTEX_FORMAT, mode="triangles", texture=texture)
+        self.vertices = array("f", bytes(4 * FLOATS_PER_VERTEX * PAGE_VERTICES))
+        self.used = 0  # vertices written this frame
+        self.layout = []  # vertex count of each shape written this frame
+        self.drawn_layout = None
+
+    def reserve(self, count):
+        """Offset (in floats) of room for `count` more vertices, growing the array when full."""
+        need = (self.used + count) * FLOATS_PER_VERTEX
+        if need > len(self.vertices):
+            grown = array("f", bytes(4 * max(need, 2 * len(self.vertices))))
+            grown[:len(self.vertices)] = self.vertices
+            self.vertices = grown
+        offset = self.used * FLOATS_PER_VERTEX
+        self.used += count
+        self.layout.append(count)
+        return offset
+
+
+class SpriteBatch:
+    """One draw call per (texture, tint) page for all world sprites (see module docstring)."""
+
+    def __init__(self):
+        self.group = InstructionGroup()
+        self._pages = {}  # (texture, rgba) -> _Page
+        self._order = []  # pages in first-use order this frame
+        self._drawn_order = []
+        self._reset_color = Color(*WHITE)
+        self.frames = 0
+        self._stats = dict(draw_calls=0, vertices=0, shapes=0, vertex_uploads=0, index_uploads=0, pages=0)
+
+    def begin(self):
+        for page in self._order:
+            page.used = 0
+            page.layout = []
+        self._order = []
+
+    def _page(self, texture, rgba):
+        key = (texture, rgba)
+        page = self._pages.get(key)
+        if page is None:
+            page = self._pages[key] = _Page(texture, rgba)
+        if not page.used:
+            self._order.append(page)
+        return page
+
+    def quad(self, texture, x, y, w, h, tex_coords=FULL_UV, rgba=WHITE):
+        """A textured rectangle; `tex_coords` in `Rectangle.tex_coords` order (bottom-left, counter-clockwise)."""
+        page = self._page(texture, rgba)
+        offset = page.reserve(4)
+        u0, v0, u1, v1, u2, v2, u3, v3 = tex_coords
+        _QUAD.pack_into(
+            page.vertices, 4 * offset,
+            x, y, u0, v0,
+            x + w, y, u1, v1,
+            x + w, y + h, u2, v2,
+            x, y + h, u3, v3,
+        )
+
+    def rect(self, x, y, w, h, rgba):
+        """An untextured, tinted rectangle."""
+        self.quad(None, x, y, w, h, FULL_UV, rgba)
+
+    def ellipse(self, x, y, w, h, rgba):
+        """An untextured, tinted ellipse filling the box (`ELLIPSE_SEGMENTS`-gon)."""
+        page = self._page(None, rgba)
+        offset = page.reserve(ELLIPSE_SEGMENTS + 1)
+        rx, ry = w * 0.5, h * 0.5
+        cx, cy = x + rx, y + ry
+        values = [cx, cy, 0.0, 0.0]
+        for c, s in _RIM:
+            values += (cx + rx * c, cy + ry * s, 0.0, 0.0)
+        _ELLIPSE.pack_into(page.vertices, 4 * offset, *values)
+
+    def end(self):
+        """Upload this frame's pages (one vertex upload each) and fix the draw order if it changed."""
+        stats = self._stats
+        stats.update(vertex_uploads=0, index_uploads=0, vertices=0, shapes=0)
+        for page in self._order:
+            mesh = page.mesh
+            if page.layout != page.drawn_layout:
+                indices = []
+                base = 0
+                for count in page.layout:
+                    indices += _shape_indices(base, count)
+                    base += count
+                mesh.indices = array("H", indices)
+                page.drawn_layout = page.layout
+                stats["index_uploads"] += 1
+            mesh.vertices = memoryview(page.vertices)[:page.used * FLOATS_PER_VERTEX]
+            stats["vertex_uploads"] += 1
+            stats["vertices"] += page.used
+            stats["shapes"] += len(page.layout)
+        if self._order != self._drawn_order:
+            group = self.group
+            group.clear()
+            for page in self._order:
+                group.add(page.color)
+                group.add(page.mesh)
+            # Later layers get the default tint back
+            group.add(self._reset_color)
+            self._drawn_order = list(self._order)
+        stats["draw_calls"] = len(self._order)
+        stats["pages"] = len(self._pages)
+        self.frames += 1
+
+    def stats(self):
+        """Last frame's `draw_calls`, `vertices`, `shapes`, `vertex_uploads`, `index_uploads`, plus `pages` created."""
+        return dict(self._stats)
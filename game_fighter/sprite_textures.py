@@ -0,0 +1,27 @@
+"""Kivy render adapter: uploads sprite sheet textures for headless `SpriteAnim` data."""
+
+from kivy.core.image import Image as CoreImage
+
+_TEXTURE_CACHE = {}
+
+
+def load_sprite_texture(filepath):
+    """Load (and cache) a pixel-art texture with nearest filtering and clamped edges."""
+    tex = _TEXTURE_CACHE.get(filepath)
+    if tex is not None:
+        return tex
+    tex = CoreImage(filepath).texture
+    try:
+        tex.mag_filter = "nearest"
+        tex.min_filter = "nearest"
+        tex.wrap = "clamp_to_edge"  # avoid bleeding from neighboring frames
+    except Exception:
+        # Filters/wrap might not be available depending on platform
+        pass
+    _TEXTURE_CACHE[filepath] = tex
+    return tex
+
+
+def attach_fighter_textures(fighter):
+    """Attach GPU textures to a fighter whose sprites were built without a renderer."""
+    fighter.sprite.attach_textures(load_sprite_texture)
@@ -0,0 +1,45 @@
+"""Accumulator-driven fixed timestep so simulation results don't depend on frame rate."""
+
+DEFAULT_TICK_RATE = 60
+DEFAULT_MAX_STEPS = 5
+
+
+class FixedTimestep:
+    """
+    Convert variable frame times into a whole number of fixed simulation ticks.
+
+    `advance(frame_dt)` returns how many ticks of `dt` seconds to run this frame; `alpha`
+    is the leftover fraction of a tick, used to interpolate rendering between the
+    previous and current simulation states. At most `max_steps` ticks run per frame;
+    any extra backlog is dropped (and counted in `dropped_time`) instead of snowballing
+    on slow devices.
+    """
+
+    def __init__(self, tick_rate=DEFAULT_TICK_RATE, max_steps=DEFAULT_MAX_STEPS):
+        self.tick_rate = float(tick_rate)
+        self.dt = 1.0 / self.tick_rate
+        self.max_steps = max(1, int(max_steps))
+        self.accumulator = 0.0
+        self.dropped_time = 0.0
+        self.ticks = 0
+
+    def reset(self):
+        self.accumulator = 0.0
+
+    def advance(self, frame_dt):
+        self.accumulator += max(0.0, frame_dt)
+        # Tiny epsilon so a frame of exactly one tick isn't lost to float rounding
+        steps = int(self.accumulator / self.dt + 1e-9)
+        if steps > self.max_steps:
+            # Spiral-of-death guard: keep only the fractional remainder
+            self.dropped_time += (steps - self.max_steps) * self.dt
+            steps = self.max_steps
+            self.accumulator %= self.dt
+        else:
+            self.accumulator = max(0.0, self.accumulator - steps * self.dt)
+        self.ticks += steps
+        return steps
+
+    @property
+    def alpha(self):
+        return max(0.0, min(1.0, self.accumulator / self.dt))
@@ -0,0 +1,115 @@
+"""
+Measure what the AI think rate costs and buys: CPU per simulated second, worst tick, strength.
+
+For each controller and think rate, plays seeded headless matches with the bare
+decision tree as P1 and the scheduled controller as P2 (`ScheduledController`),
+resetting the round on every KO or time-out. Reports the AI's CPU time per simulated
+second, the slowest sim tick, and rounds won. Threaded runs are paced in real time
+(one tick per 1/60 s) so the worker thread gets the idle time a real frame loop leaves:
+each threaded row takes seeds x seconds of wall time, so `--threaded` defaults to
+`THREADED_SEEDS` matches of `THREADED_SECONDS` (about 2.7 minutes of pacing for all rows)
+and prints the estimate before starting.
+
+Usage:
+    python3 tools/ai_rate_bench.py
+    python3 tools/ai_rate_bench.py --threaded --controllers search --rates 20
+    python3 tools/ai_rate_bench.py --controllers search --rates 60 20 --threaded --seconds 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from game_fighter.ai import AIController  # noqa: E402
+from game_fighter.ai_scheduler import ScheduledController  # noqa: E402
+from game_fighter.match import Match  # noqa: E402
+from game_fighter.search_ai import SearchAIController  # noqa: E402
+
+DT = 1.0 / 60
+SEEDS, SECONDS = 4, 60.0
+THREADED_SEEDS, THREADED_SECONDS = 2, 10.0  # threaded rows run in real time
+CONTROLLERS = {"tree": AIController, "search": SearchAIController}
+
+
+class Timed:
+    """Wrap a controller and add up the time its `update` takes."""
+
+    def __init__(self, controller):
+        self.controller = controller
+        self.spent = 0.0
+
+    def __getattr__(self, name):
+        return getattr(self.controller, name)
+
+    def update(self, dt, me, opponent, stage_width):
+        start = time.perf_counter()
+        self.controller.update(dt, me, opponent, stage_width)
+        self.spent += time.perf_counter() - start
+
+
+def play(kind: str, hz: float, threaded: bool, seed: int, seconds: float) -> tuple[float, float, int, int, int]:
+    """Return (AI seconds spent on the sim thread, worst tick seconds, tree rounds, scheduled rounds, late decisions)."""
+    match = Match.headless("ryu", "ken" if seed % 2 else "ryu", p1_ai=True, seed=seed)
+    ai = ScheduledController(CONTROLLERS[kind](match.rng), hz, threaded=threaded)
+    timed = match.controllers[1] = Timed(ai)
+    worst = 0.0
+    rounds = [0, 0]
+    for _ in range(int(seconds / DT)):
+        start = time.perf_counter()
+        match.step(DT)
+        tick = time.perf_counter() - start
+        worst = max(worst, tick)
+        ko = False
+        for event in match.events:
+            if event[0] == "ko":
+                ko = True
+                rounds[event[1] == "P2"] += 1
+        if ko or match.round_timer <= 0:
+            match.reset_round()
+        if threaded:
+            time.sleep(max(0.0, DT - tick))
+    ai.close()
+    return timed.spent, worst, rounds[0], rounds[1], ai.late
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="AI think rate: CPU per simulated second, worst tick and strength.")
+    parser.add_argument("--controllers", nargs="+", default=list(CONTROLLERS), choices=list(CONTROLLERS))
+    parser.add_argument("--rates", type=float, nargs="+", default=[60, 30, 20, 15], help="Think rates (Hz) to try.")
+    parser.add_argument("--threaded", action="store_true", help="Also run each rate on a worker thread.")
+    parser.add_argument("--seeds", type=int, help=f"Matches per row (default {SEEDS}, {THREADED_SEEDS} with --threaded).")
+    parser.add_argument("--seconds", type=float, help=f"Simulated seconds per match (default {SECONDS:.0f}, {THREADED_SECONDS:.0f} with --threaded).")
+    args = parser.parse_args()
+    if args.seeds is None:
+        args.seeds = THREADED_SEEDS if args.threaded else SEEDS
+    if args.seconds is None:
+        args.seconds = THREADED_SECONDS if args.threaded else SECONDS
+    if args.threaded:
+        paced = len(args.controllers) * len(args.rates) * args.seeds * args.seconds
+        print(f"threaded rows are paced in real time: at least {paced / 60:.1f} minutes")
+
+    print(f"{'controller':>10} {'hz':>4} {'mode':>6} {'AI ms/s':>8} {'worst tick ms':>13} {'tree':>5} {'AI':>4} {'late':>5}")
+    for kind in args.controllers:
+        for hz in args.rates:
+            for threaded in (False, True) if args.threaded else (False,):
+                spent = worst = 0.0
+                tree = wins = late = 0
+                for seed in range(args.seeds):
+                    s, w, t, a, lt = play(kind, hz, threaded, seed, args.seconds)
+                    spent += s
+                    worst = max(worst, w)
+                    tree += t
+                    wins += a
+                    late += lt
+                mode = "thread" if threaded else "inline"
+                per_second = spent / (args.seeds * args.seconds) * 1000.0
+                print(f"{kind:>10} {hz:>4.0f} {mode:>6} {per_second:>8.2f} {worst * 1000:>13.2f} {tree:>5} {wins:>4} {late:>5}", flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Check the NumPy batch simulator against the scalar `Match` and time both.
+
+Runs N command-driven matches through `Match.step` and through one `BatchMatch`
+with the same seeded random inputs (DOWN included; the scalar matches have
+`motion_inputs` off, since motions and projectiles are scalar-only), reports the largest position/HP differences
+and KO disagreements, then prints matches-ticks per second for each engine.
+
+Usage:
+    python3 tools/batch_bench.py --matches 64 --ticks 3600
+    python3 tools/batch_bench.py --matches 4096 --ticks 600 --skip-scalar
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from game_fighter.batch_match import BatchMatch  # noqa: E402
+from game_fighter.input_manager import DOWN, JUMP_PRESSED, LEFT, PUNCH_PRESSED, RIGHT  # noqa: E402
+from game_fighter.match import Match  # noqa: E402
+
+
+def random_commands(rng, ticks: int, n: int) -> np.ndarray:
+    """(ticks, 2, n) command bits: held directions (down and down-diagonals too) with occasional jumps and punches."""
+    held = np.array([0, LEFT, RIGHT, RIGHT, DOWN, DOWN | LEFT, DOWN | RIGHT])
+    moves = rng.choice(held, size=(ticks // 15 + 1, 2, n)).repeat(15, axis=0)[:ticks]
+    punches = np.where(rng.random((ticks, 2, n)) < 0.08, PUNCH_PRESSED, 0)
+    jumps = np.where(rng.random((ticks, 2, n)) < 0.01, JUMP_PRESSED, 0)
+    return (moves | punches | jumps).astype(np.int64)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare and time the batch simulator against scalar matches.")
+    parser.add_argument("--matches", type=int, default=64, help="Matches per batch.")
+    parser.add_argument("--ticks", type=int, default=3600, help="Ticks to simulate.")
+    parser.add_argument("--hz", type=float, default=60.0, help="Simulation tick rate.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for inputs and victory poses.")
+    parser.add_argument("--tolerance", type=float, default=1e-6, help="Max allowed position difference (world px).")
+    parser.add_argument("--skip-scalar", action="store_true", help="Only time the batch engine.")
+    args = parser.parse_args()
+
+    dt = 1.0 / args.hz
+    n = args.matches
+    cmds = random_commands(np.random.default_rng(args.seed), args.ticks, n)
+    scalars = [Match.headless(p2_ai=False, seed=args.seed + i) for i in range(n)]
+    for match in scalars:
+        match.motion_inputs = False  # motions and projectiles are scalar-only
+    batch = BatchMatch.from_matches(scalars)
+
+    start = time.perf_counter()
+    for tick in range(args.ticks):
+        batch.step(dt, cmds[tick, 0], cmds[tick, 1])
+    batch_time = time.perf_counter() - start
+    print(f"batch:  {n} x {args.ticks} ticks in {batch_time:.3f}s -> {n * args.ticks / batch_time:,.0f} match-ticks/s")
+    if args.skip_scalar:
+        return
+
+    start = time.perf_counter()
+    for tick in range(args.ticks):
+        row = cmds[tick].tolist()
+        for i, match in enumerate(scalars):
+            match.step(dt, row[0][i], row[1][i])
+    scalar_time = time.perf_counter() - start
+    print(f"scalar: {n} x {args.ticks} ticks in {scalar_time:.3f}s -> {n * args.ticks / scalar_time:,.0f} match-ticks/s")
+
+    x = np.array([[m.p1.x for m in scalars], [m.p2.x for m in scalars]])
+    y = np.array([[m.p1.y for m in scalars], [m.p2.y for m in scalars]])
+    hp = np.array([[m.p1.hp for m in scalars], [m.p2.hp for m in scalars]])
+    wins = np.array([[m.p1_wins for m in scalars], [m.p2_wins for m in scalars]])
+    pos_err = max(np.abs(batch.x - x).max(), np.abs(batch.y - y).max())
+    hp_diff = int((batch.hp != hp).sum())
+    win_diff = int((np.array([batch.p1_wins, batch.p2_wins]) != wins).sum())
+    print(f"max position error {pos_err:.3g}px, HP mismatches {hp_diff}, win mismatches {win_diff}, KOs {int((batch.ko_tick >= 0).sum())}/{n}")
+    if pos_err > args.tolerance or hp_diff or win_diff:
+        raise SystemExit("batch and scalar engines disagree")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Benchmark the sweep-and-prune collision world against a plain all-pairs test.
+
+Each entity gets a pushbox, a hurtbox and (some of them) an active hitbox, spread
+over a stage that widens with the entity count (constant crowd density, like a
+stress test with projectiles and tag partners). Both methods must report the same
+pairs; the table shows the time per pairing pass and how many exact tests ran.
+
+Usage:
+    python3 tools/collision_bench.py
+    python3 tools/collision_bench.py --counts 2,8,32,128,512 --density 6 --seed 3
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from game_fighter import collision  # noqa: E402
+from game_fighter.collision import HITBOX, HURTBOX, PUSHBOX, CollisionWorld  # noqa: E402
+
+
+def build_world(entities: int, density: float, rng: random.Random) -> CollisionWorld:
+    """Fighter-sized boxes (about 80 x 150 px) for `entities` owners on two teams; always sweeps."""
+    world = CollisionWorld(sweep_min_boxes=0)
+    stage = max(400.0, entities * 100.0 / density * 8)
+    for owner in range(entities):
+        team = owner % 2
+        x = rng.uniform(0, stage)
+        y = rng.choice((44.0, 44.0, 44.0, rng.uniform(44.0, 300.0)))
+        w, h = rng.uniform(60, 100), rng.uniform(120, 170)
+        world.add(owner, PUSHBOX, (x, y, w, h), team)
+        world.add(owner, HURTBOX, (x + 4, y + 3, w - 8, h - 6), team)
+        if rng.random() < 0.4:
+            reach = rng.uniform(30, 90)
+            hx = x + w if rng.random() < 0.5 else x - reach
+            world.add(owner, HITBOX, (hx, y + h * 0.3, reach, h * 0.34), team)
+    return world
+
+
+def all_pairs(world: CollisionWorld) -> list[tuple[float, int, int]]:
+    boxes, tags = world.boxes, world.tags
+    n = len(boxes)
+    return [(1.0, i, j) for i in range(n - 1) for j in range(i + 1, n) if collision._collides(tags[i], boxes[i], tags[j], boxes[j])]
+
+
+def sweep(world: CollisionWorld) -> list[tuple[float, int, int]]:
+    return world.contacts()
+
+
+def timed(fn, world: CollisionWorld, min_time: float) -> tuple[float, list]:
+    runs = 0
+    start = time.perf_counter()
+    while True:
+        result = fn(world)
+        runs += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            return elapsed / runs, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Time sweep-and-prune against all-pairs collision.")
+    parser.add_argument("--counts", default="1,2,3,4,8,16,32,64,128,256,512", help="Comma-separated entity counts.")
+    parser.add_argument("--density", type=float, default=4.0, help="Average entities per 800 px of stage.")
+    parser.add_argument("--min-time", type=float, default=0.2, help="Seconds to time each method per count.")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    print(f"{'entities':>8} {'boxes':>6} {'pairs':>6} {'all-pairs us':>13} {'tests':>8} {'sweep us':>10} {'tests':>8} {'speedup':>8}")
+    for count in (int(c) for c in args.counts.split(",")):
+        world = build_world(count, args.density, rng)
+        brute_t, brute = timed(all_pairs, world, args.min_time)
+        sweep_t, swept = timed(sweep, world, args.min_time)
+        if brute != swept:
+            raise SystemExit(f"pair mismatch at {count} entities: {len(brute)} all-pairs vs {len(swept)} sweep")
+        n = len(world)
+        print(
+            f"{count:>8} {n:>6} {len(swept):>6} {brute_t * 1e6:>13.1f} {n * (n - 1) // 2:>8} "
+            f"{sweep_t * 1e6:>10.1f} {world.candidates:>8} {brute_t / sweep_t:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+"""
+Check that fixed-point matches hash identically across runs, processes and machines.
+
+Plays seeded matches on `FixedMatch` with two scripted button mashers (walks, jumps,
+punches, quarter-circle fireballs; KOs play out their knockdown before the next round)
+and chains the per-tick `state_checksum` of every tick into one digest per seed. Checks:
+- the same seeds replayed in a fresh interpreter (different hash seed) give the same digests;
+- restoring snapshots taken along the way and re-simulating gives the same per-tick hashes;
+- fighter positions, velocities, knockback and timers in the snapshots are integers;
+- with `--check FILE`, the digests equal those saved with `--save FILE` elsewhere
+  (e.g. on an arm64 phone vs an x86 desktop).
+Also reports ticks/s of fixed-point vs float physics. Exits non-zero on any mismatch.
+
+Usage:
+    python3 tools/fixed_point_check.py
+    python3 tools/fixed_point_check.py --seeds 8 --seconds 120 --save digests.json
+    python3 tools/fixed_point_check.py --check digests.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import struct
+import subprocess
+import sys
+import time
+import zlib
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from game_fighter.fixed_physics import FixedMatch  # noqa: E402
+from game_fighter.input_manager import DOWN, JUMP_PRESSED, LEFT, PUNCH, PUNCH_PRESSED, RIGHT  # noqa: E402
+from game_fighter.match import Match  # noqa: E402
+from game_fighter.rollback import state_checksum  # noqa: E402
+
+KNOCKDOWN_TICKS = 120  # idle ticks after a KO so the defeat fall and bounces are simulated
+ROLLBACK_EVERY = 500  # ticks between the snapshots re-simulated by the rollback check
+ROLLBACK_SPAN = 60
+# Snapshot fields that must be integers: x, y, vx, vy, attack ticks, hitstun, knockback
+INT_FIELDS = (0, 1, 2, 3, 7, 9, 10)
+
+
+class Masher:
+    """Seeded button masher: held directions plus random jumps, punches and fireball motions."""
+
+    def __init__(self, seed: int):
+        self.rng = random.Random(seed)
+        self.held = 0
+        self.hold = 0
+        self.motion = []
+
+    def next_cmd(self) -> int:
+        if self.motion:
+            return self.motion.pop()
+        rng = self.rng
+        if rng.random() < 0.01:
+            toward = rng.choice((LEFT, RIGHT))
+            self.motion = [toward | PUNCH | PUNCH_PRESSED, DOWN | toward, DOWN, DOWN]
+            return self.motion.pop()
+        if self.hold <= 0:
+            self.held = rng.choice((0, LEFT, RIGHT, RIGHT, LEFT))
+            self.hold = rng.randint(6, 40)
+        self.hold -= 1
+        cmd = self.held
+        if rng.random() < 0.06:
+            cmd |= PUNCH | PUNCH_PRESSED
+        if rng.random() < 0.015:
+            cmd |= JUMP_PRESSED
+        return cmd
+
+
+def play(match_cls, seed: int, seconds: float, hz: int, on_tick=None) -> tuple[int, int, int]:
+    """Play one seeded match; returns (digest, ticks, rounds). `on_tick(match, tick, kind, cmds)` sees every tick."""
+    kwargs = dict(tick_rate=hz) if match_cls is FixedMatch else {}
+    match = match_cls.headless("ryu", "ken" if seed % 2 else "ryu", p1_ai=False, p2_ai=False, seed=seed, **kwargs)
+    players = (Masher(seed * 2 + 1), Masher(seed * 2 + 2))
+    dt = 1.0 / hz
+    digest = 0
+    rounds = 0
+    knockdown = 0
+    for tick in range(int(seconds * hz)):
+        if knockdown:
+            kind, cmds = "idle", None
+            match.step_idle(dt)
+            knockdown -= 1
+            if not knockdown:
+                kind = "reset"
+                match.reset_round()
+        else:
+            kind, cmds = "step", (players[0].next_cmd(), players[1].next_cmd())
+            match.step(dt, *cmds)
+            if any(event[0] == "ko" for event in match.events) or match.round_timer <= 0:
+                rounds += 1
+                knockdown = KNOCKDOWN_TICKS
+        digest = zlib.crc32(struct.pack("<I", state_checksum(match.snapshot())), digest)
+        if on_tick is not None:
+            on_tick(match, tick, kind, cmds)
+    return digest, int(seconds * hz), rounds
+
+
+def rollback_check(seed: int, seconds: float, hz: int) -> tuple[int, int]:
+    """
+    Replay the match, then restore snapshots taken every `ROLLBACK_EVERY` ticks and
+    re-simulate `ROLLBACK_SPAN` ticks from each; returns (mismatched ticks, non-integer fields).
+    """
+    history = []  # (snapshot before the tick, kind, cmds, checksum after)
+    bad_types = 0
+
+    def record(match, tick, kind, cmds):
+        nonlocal bad_types
+        snap = match.snapshot()
+        for fighter_snap in snap[4:6]:
+            bad_types += sum(type(fighter_snap[i]) is not int for i in INT_FIELDS)
+        history.append((kind, cmds, state_checksum(snap), snap))
+
+    play(FixedMatch, seed, seconds, hz, on_tick=record)
+    match = FixedMatch.headless("ryu", "ken" if seed % 2 else "ryu", p1_ai=False, p2_ai=False, seed=seed, tick_rate=hz)
+    dt = 1.0 / hz
+    mismatches = 0
+    for start in range(ROLLBACK_EVERY, len(history) - 1, ROLLBACK_EVERY):
+        match.restore(history[start - 1][3])
+        for kind, cmds, checksum, _ in history[start:start + ROLLBACK_SPAN]:
+            if kind == "step":
+                match.step(dt, *cmds)
+            else:
+                match.step_idle(dt)
+                if kind == "reset":
+                    match.reset_round()
+            mismatches += state_checksum(match.snapshot()) != checksum
+    return mismatches, bad_types
+
+
+def digests(seeds: int, seconds: float, hz: int) -> dict[str, int]:
+    return {str(seed): play(FixedMatch, seed, seconds, hz)[0] for seed in range(seeds)}
+
+
+def fresh_process_digests(args) -> dict[str, int]:
+    """The same digests computed by a new interpreter with a different hash seed."""
+    env = dict(os.environ, PYTHONHASHSEED=str(random.randrange(1, 1 << 31)))
+    cmd = [sys.executable, __file__, "--worker", "--seeds", str(args.seeds), "--seconds", str(args.seconds), "--hz", str(args.hz)]
+    out = subprocess.run(cmd, env=env, check=True, capture_output=True, text=True).stdout
+    return json.loads(out)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Fixed-point determinism check: state hashes across runs, processes and machines.")
+    parser.add_argument("--seeds", type=int, default=4, help="Seeded matches to play.")
+    parser.add_argument("--seconds", type=float, default=60.0, help="Simulated seconds per match.")
+    parser.add_argument("--hz", type=int, default=60, help="Simulation tick rate.")
+    parser.add_argument("--save", help="Write the digests (and setup) to this JSON file.")
+    parser.add_argument("--check", help="Compare the digests with a file written by --save.")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(digests(args.seeds, args.seconds, args.hz)))
+        return
+
+    failures = 0
+    start = time.perf_counter()
+    local = digests(args.seeds, args.seconds, args.hz)
+    fixed_s = time.perf_counter() - start
+    again = fresh_process_digests(args)
+    print(f"{'seed':>4} {'digest':>10} {'process':>8} {'rollback':>9} {'int':>4}")
+    for seed in range(args.seeds):
+        key = str(seed)
+        mismatches, bad_types = rollback_check(seed, args.seconds, args.hz)
+        same = again[key] == local[key]
+        failures += (not same) + (mismatches > 0) + (bad_types > 0)
+        print(f"{seed:>4} {local[key]:>10x} {'same' if same else 'DIFF':>8} {mismatches:>9} {'yes' if not bad_types else 'NO':>4}")
+
+    if args.check:
+        with open(args.check, "r", encoding="utf-8") as f:
+            saved = json.load(f)
+        if (saved["seconds"], saved["hz"]) != (args.seconds, args.hz):
+            sys.exit(f"{args.check} was saved with --seconds {saved['seconds']} --hz {saved['hz']}")
+        diff = [seed for seed, digest in saved["digests"].items() if local.get(seed, digest) != digest]
+        failures += len(diff)
+        print(f"vs {args.check}: {'same' if not diff else 'DIFF on seeds ' + ', '.join(diff)}")
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(dict(seconds=args.seconds, hz=args.hz, digests=local), f, indent=2)
+
+    start = time.perf_counter()
+    for seed in range(args.seeds):
+        play(Match, seed, args.seconds, args.hz)
+    float_s = time.perf_counter() - start
+    ticks = args.seeds * int(args.seconds * args.hz)
+    print(f"ticks/s: fixed {ticks / fixed_s:,.0f}, float {ticks / float_s:,.0f} (state hash every tick included)")
+    if failures:
+        sys.exit(f"{failures} determinism check(s) failed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Step AI-vs-AI matches without a window or GL context and report simulation throughput.
+
+Usage:
+    python3 tools/headless_match.py --matches 20 --seed 7
+    python3 tools/headless_match.py --p1 ken --p2 ryu --max-ticks 7200
+    python3 tools/headless_match.py --matches 5 --record-dir replays/
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from game_fighter.match import Match  # noqa: E402
+from game_fighter.replay import ReplayRecorder  # noqa: E402
+from game_fighter.rollback import state_checksum  # noqa: E402
+
+
+def run_match(p1: str, p2: str, seed: int, max_ticks: int, hz: float, record_path: str | None = None) -> tuple:
+    """Run one match to the first KO (or `max_ticks`); return (winner, ticks)."""
+    match = Match.headless(p1, p2, p1_ai=True, seed=seed)
+    if record_path:
+        match.recorder = ReplayRecorder(dict(p1=p1, p2=p2, seed=seed, tick_rate=hz, stage_width=match.stage_width, p1_ai=True, p2_ai=True))
+        match.reset_round()  # first recorded op puts playback in the same start state
+    dt = 1.0 / hz
+    winner, ticks = None, max_ticks
+    for tick in range(max_ticks):
+        match.step(dt)
+        if any(event[0] == "ko" for event in match.events):
+            winner = next(event[1] for event in match.events if event[0] == "ko")
+            ticks = tick + 1
+            break
+    if record_path:
+        match.recorder.save(record_path, checksum=state_checksum(match.snapshot()))
+    return winner, ticks
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run headless AI-vs-AI matches and print ticks per second.")
+    parser.add_argument("--p1", default="ryu", help="Character key for P1.")
+    parser.add_argument("--p2", default="ken", help="Character key for P2.")
+    parser.add_argument("--matches", type=int, default=10, help="Number of matches to run.")
+    parser.add_argument("--seed", type=int, default=0, help="Base seed; match i uses seed + i.")
+    parser.add_argument("--max-ticks", type=int, default=60 * 60 * 3, help="Tick cap per match.")
+    parser.add_argument("--hz", type=float, default=60.0, help="Simulation tick rate.")
+    parser.add_argument("--record-dir", help="Save a replay of each match into this folder.")
+    args = parser.parse_args()
+
+    if args.record_dir:
+        os.makedirs(args.record_dir, exist_ok=True)
+    total_ticks = 0
+    start = time.perf_counter()
+    for i in range(args.matches):
+        record_path = os.path.join(args.record_dir, f"match_{i:03d}.sfr") if args.record_dir else None
+        winner, ticks = run_match(args.p1, args.p2, args.seed + i, args.max_ticks, args.hz, record_path)
+        total_ticks += ticks
+        print(f"match {i:03d}: winner={winner or 'none'} ticks={ticks}")
+    elapsed = max(1e-9, time.perf_counter() - start)
+    print(f"{total_ticks} ticks in {elapsed:.3f}s -> {total_ticks / elapsed:,.0f} ticks/s")
+
+
+if __name__ == "__main__":
+    main()
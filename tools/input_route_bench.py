@@ -0,0 +1,123 @@
+"""
+Measure what routing an input event to its player costs, against the old single-player path.
+
+Replays the same synthetic stream of key presses/releases, pad button presses/releases
+and stick reports through:
+- "shared": the old path, one `InputManager` for everything with sources formatted per
+  event (`f"pad:{stickid}"`) and stick reports keyed by formatted strings;
+- "routed": `InputRouter` in versus mode, a split keyboard and pads spread over both
+  players, sources taken from the routing table and `PadEvents` keys.
+Reports nanoseconds per event for each, and checks that the routed run plugged every pad.
+
+Usage:
+    python3 tools/input_route_bench.py
+    python3 tools/input_route_bench.py --events 500000 --pads 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from game_fighter.bindings import Bindings, keycode  # noqa: E402
+from game_fighter.input_manager import AXIS, AXIS_CONTROLS, InputManager, PadEvents, axis_actions  # noqa: E402
+from game_fighter.input_router import KEYBOARD, InputRouter  # noqa: E402
+
+KEYS = [keycode(k) for k in ("a", "d", "w", "j", "left", "right", "up", "rctrl")]
+
+
+def make_events(count: int, pads: int, seed: int) -> list[tuple]:
+    """("key", code, down) / ("button", stickid, buttonid, down) / ("axis", stickid, value) events."""
+    rng = random.Random(seed)
+    events = []
+    for _ in range(count):
+        roll = rng.random()
+        if roll < 0.3:
+            events.append(("key", rng.choice(KEYS), rng.random() < 0.5))
+        elif roll < 0.5:
+            events.append(("button", rng.randrange(pads), rng.choice((0, 1)), rng.random() < 0.5))
+        else:
+            events.append(("axis", rng.randrange(pads), rng.randint(-32768, 32767)))
+    return events
+
+
+class FormattedPadEvents(PadEvents):
+    """`PadEvents` keyed the way it was before routing: a string built per report."""
+
+    def axis(self, stickid, axisid, value):
+        self.events += 1
+        self._report((f"pad:{stickid}", AXIS, axisid), axis_actions(axisid, value), AXIS_CONTROLS[axisid], False)
+
+
+def shared(events: list[tuple], bindings: Bindings) -> float:
+    """The single-player path before routing: formatted sources, one manager."""
+    manager = InputManager()
+    keys, buttons = bindings.keys, bindings.pad_buttons
+    pad_events = FormattedPadEvents()
+    start = time.perf_counter()
+    for event in events:
+        kind = event[0]
+        if kind == "key":
+            action = keys.get(event[1])
+            if action is not None:
+                manager.set(action, event[2], "keyboard")
+        elif kind == "button":
+            action = buttons.get(event[2])
+            if action is not None:
+                manager.set(action, event[3], f"pad:{event[1]}")
+        else:
+            pad_events.axis(event[1], 0, event[2])
+    return time.perf_counter() - start
+
+
+def routed(events: list[tuple], bindings: Bindings) -> tuple[float, InputRouter]:
+    router = InputRouter(bindings)
+    router.set_versus(True)
+    inputs = router.inputs
+    buttons = bindings.pad_buttons
+    pad_events = PadEvents()
+    start = time.perf_counter()
+    for event in events:
+        kind = event[0]
+        if kind == "key":
+            route = router.keys.get(event[1])
+            if route is not None:
+                inputs[route[0]].set(route[1], event[2], KEYBOARD)
+        elif kind == "button":
+            action = buttons.get(event[2])
+            if action is not None:
+                pad = router.pad(event[1])
+                inputs[pad.player].set(action, event[3], pad)
+        else:
+            pad_events.axis(event[1], 0, event[2])
+    return time.perf_counter() - start, router
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Per-event cost of routing input to players.")
+    parser.add_argument("--events", type=int, default=200000, help="Synthetic input events per run.")
+    parser.add_argument("--pads", type=int, default=2, help="Gamepads in the stream.")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per path (best is reported).")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    bindings = Bindings()
+    events = make_events(args.events, args.pads, args.seed)
+    best_shared = min(shared(events, bindings) for _ in range(args.repeat))
+    runs = [routed(events, bindings) for _ in range(args.repeat)]
+    best_routed = min(seconds for seconds, _ in runs)
+    router = runs[-1][1]
+    print(f"shared: {best_shared / len(events) * 1e9:7.1f} ns/event")
+    print(f"routed: {best_routed / len(events) * 1e9:7.1f} ns/event")
+    print(f"pads per player: {router.pad_counts()} ({router.plugs} plugged)")
+    if router.plugs != args.pads:
+        sys.exit("not every pad was plugged in")
+
+
+if __name__ == "__main__":
+    main()
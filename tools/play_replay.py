@@ -0,0 +1,84 @@
+"""
+Play replay files back without a window, as fast as the CPU allows, and check that
+each one ends in the state it was recorded with (bit-exact playback regression).
+
+Usage:
+    python3 tools/play_replay.py replays/match_000.sfr
+    python3 tools/play_replay.py replays/*.sfr --repeat 20
+    python3 tools/play_replay.py replays/match_000.sfr --realtime
+    python3 tools/play_replay.py replays/match-20240101-120000.sfk --seeks 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from game_fighter.replay import Replay  # noqa: E402
+from game_fighter.replay_keyframes import MAGIC as KEYFRAMED_MAGIC, KeyframedReplay  # noqa: E402
+
+
+def open_replay(path: str):
+    """Load a flat (.sfr) or keyframed (.sfk) replay, chosen by the file magic."""
+    with open(path, "rb") as f:
+        magic = f.read(len(KEYFRAMED_MAGIC))
+    return KeyframedReplay(path) if magic == KEYFRAMED_MAGIC else Replay.load(path)
+
+
+def time_seeks(replay, count: int, seed: int) -> float:
+    """Average milliseconds per random seek (keyframed replays only)."""
+    rng = random.Random(seed)
+    match = None
+    start = time.perf_counter()
+    for _ in range(count):
+        match = replay.seek(rng.randrange(replay.setup["ticks"] + 1), match)
+    return (time.perf_counter() - start) / max(1, count) * 1000.0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Play replays headless (uncapped) and verify their end-state checksums.")
+    parser.add_argument("paths", nargs="+", help="Replay files (.sfr).")
+    parser.add_argument("--repeat", type=int, default=1, help="Play each replay this many times (for timing).")
+    parser.add_argument("--realtime", action="store_true", help="Pace playback at the recorded tick rate instead of uncapped.")
+    parser.add_argument("--seeks", type=int, default=0, help="Time this many random seeks (keyframed replays).")
+    args = parser.parse_args()
+
+    failures = 0
+    for path in args.paths:
+        replay = open_replay(path)
+        on_tick = None
+        if args.realtime:
+            start = time.perf_counter()
+
+            def on_tick(match, tick, start=start, dt=replay.dt):
+                delay = start + tick * dt - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+
+        elapsed = 0.0
+        ok = True
+        for _ in range(args.repeat):
+            t0 = time.perf_counter()
+            match = replay.play(on_tick=on_tick)
+            elapsed += time.perf_counter() - t0
+            ok = ok and replay.verify(match)
+        ticks = replay.setup.get("ticks", 0) * args.repeat
+        failures += not ok
+        print(
+            f"{path}: {replay.setup['p1']} vs {replay.setup['p2']} seed={replay.setup['seed']} "
+            f"wins={match.p1_wins}-{match.p2_wins} {ticks} ticks in {elapsed:.3f}s "
+            f"({ticks / max(elapsed, 1e-9):,.0f} ticks/s) {'OK' if ok else 'MISMATCH'}"
+        )
+        if args.seeks and isinstance(replay, KeyframedReplay):
+            print(f"  {len(replay.keyframes)} keyframes; {args.seeks} random seeks: {time_seeks(replay, args.seeks, 0):.2f} ms avg")
+    if failures:
+        raise SystemExit(f"{failures} replay(s) did not reproduce their recorded end state")
+
+
+if __name__ == "__main__":
+    main()
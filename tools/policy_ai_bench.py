@@ -0,0 +1,111 @@
+"""
+Pit the learned AI against the decision-tree AI and compare what each costs per tick.
+
+Plays seeded headless matches with the tree AI as P1 and `PolicyAIController` as P2,
+resetting the round on every KO or time-out, and times every controller `update`.
+Then times one batched forward pass for growing numbers of CPU fighters, to show what
+a decision costs per fighter when the batch is shared.
+
+Usage:
+    python3 tools/policy_ai_bench.py
+    python3 tools/policy_ai_bench.py --seeds 8 --seconds 120 --weights /tmp/policy.npz --batch 1 2 8 64
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from game_fighter.match import Match  # noqa: E402
+from game_fighter.policy_ai import FEATURES, POLICY_PATH, PolicyAIController, PolicyBatch, PolicyNet  # noqa: E402
+
+DT = 1.0 / 60
+
+
+class Timed:
+    """Wrap a controller and add up the time its `update` takes."""
+
+    def __init__(self, controller):
+        self.controller = controller
+        self.spent = 0.0
+        self.calls = 0
+
+    def __getattr__(self, name):
+        return getattr(self.controller, name)
+
+    def update(self, dt, me, opponent, stage_width):
+        start = time.perf_counter()
+        self.controller.update(dt, me, opponent, stage_width)
+        self.spent += time.perf_counter() - start
+        self.calls += 1
+
+
+def play(seed: int, seconds: float, net: PolicyNet) -> tuple[int, int, Timed, Timed]:
+    """Return (tree rounds won, policy rounds won, timed tree, timed policy)."""
+    match = Match.headless("ryu", "ken" if seed % 2 else "ryu", p1_ai=True, seed=seed)
+    tree = match.controllers[0] = Timed(match.controllers[0])
+    policy = match.controllers[1] = Timed(PolicyAIController(match.rng, batch=PolicyBatch(net)))
+    tree_wins = policy_wins = 0
+    for _ in range(int(seconds / DT)):
+        match.step(DT)
+        ko = False
+        for event in match.events:
+            if event[0] == "ko":
+                ko = True
+                if event[1] == "P2":
+                    policy_wins += 1
+                else:
+                    tree_wins += 1
+        if ko or match.round_timer <= 0:
+            match.reset_round()
+    return tree_wins, policy_wins, tree, policy
+
+
+def forward_us(net: PolicyNet, rows: int, repeat: int = 2000) -> float:
+    """Microseconds for one forward pass over `rows` feature rows (`act_one` for one, as `PolicyBatch` does)."""
+    x = np.random.default_rng(0).random((rows, len(FEATURES)))
+    row = tuple(x[0].tolist())
+    start = time.perf_counter()
+    for _ in range(repeat):
+        if rows == 1:
+            net.act_one(row)
+        else:
+            net.act(x)
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Learned AI vs decision tree: rounds won and per-tick cost.")
+    parser.add_argument("--seeds", type=int, default=8, help="Matches to play.")
+    parser.add_argument("--seconds", type=float, default=90.0, help="Simulated seconds per match.")
+    parser.add_argument("--weights", default=str(POLICY_PATH), help="Policy weights (.npz).")
+    parser.add_argument("--batch", type=int, nargs="+", default=[1, 2, 8, 64], help="CPU fighter counts for the forward-pass timing.")
+    args = parser.parse_args()
+
+    net = PolicyNet.load(args.weights)
+    tree_wins = policy_wins = 0
+    tree_s = policy_s = 0.0
+    calls = 0
+    for seed in range(args.seeds):
+        t, p, tree, policy = play(seed, args.seconds, net)
+        tree_wins += t
+        policy_wins += p
+        tree_s += tree.spent
+        policy_s += policy.spent
+        calls += tree.calls
+    print(f"rounds: tree {tree_wins}, policy {policy_wins}")
+    print(f"update us/tick: tree {tree_s / calls * 1e6:.2f}, policy {policy_s / calls * 1e6:.2f}")
+    print(f"{'fighters':>8} {'forward us':>10} {'us/fighter':>10}")
+    for rows in args.batch:
+        us = forward_us(net, rows)
+        print(f"{rows:>8} {us:>10.2f} {us / rows:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Spam projectiles through a headless match and report tick cost, GC activity and
+memory growth.
+
+Both AI fighters try to fire every 4th tick (the per-fighter limit is lifted to the
+pool capacity; hitstun still blocks a shot), HP is topped up every tick so rounds
+never end, and shots keep hitting, expiring and respawning. A pooled system should
+show no steady memory growth and no more GC collections than the run without shots.
+
+Usage:
+    python3 tools/projectile_stress.py
+    python3 tools/projectile_stress.py --ticks 20000 --capacity 64
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from game_fighter.match import Match  # noqa: E402
+from game_fighter.projectiles import ProjectilePool  # noqa: E402
+
+
+def run(ticks: int, capacity: int, fire: bool) -> dict:
+    match = Match.headless("ryu", "ken", p1_ai=True, seed=1)
+    match.projectiles = ProjectilePool(capacity)
+    match.projectile_cfg["per_fighter"] = capacity
+    dt = 1.0 / 60
+    shots = hits = 0
+    gc.collect()
+    before = [s["collections"] for s in gc.get_stats()]
+    tracemalloc.start()
+    base, _ = tracemalloc.get_traced_memory()
+    start = time.perf_counter()
+    for tick in range(ticks):
+        if fire and tick % 4 == 0:
+            shots += match.fire_projectile(match.p1) + match.fire_projectile(match.p2)
+        match.step(dt)
+        for event in match.events:
+            if event[0] == "hit":
+                hits += 1
+            elif event[0] == "ko":
+                match.reset_round()
+        match.p1.hp = match.p2.hp = 100
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    after = [s["collections"] for s in gc.get_stats()]
+    return {
+        "us_per_tick": elapsed / ticks * 1e6,
+        "shots": shots,
+        "hits": hits,
+        "live": match.projectiles.count,
+        "collections": [a - b for a, b in zip(after, before)],
+        "growth": current - base,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Stress the projectile pool and report GC activity.")
+    parser.add_argument("--ticks", type=int, default=10000, help="Ticks to simulate per run.")
+    parser.add_argument("--capacity", type=int, default=32, help="Pool capacity.")
+    args = parser.parse_args()
+
+    print(f"{'run':<12} {'us/tick':>8} {'shots':>7} {'hits':>6} {'live':>5} {'gc gen0/1/2':>13} {'mem growth B':>13}")
+    for name, fire in (("no shots", False), ("spam", True)):
+        r = run(args.ticks, args.capacity, fire)
+        gcs = "/".join(str(c) for c in r["collections"])
+        print(f"{name:<12} {r['us_per_tick']:>8.1f} {r['shots']:>7} {r['hits']:>6} {r['live']:>5} {gcs:>13} {r['growth']:>13}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""
+Loopback harness for rollback netplay: two peers in one process talk over real UDP
+sockets on 127.0.0.1 through a simulated link (latency, jitter, packet loss). Both
+sides run scripted inputs; at the end their match states must checksum identically,
+and their hit/KO logs (from `RollbackSession.events`, rewritten on every rollback)
+must agree.
+
+Usage:
+    python3 tools/rollback_loopback.py --frames 3600 --latency 0.06 --loss 0.1
+    python3 tools/rollback_loopback.py --input-delay 2 --max-rollback 8
+    python3 tools/rollback_loopback.py --fixed-point
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from game_fighter.fixed_physics import FixedMatch  # noqa: E402
+from game_fighter.input_manager import DOWN, JUMP_PRESSED, LEFT, PUNCH_PRESSED, RIGHT  # noqa: E402
+from game_fighter.match import Match  # noqa: E402
+from game_fighter.net_transport import SimulatedLink, UdpInputTransport  # noqa: E402
+from game_fighter.rollback import RollbackSession  # noqa: E402
+
+
+class ScriptedPlayer:
+    """Seeded button masher: holds a direction for a while, with random jumps, punches and quarter-circle fireballs."""
+
+    def __init__(self, seed: int):
+        self.rng = random.Random(seed)
+        self.held = 0
+        self.hold_frames = 0
+        self.motion = []
+
+    def next_cmd(self) -> int:
+        if self.motion:
+            return self.motion.pop()
+        if self.rng.random() < 0.01:
+            # Down, down-toward, toward + punch (toward either side; only one way is "forward")
+            toward = self.rng.choice((LEFT, RIGHT))
+            self.motion = [toward | PUNCH_PRESSED, DOWN | toward, DOWN, DOWN]
+            return self.motion.pop()
+        if self.hold_frames <= 0:
+            self.held = self.rng.choice((0, LEFT, RIGHT, RIGHT))
+            self.hold_frames = self.rng.randint(6, 30)
+        self.hold_frames -= 1
+        cmd = self.held
+        if self.rng.random() < 0.05:
+            cmd |= PUNCH_PRESSED
+        if self.rng.random() < 0.01:
+            cmd |= JUMP_PRESSED
+        return cmd
+
+
+class Peer:
+    def __init__(self, player: int, args, clock):
+        # Same gameplay seed on both peers, so victory poses (and any AI draws) agree
+        if args.fixed_point:
+            match = FixedMatch.headless(p2_ai=False, seed=args.seed, tick_rate=args.hz)
+        else:
+            match = Match.headless(p2_ai=False, seed=args.seed)
+        self.session = RollbackSession(match, player, 1.0 / args.hz, max_rollback=args.max_rollback, input_delay=args.input_delay)
+        self.transport = UdpInputTransport()
+        link_rng = random.Random(args.seed * 31 + player)
+        self.link = self.transport.use_link(
+            lambda send: SimulatedLink(send, latency=args.latency, jitter=args.jitter, loss=args.loss, rng=link_rng, clock=clock)
+        )
+        self.player = ScriptedPlayer(args.seed * 7 + player)
+        self.frames_fed = 0
+        self.log = {}  # frame -> hit/KO events as finally simulated
+        self.corrected = 0  # frames whose events a rollback changed
+
+    def advance(self) -> None:
+        s = self.session
+        s.advance()
+        match = s.match
+        stale = {}
+        if s.resimulated_from is not None:
+            stale = {f: self.log.pop(f) for f in [f for f in self.log if f >= s.resimulated_from]}
+        for frame, event in s.events:
+            if event[0] == "hit":
+                event = ("hit", "P1" if event[1] is match.p1 else "P2", event[3])
+            self.log.setdefault(frame, []).append(event)
+        if s.resimulated_from is not None:
+            # The newest frame was never shown before; earlier ones were
+            for f in range(s.resimulated_from, s.frame - 1):
+                self.corrected += stale.get(f) != self.log.get(f)
+
+    def tick(self, now: float, feed_input: bool) -> None:
+        for frame, cmd in self.transport.poll():
+            self.session.add_remote_input(frame, cmd)
+        s = self.session
+        # One local input per simulated frame; a stalled session skips input like a skipped frame
+        if feed_input and s.next_local_frame - s.frame <= s.input_delay:
+            frame = s.add_local_input(self.player.next_cmd())
+            self.transport.queue_local(frame, s.local_inputs[frame])
+            self.frames_fed += 1
+        self.advance()
+        self.transport.flush(self.session.confirmed_remote_frame)
+        self.link.pump(now)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run two rollback peers over a lossy UDP loopback and compare states.")
+    parser.add_argument("--frames", type=int, default=1800, help="Input frames each peer plays.")
+    parser.add_argument("--hz", type=float, default=60.0, help="Simulation tick rate.")
+    parser.add_argument("--latency", type=float, default=0.05, help="One-way latency in seconds.")
+    parser.add_argument("--jitter", type=float, default=0.01, help="Latency jitter (+/- seconds).")
+    parser.add_argument("--loss", type=float, default=0.05, help="Packet loss probability.")
+    parser.add_argument("--max-rollback", type=int, default=8, help="Prediction window in frames.")
+    parser.add_argument("--input-delay", type=int, default=0, help="Local input delay in frames.")
+    parser.add_argument("--seed", type=int, default=1, help="Seed for inputs and the link simulator.")
+    parser.add_argument("--fixed-point", action="store_true", help="Simulate with integer physics (FixedMatch).")
+    args = parser.parse_args()
+
+    now = [0.0]
+    clock = lambda: now[0]  # noqa: E731 - virtual time keeps runs reproducible
+    peers = [Peer(0, args, clock), Peer(1, args, clock)]
+    peers[0].transport.remote_addr = peers[1].transport.address
+    peers[1].transport.remote_addr = peers[0].transport.address
+    tick = 1.0 / args.hz
+
+    wall = time.perf_counter()
+    target = args.frames + args.input_delay
+    ticks = 0
+    while any(p.session.frame < target or p.session.confirmed_remote_frame < target - 1 for p in peers):
+        for p in peers:
+            p.tick(now[0], feed_input=p.frames_fed < args.frames)
+        now[0] += tick
+        ticks += 1
+        time.sleep(0)  # let the kernel move loopback datagrams
+        if ticks > target * 20:
+            raise SystemExit("peers failed to converge (link too lossy?)")
+    for p in peers:
+        p.advance()  # apply any rollback triggered by the final inputs
+    elapsed = time.perf_counter() - wall
+
+    sums = [p.session.checksum() for p in peers]
+    for i, p in enumerate(peers):
+        s = p.session
+        events = [e for frame_events in p.log.values() for e in frame_events]
+        hits = sum(e[0] == "hit" for e in events)
+        kos = sum(e[0] == "ko" for e in events)
+        print(
+            f"peer {i}: frame={s.frame} rollbacks={s.rollbacks} resim={s.resimulated_frames} "
+            f"stalls={s.stalls} sent={p.transport.packets_out} dropped={p.link.dropped} checksum={sums[i]:08x}"
+        )
+        print(f"        hits={hits} kos={kos} events corrected by rollback={p.corrected}")
+    same_log = peers[0].log == peers[1].log
+    print(
+        f"{ticks} wall ticks in {elapsed:.3f}s; states {'MATCH' if sums[0] == sums[1] else 'DESYNC'}, "
+        f"events {'MATCH' if same_log else 'DIFFER'}"
+    )
+    if sums[0] != sums[1] or not same_log:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Measure what run-ahead costs per frame and check that it never changes the real match.
+
+Plays the same seeded AI-vs-AI match once plainly and once per run-ahead depth,
+speculating after every tick the way the widget does after every frame. Reports the
+plain tick cost, the extra run-ahead cost per frame (and as a share of a 60 Hz frame),
+and whether the real end state still matches the plain run.
+
+Usage:
+    python3 tools/run_ahead_bench.py
+    python3 tools/run_ahead_bench.py --ticks 3000 --frames 1 2 3 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from game_fighter.match import Match  # noqa: E402
+from game_fighter.rollback import state_checksum  # noqa: E402
+from game_fighter.run_ahead import RunAhead  # noqa: E402
+
+DT = 1.0 / 60
+
+
+def play(ticks: int, frames: int, seed: int) -> tuple[int, float, dict | None]:
+    """Return (end-state checksum, seconds spent in real ticks, run-ahead stats)."""
+    match = Match.headless("ryu", "ken", p1_ai=True, seed=seed)
+    run_ahead = RunAhead(match, frames) if frames else None
+    spent = 0.0
+    for _ in range(ticks):
+        start = time.perf_counter()
+        match.step(DT)
+        spent += time.perf_counter() - start
+        if any(event[0] == "ko" for event in match.events):
+            match.reset_round()
+        if run_ahead is not None:
+            run_ahead.begin(DT)
+            run_ahead.end()
+    return state_checksum(match.snapshot()), spent, run_ahead.stats(DT) if run_ahead else None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run-ahead CPU cost and real-state check.")
+    parser.add_argument("--ticks", type=int, default=2000, help="Ticks per run.")
+    parser.add_argument("--frames", type=int, nargs="+", default=[1, 2, 3], help="Run-ahead depths to try.")
+    parser.add_argument("--seed", type=int, default=3, help="Match seed.")
+    args = parser.parse_args()
+
+    plain, spent, _ = play(args.ticks, 0, args.seed)
+    print(f"plain tick: {spent / args.ticks * 1000:.3f} ms")
+    print(f"{'run-ahead':>9} {'avg ms/frame':>12} {'max ms':>7} {'% of 60 Hz':>10} {'real state':>10}")
+    for frames in args.frames:
+        checksum, _, stats = play(args.ticks, frames, args.seed)
+        same = "same" if checksum == plain else "DIFFERS"
+        print(f"{frames:>9} {stats['avg_ms']:>12.3f} {stats['max_ms']:>7.2f} {stats['budget_pct']:>10.1f} {same:>10}")
+
+
+if __name__ == "__main__":
+    main()
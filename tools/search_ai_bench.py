@@ -0,0 +1,77 @@
+"""
+Pit the lookahead AI against the decision-tree AI and report strength and decision cost.
+
+For each budget, plays seeded headless matches with the tree AI as P1 and
+`SearchAIController` as P2, resetting the round on every KO or time-out. Reports
+rounds won by each side, how often a decision fell back to the tree, how many ended
+past the budget, and decision latency percentiles.
+
+Usage:
+    python3 tools/search_ai_bench.py
+    python3 tools/search_ai_bench.py --seeds 8 --seconds 120 --budgets 0.002 0.006 0.02
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from game_fighter.match import Match  # noqa: E402
+from game_fighter.search_ai import SEARCH_BUDGET, SearchAIController  # noqa: E402
+
+DT = 1.0 / 60
+
+
+def play(seed: int, seconds: float, budget: float) -> tuple[int, int, SearchAIController]:
+    """Return (tree rounds won, search rounds won, the search controller)."""
+    match = Match.headless("ryu", "ken" if seed % 2 else "ryu", p1_ai=True, seed=seed)
+    search = SearchAIController(match.rng, budget=budget)
+    match.controllers[1] = search
+    tree_wins = search_wins = 0
+    for _ in range(int(seconds / DT)):
+        match.step(DT)
+        ko = False
+        for event in match.events:
+            if event[0] == "ko":
+                ko = True
+                if event[1] == "P2":
+                    search_wins += 1
+                else:
+                    tree_wins += 1
+        if ko or match.round_timer <= 0:
+            match.reset_round()
+    return tree_wins, search_wins, search
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Lookahead AI vs decision tree: rounds won and decision latency.")
+    parser.add_argument("--seeds", type=int, default=4, help="Matches per budget.")
+    parser.add_argument("--seconds", type=float, default=90.0, help="Simulated seconds per match.")
+    parser.add_argument("--budgets", type=float, nargs="+", default=[SEARCH_BUDGET / 2, SEARCH_BUDGET],
+                        help="Per-decision budgets to try, in seconds.")
+    args = parser.parse_args()
+
+    print(f"{'budget ms':>9} {'tree':>5} {'search':>6} {'fallbacks':>10} {'overruns':>9} {'p50 ms':>7} {'p95 ms':>7} {'p99 ms':>7} {'max ms':>7}")
+    for budget in args.budgets:
+        tree = search = fallbacks = decisions = overruns = 0
+        worst = {50: 0.0, 95: 0.0, 99: 0.0}
+        max_ms = 0.0
+        for seed in range(args.seeds):
+            t, s, ai = play(seed, args.seconds, budget)
+            tree += t
+            search += s
+            fallbacks += ai.fallbacks
+            decisions += ai.decisions
+            overruns += ai.overruns
+            max_ms = max(max_ms, ai.max_ms)
+            for q in worst:
+                worst[q] = max(worst[q], ai.decision_ms.percentile(q) or 0.0)
+        share = f"{fallbacks}/{decisions}"
+        print(f"{budget * 1000:>9.1f} {tree:>5} {search:>6} {share:>10} {overruns:>9} {worst[50]:>7.1f} {worst[95]:>7.1f} {worst[99]:>7.1f} {max_ms:>7.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""
+Compare the old per-instruction world drawing with the batched `SpriteBatch` renderer.
+
+Records the world sprites of a headless AI-vs-AI match (fighters, projectiles spammed
+every few ticks, optionally the hitbox overlay), then draws the same frames into an
+offscreen `Fbo` two ways:
+- per-instruction: one `Rectangle` per fighter updated property by property, one
+  `Ellipse` per projectile-pool slot, debug `Rectangle`s rebuilt every frame (the
+  widget's drawing before the batch);
+- batched: `SpriteBatch`, one `Mesh` per texture/tint page uploaded once per frame.
+Reports draw calls and vertices per frame and CPU ms per frame (sync + GL submission).
+Needs Kivy and an OpenGL context (a window is opened, or use a virtual display).
+
+Usage:
+    python3 tools/sprite_batch_bench.py
+    python3 tools/sprite_batch_bench.py --frames 3000 --hitboxes --capacity 64
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+os.environ.setdefault("KIVY_NO_ARGS", "1")
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from kivy.core.window import Window  # noqa: E402,F401  (creates the GL context)
+from kivy.graphics import Color, Ellipse, Fbo, InstructionGroup, Rectangle  # noqa: E402
+
+from game_fighter.game_widget import HITBOX_RGBA, HURTBOX_RGBA, PROJECTILE_RGBA  # noqa: E402
+from game_fighter.match import Match  # noqa: E402
+from game_fighter.projectiles import ProjectilePool  # noqa: E402
+from game_fighter.sprite_batch import ELLIPSE_SEGMENTS, SpriteBatch  # noqa: E402
+from game_fighter.sprite_textures import attach_fighter_textures  # noqa: E402
+
+# Kivy's Ellipse default: 180 segments, a triangle fan around its centre
+ELLIPSE_VERTICES = 181
+
+
+def record(frames: int, capacity: int, hitboxes: bool) -> list[tuple]:
+    """Per frame: (fighters [(texture, x, y, w, h, texcoords)], projectiles [(x, y, w, h)], boxes [(rgba, box)])."""
+    match = Match.headless("ryu", "ken", p1_ai=True, seed=1)
+    for f in (match.p1, match.p2):
+        attach_fighter_textures(f)
+    match.projectiles = ProjectilePool(capacity)
+    match.projectile_cfg["per_fighter"] = capacity
+    dt = 1.0 / 60
+    out = []
+    for tick in range(frames):
+        if tick % 4 == 0:
+            match.fire_projectile(match.p1)
+            match.fire_projectile(match.p2)
+        match.step(dt)
+        if any(event[0] == "ko" for event in match.events):
+            match.reset_round()
+        match.p1.hp = match.p2.hp = 100
+        fighters = []
+        for f in (match.p1, match.p2):
+            fw, fh = f.sprite.current_frame_size()
+            fighters.append((f.sprite.current_texture(), f.x, f.y, fw * f.render_scale, fh * f.render_scale, f.sprite.current_texcoords()))
+        pool = match.projectiles
+        shots = [(pool.x[i], pool.y[i], pool.w[i], pool.h[i]) for i in range(pool.count)]
+        boxes = []
+        if hitboxes:
+            boxes = [(HURTBOX_RGBA, f.hurtbox()) for f in (match.p1, match.p2)]
+            boxes += [(HITBOX_RGBA, f.attack_hitbox()) for f in (match.p1, match.p2) if f.attack_hitbox()]
+            boxes += [(HITBOX_RGBA, shot) for shot in shots]
+        out.append((fighters, shots, boxes))
+    return out
+
+
+class PerInstruction:
+    """The widget's drawing before `SpriteBatch`: one instruction per sprite."""
+
+    def __init__(self, capacity: int):
+        self.group = InstructionGroup()
+        self.group.add(Color(1, 1, 1, 1))
+        self.rects = [Rectangle() for _ in range(2)]
+        for rect in self.rects:
+            self.group.add(rect)
+        self.group.add(Color(*PROJECTILE_RGBA))
+        self.shapes = [Ellipse(pos=(0, 0), size=(0, 0)) for _ in range(capacity)]
+        for shape in self.shapes:
+            self.group.add(shape)
+        self.drawn = 0
+        self.debug = InstructionGroup()
+        self.group.add(self.debug)
+
+    def sync(self, fighters, shots, boxes) -> None:
+        for rect, (tex, x, y, w, h, uv) in zip(self.rects, fighters):
+            rect.pos = (x, y)
+            rect.size = (w, h)
+            if rect.texture is not tex:
+                rect.texture = tex
+            rect.tex_coords = uv
+        for shape, (x, y, w, h) in zip(self.shapes, shots):
+            shape.pos = (x, y)
+            shape.size = (w, h)
+        for i in range(len(shots), self.drawn):
+            self.shapes[i].size = (0, 0)
+        self.drawn = len(shots)
+        self.debug.clear()
+        for rgba, (x, y, w, h) in boxes:
+            self.debug.add(Color(*rgba))
+            self.debug.add(Rectangle(pos=(x, y), size=(w, h)))
+
+    def counts(self, shots, boxes) -> tuple[int, int]:
+        draws = 2 + len(self.shapes) + len(boxes)
+        return draws, 8 + len(self.shapes) * ELLIPSE_VERTICES + 4 * len(boxes)
+
+
+class Batched:
+    def __init__(self, capacity: int):
+        self.batch = SpriteBatch()
+        self.group = self.batch.group
+
+    def sync(self, fighters, shots, boxes) -> None:
+        batch = self.batch
+        batch.begin()
+        for tex, x, y, w, h, uv in fighters:
+            batch.quad(tex, x, y, w, h, uv)
+        for x, y, w, h in shots:
+            batch.ellipse(x, y, w, h, PROJECTILE_RGBA)
+        for rgba, box in boxes:
+            batch.rect(*box, rgba)
+        batch.end()
+
+    def counts(self, shots, boxes) -> tuple[int, int]:
+        stats = self.batch.stats()
+        return stats["draw_calls"], stats["vertices"]
+
+
+def run(renderer, frames: list[tuple]) -> dict:
+    fbo = Fbo(size=(1280, 720))
+    fbo.add(renderer.group)
+    draws = vertices = 0
+    sync_s = draw_s = 0.0
+    for fighters, shots, boxes in frames:
+        t0 = time.perf_counter()
+        renderer.sync(fighters, shots, boxes)
+        t1 = time.perf_counter()
+        fbo.draw()
+        draw_s += time.perf_counter() - t1
+        sync_s += t1 - t0
+        d, v = renderer.counts(shots, boxes)
+        draws += d
+        vertices += v
+    n = len(frames)
+    return dict(draws=draws / n, vertices=vertices / n, sync_ms=sync_s / n * 1e3, draw_ms=draw_s / n * 1e3)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Per-instruction vs batched world sprite drawing.")
+    parser.add_argument("--frames", type=int, default=1800, help="Frames to record and draw.")
+    parser.add_argument("--capacity", type=int, default=16, help="Projectile pool capacity.")
+    parser.add_argument("--hitboxes", action="store_true", help="Draw the hurtbox/hitbox overlay too.")
+    args = parser.parse_args()
+
+    frames = record(args.frames, args.capacity, args.hitboxes)
+    live = sum(len(shots) for _, shots, _ in frames) / len(frames)
+    print(f"{args.frames} frames, {live:.1f} live projectiles on average, ellipses: {ELLIPSE_VERTICES - 1} vs {ELLIPSE_SEGMENTS} segments")
+    print(f"{'renderer':<16} {'draws/frame':>12} {'vertices':>9} {'sync ms':>8} {'GL ms':>7}")
+    for name, cls in (("per-instruction", PerInstruction), ("batched", Batched)):
+        r = run(cls(args.capacity), frames)
+        print(f"{name:<16} {r['draws']:>12.1f} {r['vertices']:>9.0f} {r['sync_ms']:>8.3f} {r['draw_ms']:>7.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+"""
+Train the learned CPU opponent (`game_fighter/policy_ai.py`) by self-play.
+
+Evolution strategies over the flattened `PolicyNet` weights. Each generation, every
+candidate (the current weights plus antithetic Gaussian noise) plays a handful of
+matches against a league of earlier weights. All matches of a generation run as one
+`BatchMatch`, and every decision of every candidate is one batched forward pass per
+side, so a generation is a few hundred vectorized ticks. Decisions are taken exactly as
+`PolicyAIController` takes them: same features, same think interval and one-tick lag.
+
+Every `--eval-every` generations the current weights play the decision tree through
+the real controller in scalar `Match`es; the best-scoring weights are saved.
+
+Usage:
+    python3 tools/train_policy.py
+    python3 tools/train_policy.py --generations 200 --population 48 --out /tmp/policy.npz
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from game_fighter.batch_match import BatchMatch  # noqa: E402
+from game_fighter.input_manager import JUMP_PRESSED, LEFT, PUNCH_PRESSED, RIGHT  # noqa: E402
+from game_fighter.match import Match  # noqa: E402
+from game_fighter.policy_ai import (  # noqa: E402
+    FEATURES, JUMP_READY, POLICY_HIDDEN, POLICY_PATH, POLICY_THINK, PUNCH_READY,
+    PolicyAIController, PolicyBatch, PolicyNet, batch_features,
+)
+from game_fighter.search_ai import PLANS  # noqa: E402
+
+DT = 1.0 / 60
+PRESS = np.array([plan[1] for plan in PLANS])
+WALK = np.array([plan[2] for plan in PLANS])
+NOISE = np.array([0, LEFT, RIGHT, PUNCH_PRESSED, JUMP_PRESSED])
+
+
+def population_act(params, net_idx, rows):
+    """Forward pass where row i uses the weights `params[k][net_idx[i]]` (stacked w1, b1, w2, b2)."""
+    w1, b1, w2, b2 = (p[net_idx] for p in params)
+    hidden = np.tanh(np.einsum("nf,nfh->nh", rows, w1) + b1)
+    return np.argmax(np.einsum("nh,nha->na", hidden, w2) + b2, axis=1)
+
+
+def stack(nets):
+    return [np.stack([getattr(net, name) for net in nets]) for name in ("w1", "b1", "w2", "b2")]
+
+
+class SideState:
+    """`PolicyAIController.ctx` for one fighter row of every match in the batch."""
+
+    def __init__(self, n):
+        self.think = np.zeros(n)
+        self.pending = np.zeros(n, dtype=bool)
+        self.rows = np.zeros((n, len(FEATURES)))
+        self.plan = np.full(n, -1)
+        self.plan_tick = np.zeros(n, dtype=np.int64)
+        self.since_punch = np.full(n, PUNCH_READY)
+        self.since_jump = np.full(n, JUMP_READY)
+
+
+def side_commands(batch, side, st, params, net_idx):
+    """One tick of `PolicyAIController.update` for row `side`; returns (N,) command bits."""
+    me, opp = side, 1 - side
+    st.since_punch = np.minimum(PUNCH_READY, st.since_punch + DT)
+    st.since_jump = np.minimum(JUMP_READY, st.since_jump + DT)
+    busy = (batch.hitstun[me] > 0) | batch.defeated[me] | batch.victorious[me]
+    st.plan[busy] = -1
+
+    resolve = st.pending & ~busy
+    if resolve.any():
+        st.plan[resolve] = population_act(params, net_idx[resolve], st.rows[resolve])
+        st.plan_tick[resolve] = 0
+        st.pending[resolve] = False
+    st.think[~busy] -= DT
+    due = ~busy & (st.think <= 0)
+    if due.any():
+        st.think[due] = POLICY_THINK
+        st.rows[due] = batch_features(batch, side, st.since_punch, st.since_jump)[due]
+        st.pending |= due
+
+    toward = np.where(batch.x[opp] > batch.x[me], 1, -1)
+    batch.facing[me] = toward
+    active = ~busy & (st.plan >= 0)
+    plan = np.where(active, st.plan, len(PLANS) - 1)
+    walk = WALK[plan] * toward
+    cmd = np.where(walk > 0, RIGHT, np.where(walk < 0, LEFT, 0))
+    first = active & (st.plan_tick == 0)
+    press = np.where(first, PRESS[plan], 0)
+    st.since_punch[(press & PUNCH_PRESSED) != 0] = 0.0
+    st.since_jump[(press & JUMP_PRESSED) != 0] = 0.0
+    st.plan_tick[active] += 1
+    return np.where(active, cmd | press, 0)
+
+
+def play_generation(candidates, league, matches, seconds, explore, rng):
+    """Fitness of each candidate over `matches` games against the league (sides alternate)."""
+    n_cand = len(candidates)
+    n = n_cand * matches
+    params = stack(candidates + league)
+    cand = np.repeat(np.arange(n_cand), matches)
+    slot = np.tile(np.arange(matches), n_cand)
+    cand_side = slot % 2
+    rival = n_cand + (slot // 2) % len(league)
+    net_idx = np.where(np.arange(2)[:, None] == cand_side, cand, rival)
+
+    batch = BatchMatch(n, "ryu", "ken", seed=int(rng.integers(1 << 31)))
+    batch.x += rng.uniform(-150.0, 150.0, batch.x.shape)
+    states = (SideState(n), SideState(n))
+    for _ in range(int(seconds / DT)):
+        cmds = [side_commands(batch, s, states[s], params, net_idx[s]) for s in (0, 1)]
+        # The league is noisy so candidates meet more than one line of play
+        for s in (0, 1):
+            wild = (net_idx[s] >= n_cand) & (rng.random(n) < explore)
+            cmds[s] = np.where(wild, rng.choice(NOISE, n), cmds[s])
+        batch.step(DT, cmds[0], cmds[1])
+        if (batch.winner != 0).all():
+            break
+
+    idx = np.arange(n)
+    dealt = batch.damage[cand_side, idx]
+    taken = batch.damage[1 - cand_side, idx]
+    won = batch.winner == cand_side + 1
+    lost = (batch.winner != 0) & ~won
+    score = dealt - 1.2 * taken + 50.0 * won - 60.0 * lost
+    return np.bincount(cand, weights=score, minlength=n_cand) / matches
+
+
+def versus_tree(net, seeds, seconds):
+    """(policy rounds won, tree rounds won) with the real controller as P2 against the tree."""
+    policy = tree = 0
+    for seed in range(seeds):
+        match = Match.headless("ryu", "ken" if seed % 2 else "ryu", p1_ai=True, seed=seed)
+        match.controllers[1] = PolicyAIController(match.rng, batch=PolicyBatch(net))
+        for _ in range(int(seconds / DT)):
+            match.step(DT)
+            ko = [event[1] for event in match.events if event[0] == "ko"]
+            if ko:
+                policy += ko[0] == "P2"
+                tree += ko[0] == "P1"
+            if ko or match.round_timer <= 0:
+                match.reset_round()
+    return policy, tree
+
+
+def centered_ranks(values):
+    ranks = np.empty(len(values))
+    ranks[np.argsort(values)] = np.arange(len(values))
+    return ranks / (len(values) - 1) - 0.5
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Self-play evolution strategies for the learned CPU opponent.")
+    parser.add_argument("--generations", type=int, default=120)
+    parser.add_argument("--population", type=int, default=32, help="Candidates per generation (even; antithetic pairs).")
+    parser.add_argument("--matches", type=int, default=8, help="Matches per candidate.")
+    parser.add_argument("--seconds", type=float, default=15.0, help="Simulated seconds per match.")
+    parser.add_argument("--hidden", type=int, default=POLICY_HIDDEN)
+    parser.add_argument("--sigma", type=float, default=0.1, help="Noise scale.")
+    parser.add_argument("--lr", type=float, default=0.05, help="Step size.")
+    parser.add_argument("--explore", type=float, default=0.05, help="Chance a league opponent tick plays a random command.")
+    parser.add_argument("--league", type=int, default=6, help="Earlier weights kept as opponents.")
+    parser.add_argument("--league-every", type=int, default=5, help="Generations between league additions.")
+    parser.add_argument("--eval-every", type=int, default=10, help="Generations between checks against the decision tree.")
+    parser.add_argument("--eval-seeds", type=int, default=4)
+    parser.add_argument("--eval-seconds", type=float, default=60.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default=str(POLICY_PATH), help="Where to save the best weights (.npz).")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    size = PolicyNet.size(args.hidden)
+    theta = rng.normal(0.0, 0.1, size)
+    league = [PolicyNet.from_vector(theta, args.hidden)]
+    half = max(1, args.population // 2)
+    best = None
+    start = time.perf_counter()
+    for gen in range(1, args.generations + 1):
+        noise = rng.normal(0.0, 1.0, (half, size))
+        noise = np.concatenate([noise, -noise])
+        candidates = [PolicyNet.from_vector(theta + args.sigma * eps, args.hidden) for eps in noise]
+        fitness = play_generation(candidates, league, args.matches, args.seconds, args.explore, rng)
+        theta = theta + args.lr / (len(noise) * args.sigma) * centered_ranks(fitness) @ noise
+        if gen % args.league_every == 0:
+            league = (league + [PolicyNet.from_vector(theta, args.hidden)])[-args.league:]
+        line = f"gen {gen:>4}  fitness mean {fitness.mean():>7.1f} max {fitness.max():>7.1f}  {time.perf_counter() - start:>6.1f}s"
+        if gen % args.eval_every == 0 or gen == args.generations:
+            net = PolicyNet.from_vector(theta, args.hidden)
+            won, lost = versus_tree(net, args.eval_seeds, args.eval_seconds)
+            line += f"  vs tree {won}-{lost}"
+            if best is None or won - lost > best[0]:
+                best = (won - lost, gen)
+                net.save(args.out)
+        print(line, flush=True)
+    print(f"saved generation {best[1]} (round margin {best[0]:+d} vs tree) -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()